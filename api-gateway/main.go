@@ -66,9 +66,9 @@ func main() {
 		} else if strings.HasPrefix(trimmedPath, "/users") {
 			r.URL.Path = trimmedPath
 			userProxy.ServeHTTP(w, r)
-		} else if strings.HasPrefix(trimmedPath, "/posts") {
-			// Blog Service는 내부 라우트를 /api/posts 로 노출하므로 게이트웨이에서는 원본 경로(path)를 유지하여 프록시
-			r.URL.Path = path // e.g., /api/posts, /api/posts/{id}
+		} else if strings.HasPrefix(trimmedPath, "/posts") || strings.HasPrefix(trimmedPath, "/authors/") {
+			// Blog Service는 내부 라우트를 /api/posts, /api/authors 로 노출하므로 게이트웨이에서는 원본 경로(path)를 유지하여 프록시
+			r.URL.Path = path // e.g., /api/posts, /api/posts/{id}, /api/authors/{author}/posts
 			blogProxy.ServeHTTP(w, r)
 		} else {
 			http.NotFound(w, r)
@@ -1,31 +1,84 @@
 import jwt
+import time
+import uuid
+import hashlib
+import asyncio
 import aiohttp
 import logging
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from config import config
+from common.http_client import HttpClient
+from common.revocation_store import RevocationStore
+from signing_keys import KeyRing, ASYMMETRIC_ALGORITHMS
+from common.lru_cache import TTLCache
+from common.metrics import record_cache, cache_stats
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AuthService:
-    def __init__(self):
+    def __init__(self, http_client: HttpClient):
+        self.http_client = http_client
         self.JWT_SECRET = config.INTERNAL_API_SECRET
-        self.JWT_ALGORITHM = "HS256"
-        self.JWT_EXP_DELTA_SECONDS = timedelta(hours=24)
+        self.JWT_ALGORITHM = config.auth.jwt_algorithm
+        self.ACCESS_TOKEN_TTL = timedelta(seconds=config.auth.access_token_ttl)
+        self.REFRESH_TOKEN_TTL = timedelta(seconds=config.auth.refresh_token_ttl)
+        # 비대칭 서명 시 키 모음 (다른 서비스는 JWKS로 받은 공개 키로 직접 검증)
+        self.key_ring = None
+        if self.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS:
+            self.key_ring = KeyRing(
+                self.JWT_ALGORITHM,
+                keys_dir=config.auth.jwt_keys_dir,
+                reload_interval=config.auth.jwt_keys_reload_interval,
+                rotation_interval=config.auth.jwt_key_rotation_interval,
+                retain_seconds=self.REFRESH_TOKEN_TTL.total_seconds(),
+            )
+        self._key_task = None
+        # 폐기된 jti 목록 (Redis 원본을 프로세스 내에 미러링하여 검증 시 네트워크 왕복 없음)
+        self.revocations = RevocationStore(
+            config.REDIS_URL, config.auth.revocation_stream,
+            max_token_lifetime=self.REFRESH_TOKEN_TTL.total_seconds(),
+        )
         self.USER_SERVICE_VERIFY_URL = f"{config.USER_SERVICE_URL}/users/verify-credentials"
+        # 이 인스턴스가 발급한 리프레시 토큰(세션)의 만료 시각 (발급 순서 = 만료 순서)
+        self._issued_token_expiries = deque()
+        # 검증된 토큰의 페이로드 캐시. 키는 토큰 다이제스트, 항목은 토큰의 exp 시각에 만료
+        self.token_cache = TTLCache(config.auth.token_cache_size, default_ttl=0)
         logger.info("Auth service initialized for JWT-based authentication.")
 
+    async def start(self):
+        """서명 키 적재 및 주기적 재적재/교체, 폐기 목록 동기화 시작 (lifespan에서 호출)"""
+        await self.revocations.start()
+        if self.key_ring is None:
+            return
+        # 키 파일 읽기/키 생성(RSA는 수십 ms)이 이벤트 루프를 막지 않도록 스레드에서 실행
+        await asyncio.to_thread(self.key_ring.load)
+        self._key_task = asyncio.create_task(self.key_ring.run())
+
+    async def close(self):
+        await self.revocations.close()
+        if self._key_task is not None:
+            self._key_task.cancel()
+            try:
+                await self._key_task
+            except asyncio.CancelledError:
+                pass
+            self._key_task = None
+
+    def jwks(self):
+        """공개 키 목록. HS256에서는 공유 비밀 키를 게시하지 않으므로 비어 있음"""
+        return self.key_ring.jwks() if self.key_ring else {"keys": []}
+
     async def _verify_user_from_service(self, username, password):
         """User-service에 자격 증명 확인을 요청하는 로직"""
         payload = {"username": username, "password": password}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.USER_SERVICE_VERIFY_URL, json=payload) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    return None
-        except aiohttp.ClientError as e:
-            logger.error(f"Error connecting to user-service: {e}")
+            async with self.http_client.session.post(self.USER_SERVICE_VERIFY_URL, json=payload) as response:
+                if response.status == 200:
+                    return await response.json()
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Error connecting to user-service: %s", e)
             return None
 
     async def login(self, username, password):
@@ -34,32 +87,115 @@ class AuthService:
         user_data = await self._verify_user_from_service(username, password)
 
         if not user_data:
-            logger.warning(f"Login failed for '{username}': Invalid credentials or service error.")
+            logger.warning("Login failed for '%s': Invalid credentials or service error.", username)
             return {"status": "failed", "message": "Invalid username or password"}
 
-        user_id = user_data.get("id")
-        jwt_payload = {
+        tokens = self._issue_tokens(user_data.get("id"), username)
+        logger.info("Login successful for '%s'. JWT token created.", username)
+        return tokens
+
+    async def refresh(self, refresh_token):
+        """리프레시 토큰으로 새 토큰 쌍을 발급. 사용한 리프레시 토큰은 폐기(1회용)"""
+        result = self.verify_token(refresh_token, token_type="refresh")
+        if result["status"] != "success":
+            return result
+        payload = result["data"]
+        await self.revocations.revoke(payload["jti"], payload["exp"])
+        return self._issue_tokens(payload.get("user_id"), payload.get("username"))
+
+    async def logout(self, *tokens):
+        """전달된 토큰(액세스/리프레시)을 만료 시각까지 폐기"""
+        for token in tokens:
+            try:
+                payload = self._decode(token)
+            except jwt.InvalidTokenError:
+                # 이미 만료되었거나 잘못된 토큰은 폐기할 필요가 없음
+                continue
+            if payload.get("jti"):
+                await self.revocations.revoke(payload["jti"], payload["exp"])
+        return {"status": "success"}
+
+    def _issue_tokens(self, user_id, username):
+        now = datetime.now(timezone.utc)
+        access_token = self._sign({
             'user_id': user_id,
             'username': username,
-            'exp': datetime.now(timezone.utc) + self.JWT_EXP_DELTA_SECONDS
+            'typ': 'access',
+            'jti': uuid.uuid4().hex,
+            'exp': now + self.ACCESS_TOKEN_TTL
+        })
+        refresh_exp = now + self.REFRESH_TOKEN_TTL
+        refresh_token = self._sign({
+            'user_id': user_id,
+            'username': username,
+            'typ': 'refresh',
+            'jti': uuid.uuid4().hex,
+            'exp': refresh_exp
+        })
+        self._issued_token_expiries.append(refresh_exp.timestamp())
+        return {
+            "status": "success",
+            "token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": int(self.ACCESS_TOKEN_TTL.total_seconds()),
         }
-        token = jwt.encode(jwt_payload, self.JWT_SECRET, algorithm=self.JWT_ALGORITHM)
 
-        logger.info(f"Login successful for '{username}'. JWT token created.")
-        return {"status": "success", "token": token}
+    def _sign(self, jwt_payload):
+        if self.key_ring:
+            signing_key = self.key_ring.current
+            return jwt.encode(jwt_payload, signing_key.private_key, algorithm=self.JWT_ALGORITHM,
+                              headers={"kid": signing_key.kid})
+        return jwt.encode(jwt_payload, self.JWT_SECRET, algorithm=self.JWT_ALGORITHM)
 
-    def verify_token(self, token):
+    def active_session_count(self) -> int:
+        """이 인스턴스가 발급한 토큰 중 아직 만료되지 않은 수"""
+        now = time.time()
+        while self._issued_token_expiries and self._issued_token_expiries[0] <= now:
+            self._issued_token_expiries.popleft()
+        return len(self._issued_token_expiries)
+
+    def verify_token(self, token, token_type="access"):
         try:
-            decoded_payload = jwt.decode(
-                token,
-                self.JWT_SECRET,
-                algorithms=[self.JWT_ALGORITHM]
-            )
-            logger.info(f"Token verified successfully for user_id: {decoded_payload.get('user_id')}")
-            return {"status": "success", "data": decoded_payload}
+            decoded_payload = self._decode(token)
         except jwt.ExpiredSignatureError:
             logger.warning("Token verification failed: Token has expired.")
             return {"status": "failed", "message": "Token has expired"}
         except jwt.InvalidTokenError as e:
-            logger.error(f"Token verification failed: Invalid token. Reason: {e}")
-            return {"status": "failed", "message": "Invalid token"}
\ No newline at end of file
+            logger.error("Token verification failed: Invalid token. Reason: %s", e)
+            return {"status": "failed", "message": "Invalid token"}
+        # typ이 없는 토큰은 리프레시 토큰 도입 이전에 발급된 액세스 토큰
+        if decoded_payload.get('typ', 'access') != token_type:
+            return {"status": "failed", "message": "Invalid token type"}
+        # 캐시된 토큰도 매번 확인. 프로세스 내 목록 조회라 네트워크 왕복 없음
+        if self.revocations.is_revoked(decoded_payload.get('jti')):
+            return {"status": "failed", "message": "Token has been revoked"}
+        return {"status": "success", "data": decoded_payload}
+
+    def _decode(self, token):
+        # 같은 토큰이 세션 내내 반복 검증되므로, 한 번 검증된 토큰은 서명 확인 없이 캐시에서 응답
+        digest = hashlib.sha256(token.encode()).digest()
+        cached_payload = self.token_cache.get(digest)
+        record_cache("token", cached_payload is not None)
+        if cached_payload is not None:
+            return cached_payload
+        decoded_payload = jwt.decode(
+            token,
+            self._verification_key(token),
+            algorithms=[self.JWT_ALGORITHM]
+        )
+        exp = decoded_payload.get('exp')
+        if exp is not None:
+            self.token_cache.set(digest, decoded_payload, ttl=exp - time.time())
+        return decoded_payload
+
+    def _verification_key(self, token):
+        if self.key_ring is None:
+            return self.JWT_SECRET
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = self.key_ring.public_key(kid)
+        if public_key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return public_key
+
+    def token_cache_stats(self):
+        return {**cache_stats("token"), "entries": len(self.token_cache)}
\ No newline at end of file
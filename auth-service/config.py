@@ -1,6 +1,8 @@
 import os
 from dataclasses import dataclass
 
+from common.http_client import HttpClientConfig
+
 @dataclass
 class ServerConfig:
     """Auth Service 서버 실행 설정"""
@@ -11,7 +13,40 @@ class ServerConfig:
 class AuthConfig:
     """인증 관련 설정"""
     session_timeout: int = 86400  # 세션 유효 시간 (24시간)
+    # 액세스 토큰은 짧게, 재로그인 없이 새 액세스 토큰을 받는 리프레시 토큰은 길게
+    access_token_ttl: int = int(os.getenv('ACCESS_TOKEN_TTL', '900'))
+    refresh_token_ttl: int = int(os.getenv('REFRESH_TOKEN_TTL', '604800'))
+    # 폐기된 토큰(jti) 기록을 레플리카 간에 공유하는 Redis Stream
+    revocation_stream: str = os.getenv('TOKEN_REVOCATION_STREAM', 'auth:revocations')
     internal_api_secret: str = os.getenv('INTERNAL_API_SECRET', 'default-secret-key')
+    # 검증을 마친 토큰 캐시 크기 (항목은 토큰의 exp 시각에 만료)
+    token_cache_size: int = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))
+    verify_batch_max_size: int = int(os.getenv('VERIFY_BATCH_MAX_SIZE', '100'))
+    # 서명 알고리즘: HS256(공유 비밀 키) | RS256 | EdDSA (비대칭, JWKS로 공개 키 게시)
+    jwt_algorithm: str = os.getenv('JWT_ALGORITHM', 'HS256')
+    # 비대칭 서명 키(<kid>.pem) 디렉터리. 비어 있으면 프로세스 내에서 키 생성
+    jwt_keys_dir: str = os.getenv('JWT_KEYS_DIR', '')
+    jwt_keys_reload_interval: float = float(os.getenv('JWT_KEYS_RELOAD_INTERVAL', '60'))
+    # 프로세스 내 생성 키의 교체 주기(초). 0이면 교체하지 않음
+    jwt_key_rotation_interval: float = float(os.getenv('JWT_KEY_ROTATION_INTERVAL', '0'))
+
+@dataclass
+class LoginLimitConfig:
+    """로그인 시도 제한 (윈도우 초 동안 최대 횟수). 횟수가 0이면 해당 기준은 제한하지 않음"""
+    user_limit: int = int(os.getenv('LOGIN_USER_LIMIT', '5'))
+    user_window: float = float(os.getenv('LOGIN_USER_WINDOW', '60'))
+    ip_limit: int = int(os.getenv('LOGIN_IP_LIMIT', '20'))
+    ip_window: float = float(os.getenv('LOGIN_IP_WINDOW', '60'))
+    # 앞단에서 X-Forwarded-For에 주소를 덧붙이는 신뢰하는 프록시 수 (load-balancer, api-gateway)
+    trusted_proxy_hops: int = int(os.getenv('TRUSTED_PROXY_HOPS', '2'))
+    # Redis 응답을 기다리는 최대 시간(초). 넘으면 프로세스 내 토큰 버킷으로 판정
+    redis_timeout: float = float(os.getenv('LOGIN_LIMIT_REDIS_TIMEOUT', '0.2'))
+    local_max_entries: int = int(os.getenv('LOGIN_LIMIT_LOCAL_ENTRIES', '100000'))
+
+@dataclass
+class RedisConfig:
+    host: str = os.getenv('REDIS_HOST', 'redis-service')
+    port: int = int(os.getenv('REDIS_PORT', '6379'))
 
 @dataclass
 class ServiceUrls:
@@ -23,9 +58,13 @@ class Config:
     def __init__(self):
         self.server = ServerConfig()
         self.auth = AuthConfig()
+        self.login_limit = LoginLimitConfig()
         self.services = ServiceUrls()
+        self.redis = RedisConfig()
+        self.http = HttpClientConfig()
         self.INTERNAL_API_SECRET = self.auth.internal_api_secret
         self.USER_SERVICE_URL = self.services.user_service
+        self.REDIS_URL = f"redis://{self.redis.host}:{self.redis.port}"
 
 
 # 다른 파일에서 쉽게 임포트할 수 있도록 전역 인스턴스 생성
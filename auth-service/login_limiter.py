@@ -0,0 +1,189 @@
+# auth-service/login_limiter.py
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import redis.asyncio as redis
+from prometheus_client import Counter
+
+from common.lru_cache import TTLCache
+from common.tracing import span
+
+logger = logging.getLogger(__name__)
+
+LOGIN_THROTTLED = Counter(
+    "login_throttled",
+    "시도 제한으로 거부한 로그인 요청 수",
+    ["scope", "backend"],
+)
+LOGIN_LIMITER_FALLBACKS = Counter(
+    "login_limiter_fallbacks",
+    "Redis 오류로 프로세스 내 토큰 버킷으로 판정한 로그인 요청 수",
+)
+
+# 슬라이딩 윈도우 로그 (키마다 ZSET, 점수 = 허용된 시도 시각(ms)).
+# 모든 키를 확인한 뒤 전부 여유가 있을 때만 시도를 기록하므로, 거부된 요청은 윈도우를 늘리지 않고
+# 키당 항목 수는 limit을 넘지 않음. 시각은 레플리카 간 시계 차이가 없도록 Redis 서버 시각을 사용
+# ARGV: member, (limit, window_ms) x 키 수 → {막은 키 번호(0이면 허용), 다시 시도할 수 있기까지(ms)}
+SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local blocked, retry_ms = 0, 0
+for i, key in ipairs(KEYS) do
+  local limit = tonumber(ARGV[i * 2])
+  local window = tonumber(ARGV[i * 2 + 1])
+  redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+  local count = redis.call('ZCARD', key)
+  if count >= limit then
+    local oldest = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+    local wait = tonumber(oldest[2]) + window - now
+    if wait > retry_ms then
+      blocked, retry_ms = i, wait
+    end
+  end
+end
+if blocked == 0 then
+  for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[1])
+    redis.call('PEXPIRE', key, ARGV[i * 2 + 1])
+  end
+end
+return {blocked, retry_ms}
+"""
+
+
+@dataclass(frozen=True)
+class _Rule:
+    scope: str      # "user" | "ip"
+    key: str
+    limit: int
+    window: float   # 초
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated_at = now
+
+
+class LoginLimiter:
+    """
+    사용자 이름별/클라이언트 IP별 로그인 시도 제한.
+    - 원본은 Redis 슬라이딩 윈도우(Lua 스크립트 한 번으로 확인과 기록을 원자적으로 처리)이므로 모든 레플리카가 같은 한도를 공유
+    - Redis 오류 시에는 프로세스 내 토큰 버킷(용량 limit, window 동안 limit개 충전)으로 판정하고,
+      잠시(retry_interval) Redis를 건너뛰어 로그인마다 타임아웃을 기다리지 않음. 이때 한도는 레플리카별로 적용됨
+    - user-service 호출(비밀번호 해시 검증) 전에 확인하므로, 거부된 시도는 네트워크 왕복 한 번(또는 0번)으로 끝남
+    """
+
+    KEY_PREFIX = "login:attempts"
+
+    def __init__(self, redis_url: str, user_limit: int, user_window: float, ip_limit: int, ip_window: float,
+                 redis_timeout: float, local_max_entries: int, retry_interval: float = 5.0):
+        self.user_limit = user_limit
+        self.user_window = user_window
+        self.ip_limit = ip_limit
+        self.ip_window = ip_window
+        self.retry_interval = retry_interval
+        self._redis_down_until = 0.0
+        self._buckets = TTLCache(local_max_entries, default_ttl=max(user_window, ip_window))
+        try:
+            self.redis_client = redis.from_url(redis_url, decode_responses=True, socket_timeout=redis_timeout,
+                                               socket_connect_timeout=redis_timeout)
+            self._script = self.redis_client.register_script(SLIDING_WINDOW_LUA)
+        except Exception as e:
+            logger.error(f"Failed to create Redis client for login limiter: {e}")
+            self.redis_client = None
+
+    async def close(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+
+    @property
+    def backend(self) -> str:
+        """현재 판정에 사용하는 저장소"""
+        if self.redis_client is None or time.monotonic() < self._redis_down_until:
+            return "local"
+        return "redis"
+
+    def _rules(self, username: Optional[str], client_ip: Optional[str]) -> List[_Rule]:
+        rules = []
+        if username and self.user_limit > 0:
+            rules.append(_Rule("user", f"{self.KEY_PREFIX}:user:{username.lower()}", self.user_limit, self.user_window))
+        if client_ip and self.ip_limit > 0:
+            rules.append(_Rule("ip", f"{self.KEY_PREFIX}:ip:{client_ip}", self.ip_limit, self.ip_window))
+        return rules
+
+    async def acquire(self, username: Optional[str], client_ip: Optional[str]) -> Optional[int]:
+        """
+        시도 하나를 기록. 허용이면 None, 한도 초과면 다시 시도할 수 있기까지의 초(Retry-After)를 반환
+        """
+        rules = self._rules(username, client_ip)
+        if not rules:
+            return None
+        backend = self.backend
+        if backend == "redis":
+            try:
+                blocked, retry_after = await self._acquire_redis(rules)
+            except Exception as e:
+                logger.warning("Login limiter falling back to local buckets: %s", e)
+                self._redis_down_until = time.monotonic() + self.retry_interval
+                backend = "local"
+        if backend == "local":
+            LOGIN_LIMITER_FALLBACKS.inc()
+            blocked, retry_after = self._acquire_local(rules)
+        if blocked is None:
+            return None
+        LOGIN_THROTTLED.labels(blocked.scope, backend).inc()
+        return max(1, math.ceil(retry_after))
+
+    async def _acquire_redis(self, rules: List[_Rule]) -> Tuple[Optional[_Rule], float]:
+        args = [uuid.uuid4().hex]
+        for rule in rules:
+            args += [rule.limit, int(rule.window * 1000)]
+        with span("cache", "login_limiter"):
+            blocked, retry_ms = await self._script(keys=[rule.key for rule in rules], args=args)
+        if not blocked:
+            return None, 0.0
+        return rules[int(blocked) - 1], int(retry_ms) / 1000
+
+    def _acquire_local(self, rules: List[_Rule]) -> Tuple[Optional[_Rule], float]:
+        now = time.monotonic()
+        buckets = []
+        blocked, retry_after = None, 0.0
+        for rule in rules:
+            rate = rule.limit / rule.window
+            bucket = self._buckets.get(rule.key)
+            if bucket is None:
+                bucket = _TokenBucket(rule.limit, now)
+            bucket.tokens = min(rule.limit, bucket.tokens + (now - bucket.updated_at) * rate)
+            bucket.updated_at = now
+            # 버킷은 window 동안 쓰이지 않으면 가득 차므로 그 뒤에는 지워도 같음
+            self._buckets.set(rule.key, bucket, ttl=rule.window)
+            buckets.append(bucket)
+            if bucket.tokens < 1:
+                wait = (1 - bucket.tokens) / rate
+                if wait > retry_after:
+                    blocked, retry_after = rule, wait
+        if blocked is None:
+            for bucket in buckets:
+                bucket.tokens -= 1
+        return blocked, retry_after
+
+
+def client_ip(forwarded_for: Optional[str], peer: Optional[str], trusted_proxy_hops: int) -> Optional[str]:
+    """
+    요청을 보낸 클라이언트 IP. 앞단의 신뢰하는 프록시(load-balancer, api-gateway)가 X-Forwarded-For 끝에
+    각자 받은 연결의 주소를 덧붙이므로, 끝에서 trusted_proxy_hops번째 주소를 사용
+    (클라이언트가 임의로 넣은 앞쪽 값은 무시)
+    """
+    addresses = [a.strip() for a in forwarded_for.split(",") if a.strip()] if forwarded_for else []
+    if peer:
+        addresses.append(peer)
+    if not addresses:
+        return None
+    return addresses[max(0, len(addresses) - 1 - trusted_proxy_hops)]
@@ -1,17 +1,70 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
 from config import config
 from auth_service import AuthService
+from login_limiter import LoginLimiter, client_ip
+from common.http_client import HttpClient
+from common.json_response import FastJSONResponse
+from common.logging_config import setup_logging
+from common.metrics import setup_metrics, request_stats
+from common.readiness import Readiness, setup_readiness
+from common.tracing import setup_tracing
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# 로깅 설정 (JSON 한 줄 형식, 백그라운드 스레드에서 출력)
+setup_logging("auth-service")
 logger = logging.getLogger('AuthServiceApp')
 
+# 서비스 간 호출용 공유 HTTP 클라이언트 (lifespan에서 생성/종료)
+http_client = HttpClient(config.http)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.gather(http_client.start(), auth_service.start())
+    # user-service 커넥션을 미리 열어 두어 첫 로그인이 연결 비용을 치르지 않도록 함
+    readiness.warm_up("user_service_connection", lambda: http_client.warm(f"{config.USER_SERVICE_URL}/health"))
+    yield
+    await readiness.close()
+    await login_limiter.close()
+    await auth_service.close()
+    await http_client.close()
+
+auth_service = AuthService(http_client)
+# 비밀번호 해시 검증(user-service) 전에 사용자 이름/IP별 시도 횟수를 제한
+login_limiter = LoginLimiter(
+    config.REDIS_URL,
+    user_limit=config.login_limit.user_limit,
+    user_window=config.login_limit.user_window,
+    ip_limit=config.login_limit.ip_limit,
+    ip_window=config.login_limit.ip_window,
+    redis_timeout=config.login_limit.redis_timeout,
+    local_max_entries=config.login_limit.local_max_entries,
+)
+
+readiness = Readiness()
+# 폐기 목록을 한 번도 받지 못한 레플리카는 폐기된 토큰을 통과시키므로 동기화 전에는 트래픽을 받지 않음.
+# (한 번 동기화된 뒤에는 Redis가 끊겨도 받아 둔 목록으로 계속 검증)
+# user-service 상태는 보지 않음: 검증/갱신은 user-service 없이도 동작하고, 연쇄적으로 빠지는 것을 막음
+readiness.add_check("revocations", lambda: auth_service.revocations.ready)
+
 # FastAPI 앱 생성
-app = FastAPI()
-auth_service = AuthService()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+setup_metrics(app)
+setup_tracing(app, "auth-service")
+setup_readiness(app, readiness)
+
+class TokenBatch(BaseModel):
+    tokens: List[str]
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 # --- API 엔드포인트 ---
 @app.post("/login")
@@ -19,11 +72,41 @@ async def handle_login(request: Request):
     """로그인 요청을 처리하고 JWT 토큰을 반환합니다."""
     try:
         data = await request.json()
-        result = await auth_service.login(data.get('username'), data.get('password'))
-        status_code = 200 if result.get('status') == 'success' else 401
-        return JSONResponse(content=result, status_code=status_code)
+        username, password = data.get('username'), data.get('password')
     except Exception:
         raise HTTPException(status_code=400, detail={"status": "failed", "message": "Invalid request body"})
+    ip = client_ip(request.headers.get('x-forwarded-for'), request.client.host if request.client else None,
+                   config.login_limit.trusted_proxy_hops)
+    retry_after = await login_limiter.acquire(username if isinstance(username, str) else None, ip)
+    if retry_after is not None:
+        return FastJSONResponse(status_code=429, content={"status": "failed", "message": "Too many login attempts"},
+                                headers={"Retry-After": str(retry_after)})
+    try:
+        result = await auth_service.login(username, password)
+    except Exception:
+        raise HTTPException(status_code=400, detail={"status": "failed", "message": "Invalid request body"})
+    status_code = 200 if result.get('status') == 'success' else 401
+    return FastJSONResponse(content=result, status_code=status_code)
+
+@app.post("/refresh")
+async def handle_refresh(body: RefreshRequest):
+    """리프레시 토큰으로 새 액세스/리프레시 토큰 쌍을 발급합니다."""
+    result = await auth_service.refresh(body.refresh_token)
+    status_code = 200 if result.get('status') == 'success' else 401
+    return FastJSONResponse(content=result, status_code=status_code)
+
+@app.post("/logout")
+async def handle_logout(request: Request, body: Optional[LogoutRequest] = None):
+    """Authorization 헤더의 액세스 토큰과 본문의 리프레시 토큰을 폐기합니다."""
+    tokens = []
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        tokens.append(auth_header.split(' ')[1])
+    if body and body.refresh_token:
+        tokens.append(body.refresh_token)
+    if not tokens:
+        raise HTTPException(status_code=400, detail={"status": "failed", "message": "No token to revoke"})
+    return await auth_service.logout(*tokens)
 
 @app.get("/verify")
 async def validate_token(request: Request):
@@ -36,11 +119,27 @@ async def validate_token(request: Request):
     result = auth_service.verify_token(token)
     is_valid = result.get('status') == 'success'
     status_code = 200 if is_valid else 401
-    return JSONResponse(content=result, status_code=status_code)
+    return FastJSONResponse(content=result, status_code=status_code)
+
+@app.post("/verify/batch")
+async def validate_tokens(batch: TokenBatch):
+    """여러 토큰을 한 번에 검증합니다. 결과는 입력 순서대로 반환합니다."""
+    if len(batch.tokens) > config.auth.verify_batch_max_size:
+        raise HTTPException(status_code=400, detail={"status": "failed", "message": f"At most {config.auth.verify_batch_max_size} tokens per batch"})
+    results = []
+    for token in batch.tokens:
+        result = auth_service.verify_token(token)
+        results.append({"valid": result.get('status') == 'success', **result})
+    return {"results": results}
+
+@app.get("/.well-known/jwks.json")
+async def handle_jwks():
+    """토큰 검증용 공개 키 목록(JWKS). 다른 서비스가 받아 두고 토큰을 직접 검증합니다."""
+    return FastJSONResponse(content=auth_service.jwks(), headers={"Cache-Control": "public, max-age=300"})
 
 @app.get("/health")
 async def handle_health():
-    """헬스 체크 엔드포인트"""
+    """헬스 체크 엔드포인트 (liveness 전용, 의존성 상태는 /ready)"""
     return {"status": "ok", "service": "auth-service"}
 
 @app.get("/stats")
@@ -49,7 +148,12 @@ async def handle_stats():
     stats_data = {
         "auth": {
             "service_status": "online",
-            "active_session_count": 0  # 실제 구현에서는 세션 수를 추적해야 합니다.
+            "active_session_count": auth_service.active_session_count(),
+            "token_cache": auth_service.token_cache_stats(),
+            "revoked_tokens": len(auth_service.revocations),
+            "login_limiter": login_limiter.backend,
+            "requests": request_stats(),
+            "upstreams": http_client.stats()
         }
     }
     return stats_data
@@ -0,0 +1,161 @@
+# auth-service/signing_keys.py
+import asyncio
+import logging
+import os
+import secrets
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+logger = logging.getLogger(__name__)
+
+# 공개 키로 검증할 수 있어 JWKS로 게시하는 서명 알고리즘
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+
+
+def _matches_algorithm(private_key, algorithm: str) -> bool:
+    if algorithm == "RS256":
+        return isinstance(private_key, rsa.RSAPrivateKey)
+    return isinstance(private_key, ed25519.Ed25519PrivateKey)
+
+
+def public_jwk(kid: str, algorithm: str, private_key) -> Dict:
+    """서명 키의 공개 부분만 JWK(dict)로 변환"""
+    public_key = private_key.public_key()
+    if algorithm == "RS256":
+        jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+    else:
+        jwk = OKPAlgorithm.to_jwk(public_key, as_dict=True)
+    jwk.update(kid=kid, alg=algorithm, use="sig")
+    return jwk
+
+
+@dataclass
+class SigningKey:
+    kid: str
+    private_key: object
+    retired_at: Optional[float] = None  # 더 이상 서명에 쓰이지 않게 된 시각
+
+
+class KeyRing:
+    """
+    비대칭 JWT 서명 키 모음. 가장 최근 키로 서명하고, 이전 키는 이미 발급된 토큰이
+    만료될 때까지 JWKS에 계속 게시하여 검증할 수 있도록 함.
+    - keys_dir 지정 시: <kid>.pem 파일을 읽고 이름 순으로 가장 뒤의 키로 서명.
+      여러 레플리카가 같은 키를 공유하며, 새 파일을 추가하면 reload_interval마다 반영됨
+    - 미지정 시: 프로세스 내에서 키를 생성 (단일 레플리카/개발용). rotation_interval마다 새 키로 교체
+    """
+
+    def __init__(self, algorithm: str, keys_dir: str = "", reload_interval: float = 60,
+                 rotation_interval: float = 0, retain_seconds: float = 86400):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir
+        self.reload_interval = reload_interval
+        self.rotation_interval = rotation_interval
+        self.retain_seconds = retain_seconds
+        self._keys: List[SigningKey] = []
+        self._jwks: Dict = {"keys": []}
+
+    @property
+    def current(self) -> SigningKey:
+        return self._keys[-1]
+
+    def public_key(self, kid: Optional[str]):
+        for key in self._keys:
+            if key.kid == kid:
+                return key.private_key.public_key()
+        return None
+
+    def jwks(self) -> Dict:
+        return self._jwks
+
+    def load(self):
+        if self.keys_dir:
+            self._load_dir()
+        elif not self._keys:
+            self.rotate()
+
+    def _load_dir(self):
+        keys = []
+        for name in sorted(os.listdir(self.keys_dir)):
+            if not name.endswith(".pem"):
+                continue
+            with open(os.path.join(self.keys_dir, name), "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            if not _matches_algorithm(private_key, self.algorithm):
+                logger.warning(f"Skipping signing key {name}: not a {self.algorithm} key")
+                continue
+            keys.append(SigningKey(kid=name[:-len(".pem")], private_key=private_key))
+        if not keys:
+            raise RuntimeError(f"No {self.algorithm} signing keys found in {self.keys_dir}")
+        if [k.kid for k in keys] != [k.kid for k in self._keys]:
+            logger.info(f"Loaded {len(keys)} signing keys, signing with kid={keys[-1].kid}")
+        self._keys = keys
+        self._publish()
+
+    def rotate(self):
+        """새 키를 만들어 서명 키로 사용하고, 보존 기간이 지난 이전 키는 제거"""
+        now = time.time()
+        if self._keys:
+            self.current.retired_at = now
+        kid = f"{int(now)}-{secrets.token_hex(4)}"
+        self._keys.append(SigningKey(kid=kid, private_key=generate_private_key(self.algorithm)))
+        self._keys = [k for k in self._keys if k.retired_at is None or k.retired_at + self.retain_seconds > now]
+        logger.info(f"Rotated signing key, signing with kid={kid}")
+        self._publish()
+
+    def _publish(self):
+        self._jwks = {"keys": [public_jwk(k.kid, self.algorithm, k.private_key) for k in self._keys]}
+
+    async def run(self):
+        """키 디렉터리 재적재 또는 주기적 교체 (lifespan에서 백그라운드 태스크로 실행)"""
+        interval = self.reload_interval if self.keys_dir else self.rotation_interval
+        if interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.keys_dir:
+                    self.load()
+                else:
+                    self.rotate()
+            except Exception as e:
+                # 잘못된 파일이 추가되어도 기존 키로 계속 서명
+                logger.error(f"Signing key refresh failed: {e}")
+
+
+def write_new_key(keys_dir: str, algorithm: str) -> str:
+    """keys_dir에 새 서명 키를 PEM으로 저장. 파일 이름(kid)은 생성 시각이라 이름 순 = 생성 순"""
+    os.makedirs(keys_dir, exist_ok=True)
+    kid = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+    path = os.path.join(keys_dir, f"{kid}.pem")
+    pem = generate_private_key(algorithm).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return path
+
+
+if __name__ == "__main__":
+    # 키 교체: python signing_keys.py generate <keys_dir> [RS256|EdDSA]
+    if len(sys.argv) < 3 or sys.argv[1] != "generate":
+        print("usage: python signing_keys.py generate <keys_dir> [RS256|EdDSA]")
+        sys.exit(2)
+    print(write_new_key(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else "RS256"))
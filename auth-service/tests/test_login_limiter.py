@@ -0,0 +1,145 @@
+# auth-service/tests/test_login_limiter.py
+import asyncio
+
+import pytest
+
+import login_limiter
+from login_limiter import LoginLimiter, client_ip
+
+
+def _limiter(**overrides) -> LoginLimiter:
+    params = dict(redis_url="redis://127.0.0.1:1", user_limit=3, user_window=60, ip_limit=5, ip_window=60,
+                  redis_timeout=0.1, local_max_entries=1000)
+    params.update(overrides)
+    return LoginLimiter(**params)
+
+
+def _local_limiter(**overrides) -> LoginLimiter:
+    limiter = _limiter(**overrides)
+    limiter.redis_client = None
+    return limiter
+
+
+def _fake_redis_limiter(**overrides) -> LoginLimiter:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis의 EVAL 지원
+    limiter = _limiter(**overrides)
+    limiter.redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    limiter._script = limiter.redis_client.register_script(login_limiter.SLIDING_WINDOW_LUA)
+    return limiter
+
+
+async def _attempts(limiter, n, username="alice", ip="198.51.100.1"):
+    return [await limiter.acquire(username, ip) for _ in range(n)]
+
+
+# --- client_ip ---
+@pytest.mark.parametrize("forwarded_for, peer, hops, expected", [
+    # 클라이언트 → load-balancer → api-gateway → auth-service: 끝에서 2번째가 클라이언트
+    ("203.0.113.7, 10.0.0.5", "10.0.0.9", 2, "203.0.113.7"),
+    # 클라이언트가 앞에 넣은 값은 무시
+    ("1.2.3.4, 203.0.113.7, 10.0.0.5", "10.0.0.9", 2, "203.0.113.7"),
+    (" 203.0.113.7 ,10.0.0.5 ", "10.0.0.9", 2, "203.0.113.7"),
+    (None, "10.0.0.9", 2, "10.0.0.9"),
+    ("203.0.113.7", "10.0.0.9", 0, "10.0.0.9"),
+    ("203.0.113.7", None, 1, "203.0.113.7"),
+    ("", None, 2, None),
+])
+def test_client_ip(forwarded_for, peer, hops, expected):
+    assert client_ip(forwarded_for, peer, hops) == expected
+
+
+# --- 프로세스 내 토큰 버킷 ---
+def test_local_user_limit():
+    limiter = _local_limiter()
+    results = asyncio.run(_attempts(limiter, 4))
+    assert results[:3] == [None, None, None]
+    # 60초에 3개 충전 → 토큰 하나까지 20초
+    assert results[3] == 20
+    assert limiter.backend == "local"
+
+
+def test_local_username_is_case_insensitive():
+    limiter = _local_limiter()
+
+    async def run():
+        for name in ("alice", "ALICE", "Alice"):
+            assert await limiter.acquire(name, "198.51.100.1") is None
+        return await limiter.acquire("aLiCe", "198.51.100.1")
+
+    assert asyncio.run(run()) is not None
+
+
+def test_local_ip_limit_across_usernames():
+    limiter = _local_limiter(user_limit=100)
+
+    async def run():
+        return [await limiter.acquire(f"user{i}", "198.51.100.1") for i in range(6)]
+
+    results = asyncio.run(run())
+    assert results[:5] == [None] * 5
+    assert results[5] is not None
+
+
+def test_local_rejected_attempt_does_not_consume_other_scope():
+    limiter = _local_limiter(user_limit=1, ip_limit=2)
+
+    async def run():
+        assert await limiter.acquire("alice", "198.51.100.1") is None
+        # alice는 막히지만 IP 토큰은 쓰지 않으므로 다른 사용자는 통과
+        assert await limiter.acquire("alice", "198.51.100.1") is not None
+        assert await limiter.acquire("bob", "198.51.100.1") is None
+
+    asyncio.run(run())
+
+
+def test_disabled_limits_allow_everything():
+    limiter = _local_limiter(user_limit=0, ip_limit=0)
+    assert asyncio.run(_attempts(limiter, 20)) == [None] * 20
+
+
+# --- Redis 슬라이딩 윈도우 ---
+def test_redis_sliding_window():
+    limiter = _fake_redis_limiter()
+
+    async def run():
+        results = await _attempts(limiter, 5)
+        members = await limiter.redis_client.zcard("login:attempts:user:alice")
+        ttl = await limiter.redis_client.pttl("login:attempts:user:alice")
+        return results, members, ttl
+
+    results, members, ttl = asyncio.run(run())
+    assert results[:3] == [None, None, None]
+    assert all(1 <= r <= 60 for r in results[3:])
+    # 거부된 시도는 기록하지 않음
+    assert members == 3
+    assert 0 < ttl <= 60000
+    assert limiter.backend == "redis"
+
+
+def test_redis_ip_rule_blocks_before_recording_user():
+    limiter = _fake_redis_limiter(user_limit=10, ip_limit=2)
+
+    async def run():
+        assert await limiter.acquire("alice", "198.51.100.1") is None
+        assert await limiter.acquire("bob", "198.51.100.1") is None
+        assert await limiter.acquire("carol", "198.51.100.1") is not None
+        return await limiter.redis_client.exists("login:attempts:user:carol")
+
+    assert asyncio.run(run()) == 0
+
+
+def test_redis_error_falls_back_to_local_buckets():
+    limiter = _limiter()
+
+    async def failing_script(keys, args):
+        raise ConnectionError("redis down")
+
+    limiter._script = failing_script
+    before = login_limiter.LOGIN_LIMITER_FALLBACKS._value.get()
+    results = asyncio.run(_attempts(limiter, 4))
+    assert results[:3] == [None, None, None]
+    assert results[3] is not None
+    # 실패 후 retry_interval 동안은 Redis를 건너뜀
+    assert limiter.backend == "local"
+    assert login_limiter.LOGIN_LIMITER_FALLBACKS._value.get() - before == 4
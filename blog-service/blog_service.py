@@ -1,70 +1,111 @@
 import os
+import asyncio
 import logging
-import sqlite3
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional, Dict, List
 import aiohttp
+import jwt
 from fastapi import FastAPI, Request, HTTPException, Form, Depends, Query, Response
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
 
-# --- 기본 로깅 ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from common.http_client import HttpClient, HttpClientConfig
+from common.jwt_verifier import JWKSVerifier
+from common.json_response import FastJSONResponse, dumps as json_dumps
+from common.logging_config import setup_logging
+from common.metrics import setup_metrics, request_stats
+from common.readiness import Readiness, setup_readiness
+from common.revocation_store import RevocationStore
+from common.tracing import setup_tracing
+from database_service import BlogServiceDatabase, PostNotFoundError, PostPermissionError, decode_search_cursor
+from bulk_io import (
+    IMPORT_BATCH_SIZE, EXPORT_CHUNK_SIZE, IMPORT_MAX_REPORTED_ERRORS, iter_lines, parse_import_line, to_ndjson_line,
+)
+from response_cache import (
+    ResponseCache, CachedResponse, make_etag, http_date, etag_matches, not_modified_since,
+)
+from static_assets import Asset, StaticAssets, asset_response, IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+# --- 기본 로깅 (JSON 한 줄 형식, 백그라운드 스레드에서 출력) ---
+setup_logging("blog-service")
 logger = logging.getLogger('BlogServiceApp')
 
-app = FastAPI()
+# --- 설정 ---
+AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://auth-service:8002')
+# 비어 있으면 로컬 검증을 끄고 항상 auth-service /verify로 위임
+AUTH_JWKS_URL = os.getenv('AUTH_JWKS_URL', f'{AUTH_SERVICE_URL}/.well-known/jwks.json')
+AUTH_JWKS_REFRESH_INTERVAL = float(os.getenv('AUTH_JWKS_REFRESH_INTERVAL', '300'))
+# 로컬 검증에서도 로그아웃된 토큰을 거절하도록 auth-service의 폐기 기록 Stream을 따라 받음
+REDIS_URL = f"redis://{os.getenv('REDIS_HOST', 'redis-service')}:{os.getenv('REDIS_PORT', '6379')}"
+TOKEN_REVOCATION_STREAM = os.getenv('TOKEN_REVOCATION_STREAM', 'auth:revocations')
 
-# --- 정적 파일 및 템플릿 설정 ---
-templates = Jinja2Templates(directory="templates")
-app.mount("/blog/static", StaticFiles(directory="static"), name="static")
+# --- 서비스 간 호출용 공유 HTTP 클라이언트와 DB 커넥션 풀 (lifespan에서 생성/종료) ---
+http_client = HttpClient(HttpClientConfig())
+# auth-service가 비대칭 키로 서명하면 공개 키(JWKS)로 토큰을 직접 검증
+# (폐기 목록은 읽기만 하므로 Stream 정리 기준인 max_token_lifetime은 쓰이지 않음)
+jwt_verifier = JWKSVerifier(
+    AUTH_JWKS_URL, http_client,
+    revocations=RevocationStore(REDIS_URL, TOKEN_REVOCATION_STREAM, max_token_lifetime=0),
+    refresh_interval=AUTH_JWKS_REFRESH_INTERVAL,
+) if AUTH_JWKS_URL else None
+db = BlogServiceDatabase()
+# 게시물 조회 응답 캐시 (생성/수정/삭제 시 영향을 받는 항목만 무효화)
+response_cache = ResponseCache()
 
+# 정적 파일은 내용 해시 URL로 메모리에서 제공 (시작 시 한 번 읽고 gzip/brotli로 미리 압축)
+static_assets = StaticAssets("static", url_prefix="/blog/static")
+# SPA 셸은 요청마다 달라지지 않으므로 lifespan 예열(또는 첫 요청)에서 한 번 렌더링하여 압축본과 함께 보관
+spa_shell: Optional[Asset] = None
+# 읽기와 압축은 이벤트 루프 밖(스레드)에서 한 번만 하도록 예열과 첫 요청이 같은 잠금을 기다림
+_asset_build_lock = asyncio.Lock()
 
-# --- 설정 ---
-AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://auth-service:8002')
-DATABASE_PATH = os.getenv('BLOG_DATABASE_PATH', '/app/blog.db')
-
-# --- SQLite 초기화 ---
-def init_db():
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                author TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-            """
-        )
-        conn.commit()
+def render_spa_shell() -> Asset:
+    html = Jinja2Templates(directory="templates").get_template("index.html").render(static_url=static_assets.url)
+    return Asset.build(html.encode("utf-8"), "text/html; charset=utf-8")
 
-def row_to_post(row: sqlite3.Row) -> Dict:
-    return {
-        "id": row[0],
-        "title": row[1],
-        "content": row[2],
-        "author": row[3],
-        "created_at": row[4],
-        "updated_at": row[5],
-    }
+async def ensure_static_assets():
+    if not static_assets.loaded:
+        async with _asset_build_lock:
+            if not static_assets.loaded:
+                await asyncio.to_thread(static_assets.load)
 
-init_db()
+async def ensure_spa_shell() -> Asset:
+    global spa_shell
+    if spa_shell is None:
+        await ensure_static_assets()
+        async with _asset_build_lock:
+            if spa_shell is None:
+                spa_shell = await asyncio.to_thread(render_spa_shell)
+    return spa_shell
 
-# --- Pydantic 모델 ---
-class UserLogin(BaseModel):
-    username: str
-    password: str
+readiness = Readiness()
+readiness.add_check("database", db.health_check)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.gather(db.initialize(), http_client.start())
+    if jwt_verifier:
+        await jwt_verifier.start()
+    # 요청을 받기 시작한 뒤 백그라운드에서 동시에 예열 (끝날 때까지 /ready는 503)
+    readiness.warm_up("spa_shell", ensure_spa_shell)
+    readiness.warm_up("db_statements", db.warm_up)
+    readiness.warm_up("post_list_cache", lambda: load_post_list(offset=0, before_id=None, limit=20))
+    readiness.warm_up("auth_connection", lambda: http_client.warm(f"{AUTH_SERVICE_URL}/health"))
+    yield
+    await readiness.close()
+    if jwt_verifier:
+        await jwt_verifier.close()
+    await http_client.close()
+    await db.close()
 
-class UserRegister(BaseModel):
-    username: str
-    password: str
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+setup_metrics(app)
+setup_tracing(app, "blog-service")
+setup_readiness(app, readiness)
 
+# --- Pydantic 모델 ---
 class PostCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=120)
     content: str = Field(..., min_length=1, max_length=20000)
@@ -79,144 +120,231 @@ async def require_user(request: Request) -> str:
     if not auth_header.startswith('Bearer '):
         raise HTTPException(status_code=401, detail='Authorization header missing or invalid')
     token = auth_header.split(' ')[1]
+    if jwt_verifier and jwt_verifier.handles(token):
+        # 공개 키로 프로세스 내 검증 (auth-service 왕복 없음)
+        try:
+            payload = await jwt_verifier.verify(token)
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail='Invalid or expired token')
+        username = payload.get('username')
+        if not username:
+            raise HTTPException(status_code=401, detail='Invalid token payload')
+        return username
     verify_url = f"{AUTH_SERVICE_URL}/verify"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(verify_url, headers={'Authorization': f'Bearer {token}'}) as resp:
-                data = await resp.json()
-                if resp.status != 200 or data.get('status') != 'success':
-                    raise HTTPException(status_code=401, detail='Invalid or expired token')
-                username = data.get('data', {}).get('username')
-                if not username:
-                    raise HTTPException(status_code=401, detail='Invalid token payload')
-                return username
-    except aiohttp.ClientError:
+        async with http_client.session.get(verify_url, headers={'Authorization': f'Bearer {token}'}) as resp:
+            data = await resp.json()
+            if resp.status != 200 or data.get('status') != 'success':
+                raise HTTPException(status_code=401, detail='Invalid or expired token')
+            username = data.get('data', {}).get('username')
+            if not username:
+                raise HTTPException(status_code=401, detail='Invalid token payload')
+            return username
+    except (aiohttp.ClientError, asyncio.TimeoutError):
         raise HTTPException(status_code=502, detail='Auth service not reachable')
 
+# --- 조건부 GET 유틸 ---
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """캐시된 응답을 반환하되, 클라이언트 사본이 최신이면 304로 응답합니다."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", **entry.headers}
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, entry.etag)
+    else:
+        fresh = not_modified_since(request.headers.get("if-modified-since"), entry.last_modified)
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 # --- API 핸들러 함수 ---
 @app.get("/api/posts")
-async def handle_get_posts(offset: int = Query(0, ge=0), limit: int = Query(20, ge=1, le=100)):
-    """모든 블로그 게시물 목록을 반환합니다(최신순, 페이지네이션)."""
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, title, content, author, created_at, updated_at FROM posts ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
-        rows = cursor.fetchall()
-        items = [row_to_post(r) for r in rows]
+async def handle_get_posts(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = Query(None, ge=1),
+):
+    """
+    모든 블로그 게시물 목록을 반환합니다(최신순, 페이지네이션).
+    before_id를 주면 커서(키셋) 방식으로 조회하며, 다음 페이지 커서는 X-Next-Cursor 헤더로 전달합니다.
+    """
+    entry = await load_post_list(offset, before_id, limit)
+    return cached_json_response(request, entry)
+
+async def load_post_list(offset: int, before_id: Optional[int], limit: int) -> CachedResponse:
+    """목록 페이지를 응답 캐시에서 찾고, 없으면 조회하여 캐시에 넣음 (시작 시 첫 페이지 예열에도 사용)"""
+    key = ("list", offset if before_id is None else 0, before_id, limit)
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
         # 목록 응답은 요약 정보 위주로 반환 + 발췌(excerpt)
-        summaries = []
-        for p in items:
-            content = (p.get("content") or "").replace("\r", " ").replace("\n", " ")
-            excerpt = content[:120] + ("..." if len(content) > 120 else "")
-            summaries.append({
-                "id": p["id"],
-                "title": p["title"],
-                "author": p["author"],
-                "created_at": p["created_at"],
-                "excerpt": excerpt,
-            })
-        return JSONResponse(content=summaries)
+        summaries, next_cursor = await db.list_posts(limit, offset=offset, before_id=before_id)
+        body = json_dumps(summaries)
+        ids = frozenset(p["id"] for p in summaries)
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            headers={"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else {},
+            ids=ids,
+            # 마지막 페이지면 가장 작은 id까지 모두 포함하는 것으로 간주
+            lo=min(ids) if next_cursor is not None else 0,
+            hi=before_id,
+            is_list=True,
+        )
+        response_cache.put(key, entry, generation)
+    return entry
+
+@app.get("/api/authors/{author}/posts")
+async def handle_get_author_posts(
+    author: str,
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = Query(None, ge=1),
+):
+    """
+    작성자의 게시물 목록을 반환합니다(최신순, 키셋 페이지네이션).
+    다음 페이지 커서는 X-Next-Cursor, 작성자의 전체 게시물 수는 X-Total-Count 헤더로 전달합니다.
+    """
+    summaries, next_cursor, total = await db.list_author_posts(author, limit, before_id=before_id)
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+    return FastJSONResponse(content=summaries, headers=headers)
+
+@app.get("/api/posts/search")
+async def handle_search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+):
+    """
+    제목/본문 전문 검색 결과를 관련도(bm25) 순으로 반환합니다.
+    다음 페이지 커서는 X-Next-Cursor 헤더로 전달하며, 같은 q와 함께 cursor로 넘기면 이어서 조회합니다.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_search_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail={'error': 'Invalid cursor'})
+    results, next_cursor = await db.search_posts(q, limit, after=after)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+    return FastJSONResponse(content=results, headers=headers)
+
+@app.get("/api/posts/export")
+async def handle_export_posts():
+    """전체 게시물을 id 순으로 NDJSON(한 줄에 게시물 하나) 스트림으로 내보냅니다."""
+    async def _stream():
+        async for posts in db.iter_posts(EXPORT_CHUNK_SIZE):
+            yield b"".join(to_ndjson_line(post) for post in posts)
+    return StreamingResponse(
+        _stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="posts.ndjson"'},
+    )
+
+@app.post("/api/posts/import")
+async def handle_import_posts(request: Request, username: str = Depends(require_user)):
+    """
+    NDJSON 본문을 스트리밍으로 읽어 게시물을 일괄 등록합니다.
+    IMPORT_BATCH_SIZE줄씩 executemany로 한 트랜잭션에 삽입하며, 배치를 쓰는 동안에는 본문을
+    더 읽지 않으므로 입력 크기와 무관하게 메모리가 일정합니다. 잘못된 줄은 건너뛰고 결과에 보고합니다.
+    """
+    now = datetime.utcnow().isoformat()
+    summary = {"imported": 0, "failed": 0, "lines": 0, "batches": 0, "errors": []}
+
+    def _report(line_no, error):
+        summary["failed"] += 1
+        if len(summary["errors"]) < IMPORT_MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_no, "error": str(error)})
+
+    async def _flush(batch):
+        summary["batches"] += 1
+        try:
+            summary["imported"] += await db.insert_posts(row for _, row in batch)
+        except Exception as e:
+            # 배치 전체가 롤백되므로 각 줄을 실패로 집계 (조회 결과가 바뀌지 않으므로 캐시도 유지)
+            logger.error("Post import batch failed at line %d: %s", batch[0][0], e)
+            for line_no, _ in batch:
+                _report(line_no, "database error")
+            return
+        # 커밋된 배치는 바로 조회에 보이므로 목록 캐시를 비움
+        response_cache.clear()
+
+    batch = []
+    async for line_no, line in iter_lines(request.stream()):
+        summary["lines"] = line_no
+        if isinstance(line, Exception):
+            _report(line_no, line)
+            continue
+        if not line.strip():
+            continue
+        try:
+            batch.append((line_no, parse_import_line(line, username, now)))
+        except ValueError as e:
+            _report(line_no, e)
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await _flush(batch)
+            batch = []
+    if batch:
+        await _flush(batch)
+    logger.info("Imported %d posts for %s (%d failed)", summary["imported"], username, summary["failed"])
+    return summary
 
 @app.get("/api/posts/{post_id}")
-async def handle_get_post_by_id(post_id: int):
+async def handle_get_post_by_id(request: Request, post_id: int):
     """ID로 특정 게시물을 찾아 반환합니다."""
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, title, content, author, created_at, updated_at FROM posts WHERE id = ?", (post_id,))
-        row = cursor.fetchone()
-        if not row:
+    key = ("post", post_id)
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        post = await db.get_post(post_id)
+        if not post:
             raise HTTPException(status_code=404, detail={'error': 'Post not found'})
-        return JSONResponse(content=row_to_post(row))
-
-@app.post("/api/login")
-async def handle_login(user_login: UserLogin):
-    """사용자 로그인을 처리합니다."""
-    user = users_db.get(user_login.username)
-    if user and user['password'] == user_login.password:
-        return JSONResponse(content={'token': f'session-token-for-{user_login.username}'})
-    raise HTTPException(status_code=401, detail={'error': 'Invalid credentials'})
-
-@app.post("/api/register", status_code=201)
-async def handle_register(user_register: UserRegister):
-    """사용자 등록을 처리합니다."""
-    if not user_register.username or not user_register.password:
-        raise HTTPException(status_code=400, detail={'error': 'Username and password are required'})
-    if user_register.username in users_db:
-        raise HTTPException(status_code=409, detail={'error': 'Username already exists'})
-
-    users_db[user_register.username] = {'password': user_register.password}
-    logger.info(f"New user registered: {user_register.username}")
-    return JSONResponse(content={'message': 'Registration successful'})
+        entry = CachedResponse(
+            body=json_dumps(post),
+            etag=make_etag(f"{post_id}:{post['updated_at']}".encode("utf-8")),
+            last_modified=http_date(post["updated_at"]),
+        )
+        response_cache.put(key, entry, generation)
+    return cached_json_response(request, entry)
 
 @app.post("/api/posts", status_code=201)
 async def create_post(request: Request, payload: PostCreate, username: str = Depends(require_user)):
     now = datetime.utcnow().isoformat()
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO posts (title, content, author, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
-            (payload.title, payload.content, username, now, now)
-        )
-        post_id = cursor.lastrowid
-        conn.commit()
-    return JSONResponse(content={
-        "id": post_id,
-        "title": payload.title,
-        "content": payload.content,
-        "author": username,
-        "created_at": now,
-        "updated_at": now,
-    })
+    post = await db.create_post(payload.title, payload.content, username, now)
+    response_cache.invalidate_structure(post["id"])
+    return FastJSONResponse(content=post)
 
 @app.patch("/api/posts/{post_id}")
 async def update_post_partial(post_id: int, request: Request, payload: PostUpdate, username: str = Depends(require_user)):
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT author FROM posts WHERE id = ?", (post_id,))
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail={'error': 'Post not found'})
-        if row[0] != username:
-            raise HTTPException(status_code=403, detail='Forbidden: not the author')
-        fields = []
-        params = []
-        if payload.title is not None:
-            fields.append("title = ?")
-            params.append(payload.title)
-        if payload.content is not None:
-            fields.append("content = ?")
-            params.append(payload.content)
-        if not fields:
-            return JSONResponse(content={"message": "No changes"})
-        fields.append("updated_at = ?")
-        params.append(datetime.utcnow().isoformat())
-        params.append(post_id)
-        cursor.execute(f"UPDATE posts SET {', '.join(fields)} WHERE id = ?", tuple(params))
-        conn.commit()
-        cursor.execute("SELECT id, title, content, author, created_at, updated_at FROM posts WHERE id = ?", (post_id,))
-        out = cursor.fetchone()
-        return JSONResponse(content=row_to_post(out))
+    try:
+        post = await db.update_post(post_id, username, payload.title, payload.content, datetime.utcnow().isoformat())
+    except PostNotFoundError:
+        raise HTTPException(status_code=404, detail={'error': 'Post not found'})
+    except PostPermissionError:
+        raise HTTPException(status_code=403, detail='Forbidden: not the author')
+    if post is None:
+        return FastJSONResponse(content={"message": "No changes"})
+    response_cache.invalidate_post(post_id)
+    return FastJSONResponse(content=post)
 
 @app.delete("/api/posts/{post_id}", status_code=204)
 async def delete_post(post_id: int, request: Request, username: str = Depends(require_user)):
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT author FROM posts WHERE id = ?", (post_id,))
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail={'error': 'Post not found'})
-        if row[0] != username:
-            raise HTTPException(status_code=403, detail='Forbidden: not the author')
-        cursor.execute("DELETE FROM posts WHERE id = ?", (post_id,))
-        conn.commit()
+    try:
+        await db.delete_post(post_id, username)
+    except PostNotFoundError:
+        raise HTTPException(status_code=404, detail={'error': 'Post not found'})
+    except PostPermissionError:
+        raise HTTPException(status_code=403, detail='Forbidden: not the author')
+    response_cache.invalidate_structure(post_id)
     return Response(status_code=204)
 
 @app.get("/health")
 async def handle_health():
-    """쿠버네티스를 위한 헬스 체크 엔드포인트"""
+    """쿠버네티스 liveness용 헬스 체크 엔드포인트 (의존성 상태는 /ready)"""
     return {"status": "ok", "service": "blog-service"}
 
 @app.get("/stats")
@@ -225,32 +353,30 @@ async def handle_stats():
     return {
         "blog_service": {
             "service_status": "online",
-            "post_count": len(posts_db)
+            "post_count": await db.count_posts(),
+            "requests": request_stats(),
+            "upstreams": http_client.stats(),
+            "response_cache": response_cache.stats(),
+            "static_assets": static_assets.stats()
         }
     }
 
 # --- 웹 페이지 서빙 (SPA) ---
+@app.api_route("/blog/static/{path:path}", methods=["GET", "HEAD"])
+async def serve_static(request: Request, path: str):
+    """정적 파일. 해시 URL은 immutable로 캐시하고, 해시 없는 URL은 매번 재검증합니다."""
+    await ensure_static_assets()
+    found = static_assets.get(path)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    asset, hashed = found
+    return asset_response(request, asset, IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL)
+
 @app.get("/blog/{path:path}")
 async def serve_spa(request: Request, path: str):
-    """메인 블로그 페이지를 렌더링합니다."""
-    return templates.TemplateResponse("index.html", {"request": request})
-
-
-# --- 애플리케이션 시작 시 샘플 데이터 설정 ---
-@app.on_event("startup")
-def setup_sample_data():
-    """서비스 시작 시 샘플 데이터를 생성합니다."""
-    global posts_db, users_db
-    posts_db = {
-        1: {"id": 1, "title": "첫 번째 블로그 글", "author": "admin",
-            "content": "마이크로서비스 아키텍처에 오신 것을 환영합니다! 이 블로그는 FastAPI로 리팩터링되었습니다."},
-        2: {"id": 2, "title": "Kustomize와 Skaffold 활용하기", "author": "dev",
-            "content": "인프라 관리가 이렇게 쉬울 수 있습니다. CI/CD 파이프라인을 통해 자동으로 배포됩니다."},
-    }
-    users_db = {
-        'admin': {'password': 'password123'}
-    }
-    logger.info(f"{len(posts_db)}개의 샘플 게시물과 {len(users_db)}명의 사용자로 초기화되었습니다.")
+    """메인 블로그 페이지(미리 렌더링한 SPA 셸)를 반환합니다."""
+    return asset_response(request, await ensure_spa_shell(), REVALIDATE_CACHE_CONTROL)
+
 
 if __name__ == "__main__":
     import uvicorn
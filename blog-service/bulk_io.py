@@ -0,0 +1,93 @@
+# blog-service/bulk_io.py
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+
+from common.json_response import dumps as json_dumps
+
+IMPORT_BATCH_SIZE = int(os.getenv('BLOG_IMPORT_BATCH_SIZE', '500'))
+EXPORT_CHUNK_SIZE = int(os.getenv('BLOG_EXPORT_CHUNK_SIZE', '500'))
+# 한 줄(게시물 하나)의 최대 크기. 이보다 긴 줄은 버퍼에 쌓지 않고 오류로 건너뜀
+IMPORT_MAX_LINE_BYTES = int(os.getenv('BLOG_IMPORT_MAX_LINE_BYTES', str(256 * 1024)))
+# 응답에 담을 오류 상세의 최대 개수 (전체 실패 수는 별도로 집계)
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+
+class ImportedPost(BaseModel):
+    title: str = Field(..., min_length=1, max_length=120)
+    content: str = Field(..., min_length=1, max_length=20000)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class LineTooLongError(ValueError):
+    pass
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = IMPORT_MAX_LINE_BYTES
+                     ) -> AsyncIterator[Tuple[int, object]]:
+    """
+    바이트 청크 스트림을 줄 단위로 나눠 (줄 번호, bytes 또는 LineTooLongError)를 내보냄.
+    버퍼는 최대 한 줄 크기로 제한되므로 입력 전체 크기와 무관하게 메모리가 일정함
+    """
+    buffer = bytearray()
+    line_no = 0
+    skipping = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                if not skipping:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        # 줄 끝이 나올 때까지 나머지는 버림
+                        skipping = True
+                        buffer.clear()
+                break
+            line_no += 1
+            if skipping:
+                skipping = False
+                yield line_no, LineTooLongError(f"line exceeds {max_line_bytes} bytes")
+            else:
+                buffer += chunk[start:newline]
+                if len(buffer) > max_line_bytes:
+                    yield line_no, LineTooLongError(f"line exceeds {max_line_bytes} bytes")
+                else:
+                    yield line_no, bytes(buffer)
+                buffer.clear()
+            start = newline + 1
+    if skipping:
+        yield line_no + 1, LineTooLongError(f"line exceeds {max_line_bytes} bytes")
+    elif buffer.strip():
+        yield line_no + 1, bytes(buffer)
+
+
+def parse_import_line(line: bytes, author: str, now: str) -> Tuple:
+    """
+    NDJSON 한 줄을 INSERT용 튜플(title, content, author, created_at, updated_at)로 변환.
+    id와 author는 원본 값을 쓰지 않음 (새 id 발급, 가져온 사용자를 작성자로 기록).
+    잘못된 줄이면 ValueError
+    """
+    try:
+        record = ImportedPost.model_validate_json(line)
+    except ValidationError as e:
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        raise ValueError(f"{location}: {error['msg']}" if location else error["msg"])
+    created_at = _utc_isoformat(record.created_at) if record.created_at else now
+    updated_at = _utc_isoformat(record.updated_at) if record.updated_at else created_at
+    return record.title, record.content, author, created_at, updated_at
+
+
+def _utc_isoformat(value: datetime) -> str:
+    """DB의 시각 표기(오프셋 없는 UTC)로 변환. 오프셋이 없는 값은 이미 UTC로 봄"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def to_ndjson_line(post: Dict) -> bytes:
+    return json_dumps(post) + b"\n"
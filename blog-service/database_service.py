@@ -0,0 +1,424 @@
+# blog-service/database_service.py
+import os
+import sys
+import html
+import logging
+import sqlite3
+from typing import AsyncIterator, Iterable, Optional, Dict, List, Tuple
+
+from common.sqlite_pool import SQLitePool
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = os.getenv('BLOG_DATABASE_PATH', '/app/blog.db')
+DB_POOL_SIZE = int(os.getenv('BLOG_DB_POOL_SIZE', '4'))
+
+POST_COLUMNS = "id, title, content, author, created_at, updated_at"
+# 목록 조회는 본문(content)을 읽지 않고 미리 계산된 발췌만 사용
+SUMMARY_COLUMNS = "id, title, author, created_at, excerpt"
+EXCERPT_LENGTH = 120
+
+# 조회 경로의 SQL. 같은 문자열을 시작 시 예열(warm_up)에도 사용해야 sqlite3 구문 캐시가 적중함
+LIST_POSTS_SQL = f"SELECT {SUMMARY_COLUMNS} FROM posts ORDER BY id DESC LIMIT ? OFFSET ?"
+LIST_POSTS_BEFORE_SQL = f"SELECT {SUMMARY_COLUMNS} FROM posts WHERE id < ? ORDER BY id DESC LIMIT ?"
+GET_POST_SQL = f"SELECT {POST_COLUMNS} FROM posts WHERE id = ?"
+# 작성자별 목록은 (author, id DESC) 인덱스만 따라가므로 전체 게시물 수와 무관
+LIST_AUTHOR_POSTS_SQL = f"SELECT {SUMMARY_COLUMNS} FROM posts WHERE author = ? AND id < ? ORDER BY id DESC LIMIT ?"
+AUTHOR_POST_COUNT_SQL = "SELECT post_count FROM author_post_counts WHERE author = ?"
+# 전체 게시물 수도 posts를 세지 않고 작성자별 집계를 합산
+COUNT_POSTS_SQL = "SELECT COALESCE(SUM(post_count), 0) FROM author_post_counts"
+WARM_STATEMENTS = [LIST_POSTS_SQL, LIST_POSTS_BEFORE_SQL, GET_POST_SQL, LIST_AUTHOR_POSTS_SQL,
+                   AUTHOR_POST_COUNT_SQL, COUNT_POSTS_SQL, "SELECT 1"]
+# 키셋 조회의 첫 페이지 상한 (SQLite INTEGER 최댓값)
+MAX_POST_ID = 2 ** 63 - 1
+
+# 검색 결과 하이라이트 구분자. SQLite가 원문에 끼워 넣은 뒤, HTML 이스케이프 후 <mark>로 치환
+_HL_OPEN, _HL_CLOSE = "\x02", "\x03"
+SEARCH_TITLE_WEIGHT = 10.0
+SEARCH_CONTENT_WEIGHT = 1.0
+
+FTS_SCHEMA = [
+    # posts 테이블을 원본으로 하는 external-content FTS5 인덱스
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content,
+        content='posts', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # 트리거로 posts 변경 시 인덱스를 같은 트랜잭션 안에서 동기화
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+AUTHOR_SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS idx_posts_author_id ON posts(author, id DESC)",
+    """
+    CREATE TABLE IF NOT EXISTS author_post_counts (
+        author TEXT PRIMARY KEY,
+        post_count INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    # 게시물 생성/삭제와 같은 트랜잭션 안에서 작성자별 게시물 수를 갱신 (일괄 가져오기 포함)
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_author_count_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO author_post_counts(author, post_count) VALUES (new.author, 1)
+            ON CONFLICT(author) DO UPDATE SET post_count = post_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_author_count_ad AFTER DELETE ON posts BEGIN
+        UPDATE author_post_counts SET post_count = post_count - 1 WHERE author = old.author;
+        DELETE FROM author_post_counts WHERE author = old.author AND post_count <= 0;
+    END
+    """,
+]
+
+
+class PostNotFoundError(Exception):
+    """요청한 게시물이 존재하지 않음"""
+
+
+class PostPermissionError(Exception):
+    """게시물 작성자가 아닌 사용자의 수정/삭제 시도"""
+
+
+def make_excerpt(content: str) -> str:
+    """목록에 표시할 한 줄 발췌 (줄바꿈 제거 후 120자)"""
+    content = (content or "").replace("\r", " ").replace("\n", " ")
+    return content[:EXCERPT_LENGTH] + ("..." if len(content) > EXCERPT_LENGTH else "")
+
+
+def build_match_query(q: str) -> str:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 변환합니다.
+    각 단어를 따옴표로 감싸 연산자 해석을 막고, 접두어 검색(*)으로 조사가 붙은 단어도 찾습니다.
+    """
+    terms = [t.replace('"', '""') for t in q.split()]
+    return " ".join(f'"{t}"*' for t in terms if t)
+
+
+def _render_highlight(text: str) -> str:
+    return html.escape(text or "").replace(_HL_OPEN, "<mark>").replace(_HL_CLOSE, "</mark>")
+
+
+def encode_search_cursor(score: float, post_id: int) -> str:
+    return f"{score!r}:{post_id}"
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """검색 커서('score:id')를 해석합니다. 형식이 잘못되면 ValueError"""
+    score, _, post_id = cursor.rpartition(":")
+    return float(score), int(post_id)
+
+
+def rebuild_search_index(conn: sqlite3.Connection):
+    """posts 테이블 전체로부터 FTS 인덱스를 다시 만듭니다."""
+    conn.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def row_to_summary(row: sqlite3.Row) -> Dict:
+    return {
+        "id": row[0],
+        "title": row[1],
+        "author": row[2],
+        "created_at": row[3],
+        "excerpt": row[4],
+    }
+
+
+def row_to_post(row: sqlite3.Row) -> Dict:
+    return {
+        "id": row[0],
+        "title": row[1],
+        "content": row[2],
+        "author": row[3],
+        "created_at": row[4],
+        "updated_at": row[5],
+    }
+
+
+class BlogServiceDatabase:
+    """게시물 저장소. 모든 쿼리는 SQLitePool을 통해 이벤트 루프 밖에서 실행됨"""
+
+    def __init__(self, db_file: str = DATABASE_PATH, pool_size: int = DB_POOL_SIZE):
+        self.db_file = db_file
+        self.pool = SQLitePool(db_file, size=pool_size)
+
+    async def initialize(self):
+        """커넥션 풀을 열고 스키마를 준비합니다."""
+        await self.pool.open()
+        await self.pool.write(self._create_schema, op="create_schema")
+
+    async def close(self):
+        await self.pool.close()
+
+    async def warm_up(self):
+        """목록/상세 조회 구문을 모든 읽기 커넥션에 미리 준비 (lifespan에서 백그라운드로 실행)"""
+        await self.pool.warm(WARM_STATEMENTS)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                author TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                excerpt TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        # 기존 DB 마이그레이션: excerpt 컬럼 추가 후 기존 게시물의 발췌를 채움
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(posts)")}
+        if "excerpt" not in columns:
+            conn.execute("ALTER TABLE posts ADD COLUMN excerpt TEXT NOT NULL DEFAULT ''")
+            rows = conn.execute("SELECT id, content FROM posts").fetchall()
+            conn.executemany(
+                "UPDATE posts SET excerpt = ? WHERE id = ?",
+                ((make_excerpt(r[1]), r[0]) for r in rows)
+            )
+            logger.info(f"Backfilled excerpt column for {len(rows)} posts")
+
+        # 검색 인덱스가 새로 만들어지는 경우(기존 DB 포함) 현재 게시물로 채움
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+        ).fetchone()
+        for statement in FTS_SCHEMA:
+            conn.execute(statement)
+        if not has_fts:
+            rebuild_search_index(conn)
+
+        # 작성자 인덱스와 게시물 수 집계. 집계 테이블이 새로 만들어지면 현재 게시물로 채움
+        has_counts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'author_post_counts'"
+        ).fetchone()
+        for statement in AUTHOR_SCHEMA:
+            conn.execute(statement)
+        if not has_counts:
+            conn.execute(
+                "INSERT INTO author_post_counts(author, post_count) SELECT author, COUNT(*) FROM posts GROUP BY author"
+            )
+
+    # --- 조회 ---
+    async def list_posts(self, limit: int, offset: int = 0, before_id: Optional[int] = None) -> Tuple[List[Dict], Optional[int]]:
+        """
+        최신순 게시물 요약 목록과 다음 페이지 커서를 반환합니다.
+        before_id가 주어지면 키셋(id < before_id) 방식으로, 아니면 OFFSET 방식으로 조회합니다.
+        """
+        def _query(conn):
+            # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회
+            if before_id is not None:
+                rows = conn.execute(LIST_POSTS_BEFORE_SQL, (before_id, limit + 1)).fetchall()
+            else:
+                rows = conn.execute(LIST_POSTS_SQL, (limit + 1, offset)).fetchall()
+            items = [row_to_summary(r) for r in rows[:limit]]
+            next_cursor = items[-1]["id"] if len(rows) > limit else None
+            return items, next_cursor
+        return await self.pool.read(_query, op="list_posts")
+
+    async def list_author_posts(self, author: str, limit: int,
+                                before_id: Optional[int] = None) -> Tuple[List[Dict], Optional[int], int]:
+        """
+        작성자의 게시물 요약 목록(최신순)과 다음 페이지 커서, 작성자의 전체 게시물 수를 반환합니다.
+        (author, id DESC) 인덱스를 키셋(id < before_id)으로 따라가므로 페이지 위치와 무관하게 limit건만 읽습니다.
+        """
+        def _query(conn):
+            rows = conn.execute(LIST_AUTHOR_POSTS_SQL, (author, before_id or MAX_POST_ID, limit + 1)).fetchall()
+            count = conn.execute(AUTHOR_POST_COUNT_SQL, (author,)).fetchone()
+            items = [row_to_summary(r) for r in rows[:limit]]
+            next_cursor = items[-1]["id"] if len(rows) > limit else None
+            return items, next_cursor, count[0] if count else 0
+        return await self.pool.read(_query, op="list_author_posts")
+
+    async def search_posts(self, q: str, limit: int,
+                           after: Optional[Tuple[float, int]] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        FTS5 인덱스로 게시물을 검색합니다. bm25 점수(제목 가중치 우선) 순으로 정렬하며,
+        (점수, id) 키셋 커서로 다음 페이지를 이어서 조회합니다.
+        """
+        match = build_match_query(q)
+        if not match:
+            return [], None
+        score_expr = f"bm25(posts_fts, {SEARCH_TITLE_WEIGHT}, {SEARCH_CONTENT_WEIGHT})"
+        sql = f"""
+            SELECT p.id, p.title, p.author, p.created_at,
+                   highlight(posts_fts, 0, '{_HL_OPEN}', '{_HL_CLOSE}') AS title_hl,
+                   snippet(posts_fts, 1, '{_HL_OPEN}', '{_HL_CLOSE}', '...', 24) AS snippet,
+                   {score_expr} AS score
+            FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid
+            WHERE posts_fts MATCH ?
+        """
+        params: list = [match]
+        if after is not None:
+            sql += f" AND ({score_expr} > ? OR ({score_expr} = ? AND p.id > ?))"
+            params.extend([after[0], after[0], after[1]])
+        sql += " ORDER BY score, p.id LIMIT ?"
+        params.append(limit + 1)
+
+        def _query(conn):
+            rows = conn.execute(sql, params).fetchall()
+            items = [{
+                "id": r["id"],
+                "title": r["title"],
+                "author": r["author"],
+                "created_at": r["created_at"],
+                "title_highlight": _render_highlight(r["title_hl"]),
+                "snippet": _render_highlight(r["snippet"]),
+                "score": r["score"],
+            } for r in rows[:limit]]
+            next_cursor = None
+            if len(rows) > limit:
+                last = rows[limit - 1]
+                next_cursor = encode_search_cursor(last["score"], last["id"])
+            return items, next_cursor
+        return await self.pool.read(_query, op="search_posts")
+
+    async def iter_posts(self, chunk_size: int) -> AsyncIterator[List[Dict]]:
+        """
+        전체 게시물을 id 순으로 chunk_size개씩 내보냅니다.
+        각 청크는 짧은 읽기 트랜잭션(id > 마지막 id 키셋)으로 조회하므로, 느린 클라이언트가
+        커넥션을 붙잡거나 WAL 체크포인트를 막지 않고 메모리도 청크 하나 크기로 유지됩니다.
+        """
+        def _query(conn, after_id):
+            rows = conn.execute(
+                f"SELECT {POST_COLUMNS} FROM posts WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, chunk_size)
+            ).fetchall()
+            return [row_to_post(r) for r in rows]
+        after_id = 0
+        while True:
+            posts = await self.pool.read(_query, after_id, op="export_posts")
+            if not posts:
+                return
+            yield posts
+            if len(posts) < chunk_size:
+                return
+            after_id = posts[-1]["id"]
+
+    async def insert_posts(self, rows: Iterable[Tuple]) -> int:
+        """(title, content, author, created_at, updated_at) 튜플들을 하나의 트랜잭션으로 삽입"""
+        def _insert(conn):
+            cursor = conn.executemany(
+                "INSERT INTO posts (title, content, author, created_at, updated_at, excerpt) VALUES (?, ?, ?, ?, ?, ?)",
+                ((title, content, author, created_at, updated_at, make_excerpt(content))
+                 for title, content, author, created_at, updated_at in rows)
+            )
+            return cursor.rowcount
+        return await self.pool.write(_insert, op="import_posts")
+
+    async def rebuild_search_index(self):
+        await self.pool.write(rebuild_search_index, op="rebuild_search_index")
+
+    async def get_post(self, post_id: int) -> Optional[Dict]:
+        def _query(conn):
+            row = conn.execute(GET_POST_SQL, (post_id,)).fetchone()
+            return row_to_post(row) if row else None
+        return await self.pool.read(_query, op="get_post")
+
+    # --- 변경 ---
+    async def create_post(self, title: str, content: str, author: str, now: str) -> Dict:
+        def _insert(conn):
+            cursor = conn.execute(
+                "INSERT INTO posts (title, content, author, created_at, updated_at, excerpt) VALUES (?, ?, ?, ?, ?, ?)",
+                (title, content, author, now, now, make_excerpt(content))
+            )
+            return cursor.lastrowid
+        post_id = await self.pool.write(_insert, op="create_post")
+        return {
+            "id": post_id,
+            "title": title,
+            "content": content,
+            "author": author,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    @staticmethod
+    def _raise_not_owned(conn: sqlite3.Connection, post_id: int):
+        """작성자 조건이 걸린 변경이 아무 행도 바꾸지 못한 경우, 없는 게시물인지 다른 작성자의 게시물인지 구분"""
+        if conn.execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone():
+            raise PostPermissionError(post_id)
+        raise PostNotFoundError(post_id)
+
+    async def update_post(self, post_id: int, author: str, title: Optional[str],
+                          content: Optional[str], now: str) -> Optional[Dict]:
+        """
+        작성자 확인과 부분 수정을 조건부 UPDATE 한 문장(WHERE id AND author ... RETURNING)으로 처리합니다.
+        변경할 필드가 없으면 None을 반환합니다.
+        """
+        def _update(conn):
+            fields = []
+            params = []
+            if title is not None:
+                fields.append("title = ?")
+                params.append(title)
+            if content is not None:
+                fields.append("content = ?")
+                params.append(content)
+                fields.append("excerpt = ?")
+                params.append(make_excerpt(content))
+            if not fields:
+                if not conn.execute("SELECT 1 FROM posts WHERE id = ? AND author = ?", (post_id, author)).fetchone():
+                    self._raise_not_owned(conn, post_id)
+                return None
+            fields.append("updated_at = ?")
+            params.extend([now, post_id, author])
+            row = conn.execute(
+                f"UPDATE posts SET {', '.join(fields)} WHERE id = ? AND author = ? RETURNING {POST_COLUMNS}",
+                tuple(params)
+            ).fetchone()
+            if row is None:
+                self._raise_not_owned(conn, post_id)
+            return row_to_post(row)
+        return await self.pool.write(_update, op="update_post")
+
+    async def delete_post(self, post_id: int, author: str):
+        def _delete(conn):
+            cursor = conn.execute("DELETE FROM posts WHERE id = ? AND author = ?", (post_id, author))
+            if cursor.rowcount == 0:
+                self._raise_not_owned(conn, post_id)
+        await self.pool.write(_delete, op="delete_post")
+
+    async def count_posts(self) -> int:
+        return await self.pool.read(lambda conn: conn.execute(COUNT_POSTS_SQL).fetchone()[0], op="count_posts")
+
+    async def health_check(self) -> bool:
+        """데이터베이스 연결 상태를 확인합니다."""
+        try:
+            await self.pool.read(lambda conn: conn.execute("SELECT 1").fetchone(), op="health_check")
+            return True
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    # 기존 DB의 검색 인덱스 재생성: python database_service.py rebuild-search-index [DB 경로]
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild-search-index":
+        print("usage: python database_service.py rebuild-search-index [db_file]")
+        sys.exit(1)
+    db_file = sys.argv[2] if len(sys.argv) > 2 else DATABASE_PATH
+    with sqlite3.connect(db_file) as conn:
+        BlogServiceDatabase._create_schema(conn)
+        rebuild_search_index(conn)
+        count = conn.execute(COUNT_POSTS_SQL).fetchone()[0]
+    print(f"Rebuilt search index for {count} posts in {db_file}")
@@ -0,0 +1,135 @@
+# blog-service/response_cache.py
+import os
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, FrozenSet, Hashable
+
+from common.metrics import record_cache, cache_stats
+
+RESPONSE_CACHE_SIZE = int(os.getenv('BLOG_RESPONSE_CACHE_SIZE', '256'))
+
+
+def make_etag(data: bytes) -> str:
+    return f'"{hashlib.sha1(data).hexdigest()[:20]}"'
+
+
+def http_date(iso_timestamp: str) -> Optional[str]:
+    """DB에 저장된 UTC ISO 시각을 HTTP-date 형식으로 변환"""
+    try:
+        dt = datetime.fromisoformat(iso_timestamp)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: Optional[str]) -> bool:
+    """If-Modified-Since 이후 변경이 없는지 확인 (HTTP-date는 초 단위)"""
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더와 ETag의 약한 비교 (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+@dataclass
+class CachedResponse:
+    """직렬화가 끝난 응답 본문과 무효화 판단에 필요한 범위 정보"""
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    last_modified: Optional[str] = None
+    # 목록 응답에 포함된 게시물 id (수정 시 무효화 판단)
+    ids: FrozenSet[int] = frozenset()
+    # 목록 응답이 다루는 id 범위: lo <= id < hi (hi가 None이면 상한 없음 = OFFSET 방식)
+    lo: int = 0
+    hi: Optional[int] = None
+    is_list: bool = False
+
+
+class ResponseCache:
+    """
+    게시물 조회 응답을 직렬화된 바이트로 보관하는 LRU 캐시.
+    생성/수정/삭제 시 영향을 받는 항목만 골라서 무효화함
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.invalidations = 0
+        # 무효화가 일어날 때마다 증가. DB 조회 도중 변경이 생긴 응답은 저장하지 않기 위해 사용
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        record_cache("response", entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: CachedResponse, generation: Optional[int] = None):
+        """generation은 DB 조회 직전에 읽은 값. 그 사이 무효화가 있었다면 저장하지 않음"""
+        if self.max_entries <= 0 or (generation is not None and generation != self.generation):
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _drop(self, predicate) -> int:
+        self.generation += 1
+        stale = [k for k, e in self._entries.items() if predicate(k, e)]
+        for k in stale:
+            del self._entries[k]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def invalidate_structure(self, post_id: int):
+        """
+        게시물 생성/삭제: 해당 id가 목록 범위에 들어가는 페이지와 상세 응답을 무효화.
+        OFFSET 페이지는 위쪽에서 생긴 변화로도 밀리므로 lo 이상이면 모두 해당됨
+        """
+        self._drop(lambda k, e: (not e.is_list and k == ("post", post_id)) or (
+            e.is_list and e.lo <= post_id and (e.hi is None or post_id < e.hi)
+        ))
+
+    def invalidate_post(self, post_id: int):
+        """게시물 수정: 상세 응답과 이 게시물을 포함한 목록 페이지만 무효화"""
+        self._drop(lambda k, e: (not e.is_list and k == ("post", post_id)) or (
+            e.is_list and post_id in e.ids
+        ))
+
+    def clear(self):
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **cache_stats("response"),
+            "invalidations": self.invalidations,
+        }
@@ -238,25 +238,38 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
     // 데이터 로딩
-    const loadPosts = async () => {
+    const renderPostItems = (posts, container) => {
+        posts.forEach(post => {
+            const li = document.createElement('li');
+            li.className = 'post-list-item';
+            li.innerHTML = `
+                <div class="post-list-header">
+                    <h3 class="post-title"><a href="#/posts/${post.id}">${post.title}</a></h3>
+                    <span class="post-author">by ${post.author}</span>
+                </div>
+                <div class="post-excerpt">${(post.excerpt || '').replace(/</g, '&lt;')}</div>
+            `;
+            container.appendChild(li);
+        });
+    };
+
+    // 커서(before_id) 기반 목록 조회. 다음 페이지 커서는 X-Next-Cursor 헤더로 전달됨
+    const loadPosts = async (beforeId) => {
         try {
-            const response = await fetch('/api/posts');
+            const url = beforeId ? `/api/posts?before_id=${beforeId}` : '/api/posts';
+            const response = await fetch(url);
             if (!response.ok) throw new Error('Network response was not ok');
             const posts = await response.json();
             const container = document.getElementById('posts-container');
-            container.innerHTML = '';
-            posts.forEach(post => {
-                const li = document.createElement('li');
-                li.className = 'post-list-item';
-                li.innerHTML = `
-                    <div class="post-list-header">
-                        <h3 class="post-title"><a href="#/posts/${post.id}">${post.title}</a></h3>
-                        <span class="post-author">by ${post.author}</span>
-                    </div>
-                    <div class="post-excerpt">${(post.excerpt || '').replace(/</g, '&lt;')}</div>
-                `;
-                container.appendChild(li);
-            });
+            if (!beforeId) container.innerHTML = '';
+            renderPostItems(posts, container);
+
+            const moreBtn = document.getElementById('load-more-btn');
+            const nextCursor = response.headers.get('X-Next-Cursor');
+            if (moreBtn) {
+                moreBtn.hidden = !nextCursor;
+                moreBtn.onclick = () => loadPosts(nextCursor);
+            }
         } catch (err) {
             console.error('게시물을 불러오는 데 실패했습니다.', err);
             const container = document.getElementById('posts-container');
@@ -0,0 +1,151 @@
+# blog-service/static_assets.py
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from response_cache import etag_matches
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 제공
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 파일 이름에 내용 해시가 들어간 URL은 내용이 바뀌면 URL도 바뀌므로 1년 동안 재검증 없이 사용
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# SPA 셸과 해시 없는 기존 URL은 매번 ETag로 재검증 (배포 후 새 자산 URL을 바로 받도록)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# 이보다 작은 응답은 압축 이득보다 헤더/CPU 비용이 큼
+MIN_COMPRESS_SIZE = 256
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+@dataclass
+class Asset:
+    """메모리에 올려 둔 응답 본문과 미리 압축한 사본 (Content-Encoding → 본문)"""
+    body: bytes
+    media_type: str
+    etag: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str) -> "Asset":
+        asset = cls(body=body, media_type=media_type, etag=f'"{hashlib.sha256(body).hexdigest()[:20]}"')
+        if len(body) >= MIN_COMPRESS_SIZE and media_type.startswith(_COMPRESSIBLE_TYPES):
+            # 시작 시 한 번만 압축하므로 최고 압축률 사용
+            candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                candidates["br"] = brotli.compress(body, quality=11)
+            asset.encoded = {enc: data for enc, data in candidates.items() if len(data) < len(body)}
+        return asset
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Dict[str, bytes]) -> Optional[str]:
+    """
+    Accept-Encoding(q 값 포함)에서 미리 압축해 둔 인코딩 중 하나를 고름. 같은 q면 br을 우선.
+    맞는 것이 없으면 None (압축하지 않은 본문)
+    """
+    if not accept_encoding or not available:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip"):
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def asset_response(request: Request, asset: Asset, cache_control: str) -> Response:
+    """Accept-Encoding에 맞는 사본을 골라 반환하고, If-None-Match가 일치하면 304로 응답합니다."""
+    encoding = choose_encoding(request.headers.get("accept-encoding"), asset.encoded)
+    # 인코딩마다 바이트가 다르므로 ETag도 구분
+    etag = f'{asset.etag[:-1]}-{encoding}"' if encoding else asset.etag
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if asset.encoded:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = asset.encoded[encoding] if encoding else asset.body
+    return Response(content=body, media_type=asset.media_type, headers=headers)
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith(_COMPRESSIBLE_TYPES):
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+class StaticAssets:
+    """
+    정적 파일을 시작 시 한 번 읽어 메모리에 두고, 내용 해시가 들어간 URL(css/style.<hash>.css)로 제공.
+    - 템플릿은 url()로 해시 URL을 얻으므로, 파일이 바뀌면 URL이 바뀌어 브라우저/프록시 캐시를 무효화할 필요가 없음
+    - 해시 없는 기존 URL도 같은 내용을 제공하되 매번 재검증하도록 함
+    - 파일 목록은 시작 시 고정되므로 요청 경로로 디스크에 접근하지 않음
+    """
+
+    def __init__(self, directory: str, url_prefix: str):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self._assets: Dict[str, Tuple[Asset, bool]] = {}
+        self._urls: Dict[str, str] = {}
+        self.loaded = False
+
+    def load(self):
+        assets, urls = {}, {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    asset = Asset.build(f.read(), _media_type(path))
+                stem, ext = os.path.splitext(path)
+                hashed_path = f"{stem}.{asset.etag[1:13]}{ext}"
+                assets[path] = (asset, False)
+                assets[hashed_path] = (asset, True)
+                urls[path] = f"{self.url_prefix}/{hashed_path}"
+        self._assets, self._urls = assets, urls
+        self.loaded = True
+        logger.info("Loaded %d static assets (brotli=%s)", len(urls), brotli is not None)
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return ("gzip", "br") if brotli is not None else ("gzip",)
+
+    def url(self, path: str) -> str:
+        """템플릿용 자산 URL (내용 해시 포함). 모르는 경로는 해시 없이 반환"""
+        return self._urls.get(path, f"{self.url_prefix}/{path}")
+
+    def get(self, path: str) -> Optional[Tuple[Asset, bool]]:
+        """(자산, 해시 URL 여부). 없으면 None"""
+        return self._assets.get(path)
+
+    def stats(self) -> Dict:
+        originals = [self._assets[path][0] for path in self._urls]
+        return {
+            "files": len(originals),
+            "bytes": sum(len(a.body) for a in originals),
+            **{f"{enc}_bytes": sum(len(a.encoded.get(enc, a.body)) for a in originals) for enc in self.encodings},
+        }
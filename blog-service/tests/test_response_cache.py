@@ -0,0 +1,120 @@
+# blog-service/tests/test_response_cache.py
+import pytest
+
+from response_cache import (
+    CachedResponse, ResponseCache, etag_matches, http_date, make_etag, not_modified_since,
+)
+
+
+def _detail(post_id: int) -> CachedResponse:
+    return CachedResponse(body=b"{}", etag=make_etag(str(post_id).encode()))
+
+
+def _page(ids, lo=0, hi=None) -> CachedResponse:
+    return CachedResponse(body=b"[]", etag='"page"', ids=frozenset(ids), lo=lo, hi=hi, is_list=True)
+
+
+# --- 조건부 GET ---
+@pytest.mark.parametrize("header, etag, expected", [
+    ('"abc"', '"abc"', True),
+    ('W/"abc"', '"abc"', True),
+    ('"abc"', 'W/"abc"', True),
+    ('"x", "abc"', '"abc"', True),
+    ("*", '"abc"', True),
+    ('"abcd"', '"abc"', False),
+    (None, '"abc"', False),
+    ("", '"abc"', False),
+])
+def test_etag_matches(header, etag, expected):
+    assert etag_matches(header, etag) is expected
+
+
+def test_http_date_treats_naive_timestamps_as_utc():
+    assert http_date("2024-01-01T09:00:00") == "Mon, 01 Jan 2024 09:00:00 GMT"
+    assert http_date("2024-01-01T09:00:00+09:00") == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert http_date("not a date") is None
+    assert http_date(None) is None
+
+
+def test_not_modified_since():
+    last_modified = "Mon, 01 Jan 2024 09:00:00 GMT"
+    assert not_modified_since("Mon, 01 Jan 2024 09:00:00 GMT", last_modified)
+    assert not_modified_since("Tue, 02 Jan 2024 00:00:00 GMT", last_modified)
+    assert not not_modified_since("Mon, 01 Jan 2024 08:59:59 GMT", last_modified)
+    assert not not_modified_since("garbage", last_modified)
+    assert not not_modified_since(None, last_modified)
+
+
+# --- 저장과 LRU ---
+def test_lru_eviction_keeps_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put(("post", 1), _detail(1))
+    cache.put(("post", 2), _detail(2))
+    assert cache.get(("post", 1)) is not None
+    cache.put(("post", 3), _detail(3))
+    assert cache.get(("post", 2)) is None
+    assert cache.get(("post", 1)) is not None
+    assert cache.get(("post", 3)) is not None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(max_entries=0)
+    cache.put(("post", 1), _detail(1))
+    assert cache.get(("post", 1)) is None
+
+
+def test_put_skipped_when_invalidated_during_load():
+    cache = ResponseCache(max_entries=10)
+    generation = cache.generation
+    # DB 조회 중 다른 요청이 게시물을 수정
+    cache.invalidate_post(1)
+    cache.put(("post", 1), _detail(1), generation)
+    assert cache.get(("post", 1)) is None
+    cache.put(("post", 1), _detail(1), cache.generation)
+    assert cache.get(("post", 1)) is not None
+
+
+# --- 무효화 범위 ---
+def test_invalidate_post_drops_detail_and_pages_containing_it():
+    cache = ResponseCache(max_entries=10)
+    cache.put(("post", 5), _detail(5))
+    cache.put(("post", 6), _detail(6))
+    cache.put(("list", "a"), _page({5, 4, 3}, lo=3, hi=6))
+    cache.put(("list", "b"), _page({2, 1}, lo=1, hi=3))
+    cache.invalidate_post(5)
+    assert cache.get(("post", 5)) is None
+    assert cache.get(("list", "a")) is None
+    assert cache.get(("post", 6)) is not None
+    assert cache.get(("list", "b")) is not None
+
+
+def test_invalidate_structure_drops_pages_covering_the_id_range():
+    cache = ResponseCache(max_entries=10)
+    cache.put(("list", "newest"), _page({10, 9}, lo=9, hi=None))
+    cache.put(("list", "middle"), _page({6, 5}, lo=5, hi=7))
+    cache.put(("list", "oldest"), _page({2, 1}, lo=1, hi=3))
+    cache.put(("post", 6), _detail(6))
+    cache.put(("post", 2), _detail(2))
+    # 삭제된 id 6: 범위에 6이 들어가는 페이지와 상세만 무효화 (hi=None은 상한 없음)
+    cache.invalidate_structure(6)
+    assert cache.get(("list", "middle")) is None
+    assert cache.get(("post", 6)) is None
+    assert cache.get(("list", "newest")) is not None
+    assert cache.get(("list", "oldest")) is not None
+    assert cache.get(("post", 2)) is not None
+    # 새 게시물 11: 상한 없는 첫 페이지(OFFSET 방식)만 무효화
+    cache.invalidate_structure(11)
+    assert cache.get(("list", "newest")) is None
+    assert cache.get(("list", "oldest")) is not None
+
+
+def test_clear_bumps_generation_and_counts_invalidations():
+    cache = ResponseCache(max_entries=10)
+    cache.put(("post", 1), _detail(1))
+    cache.put(("post", 2), _detail(2))
+    generation = cache.generation
+    cache.clear()
+    assert cache.generation == generation + 1
+    assert cache.get(("post", 1)) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidations"] == 2
@@ -0,0 +1 @@
+"""Python 마이크로서비스(auth, user, blog)가 함께 사용하는 공용 모듈"""
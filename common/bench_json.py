@@ -0,0 +1,104 @@
+# common/bench_json.py
+"""
+JSON 응답 직렬화 마이크로 벤치마크: starlette JSONResponse vs FastJSONResponse.
+각 엔드포인트의 대표 응답 본문으로 render()만 반복 측정하고, 두 결과가 바이트 단위로
+같은지 먼저 확인함.
+
+    python -m common.bench_json [반복 횟수]
+"""
+import random
+import string
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+
+from common import json_response
+from common.json_response import FastJSONResponse
+
+
+def _text(rng: random.Random, length: int) -> str:
+    # 한글/영문/이스케이프 대상 문자가 섞인 본문
+    alphabet = string.ascii_letters + " 가나다라마바사아자차카타파하\"\\\n\t"
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def _post(rng: random.Random, post_id: int, content_length: int) -> Dict:
+    return {
+        "id": post_id,
+        "title": _text(rng, 40),
+        "content": _text(rng, content_length),
+        "author": f"user{post_id % 50}",
+        "created_at": "2026-01-01T12:00:00.123456",
+        "updated_at": "2026-01-02T08:30:00.654321",
+    }
+
+
+def endpoint_payloads(seed: int = 1) -> List[Tuple[str, object]]:
+    """(엔드포인트, 응답 본문) 목록. 크기는 각 엔드포인트의 기본 페이지/배치 크기 기준"""
+    rng = random.Random(seed)
+    summaries = [
+        {**{k: v for k, v in _post(rng, i, 0).items() if k != "content"}, "excerpt": _text(rng, 150)}
+        for i in range(20, 0, -1)
+    ]
+    search = [
+        {"id": i, "title": _text(rng, 40), "author": f"user{i}", "created_at": "2026-01-01T12:00:00",
+         "snippet": _text(rng, 120), "score": -rng.uniform(1e-6, 5.0)}
+        for i in range(20)
+    ]
+    users = {"results": [
+        {"key": f"user{i}", "found": i % 10 != 0,
+         "user": {"id": i, "username": f"user{i}", "email": f"user{i}@example.com"} if i % 10 else None}
+        for i in range(100)
+    ]}
+    verify = {"results": [
+        {"valid": True, "status": "success", "data": {"username": f"user{i}", "exp": 1790000000 + i,
+                                                      "typ": "access", "jti": f"{i:032x}"}}
+        for i in range(100)
+    ]}
+    stats = {
+        "service_status": "online",
+        "requests": {"total": 123456, "errors": 12, "avg_latency_ms": 3.2145, "p95_latency_ms": 18.75},
+        "cache": {"hits": 98765, "misses": 4321, "hit_ratio": 0.958123},
+        "database": {"status": "healthy", "pool_size": 4},
+    }
+    return [
+        ("GET /blog/api/posts", summaries),
+        ("GET /blog/api/posts/{id}", _post(rng, 1, 4000)),
+        ("GET /blog/api/posts/search", search),
+        ("POST /users/batch", users),
+        ("POST /verify/batch", verify),
+        ("GET /stats", stats),
+        ("GET /health", {"status": "ok", "service": "auth-service"}),
+    ]
+
+
+def _per_call_us(render: Callable[[object], bytes], content: object, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            render(content)
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def main(repeat: int = 2000):
+    baseline = JSONResponse(content=None)
+    fast = FastJSONResponse(content=None)
+    backend = "orjson" if json_response.orjson is not None else "json (orjson 미설치)"
+    print(f"serializer: {backend}, repeat={repeat}")
+    print(f"{'endpoint':<28}{'bytes':>8}{'JSONResponse':>15}{'FastJSON':>12}{'saved':>10}{'speedup':>9}")
+    for name, content in endpoint_payloads():
+        expected = baseline.render(content)
+        if fast.render(content) != expected:
+            raise SystemExit(f"{name}: FastJSONResponse body differs from JSONResponse")
+        before = _per_call_us(baseline.render, content, repeat)
+        after = _per_call_us(fast.render, content, repeat)
+        print(f"{name:<28}{len(expected):>8}{before:>13.1f}us{after:>10.1f}us"
+              f"{before - after:>8.1f}us{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
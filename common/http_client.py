@@ -0,0 +1,158 @@
+# common/http_client.py
+import asyncio
+import os
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from common.metrics import observe_upstream
+from common.tracing import SPAN_KIND_CLIENT, outbound_traceparent, record_span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HttpClientConfig:
+    """서비스 간 호출에 사용하는 커넥션 풀 설정"""
+    pool_limit: int = int(os.getenv('HTTP_POOL_LIMIT', '100'))                    # 전체 동시 커넥션 상한
+    pool_limit_per_host: int = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '32'))   # 업스트림(호스트)별 커넥션 상한
+    dns_cache_ttl: int = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))              # DNS 조회 결과 캐시 시간(초)
+    keepalive_timeout: float = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))   # 유휴 keep-alive 커넥션 유지 시간(초)
+    connect_timeout: float = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3'))
+    total_timeout: float = float(os.getenv('HTTP_TOTAL_TIMEOUT', '10'))
+
+
+class _UpstreamStats:
+    __slots__ = ("requests", "errors", "connections_created", "connections_reused", "total_latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.total_latency = 0.0
+
+    def as_dict(self) -> Dict:
+        opened = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / opened, 4) if opened else 0,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 2) if self.requests else 0,
+        }
+
+
+class HttpClient:
+    """
+    프로세스 전역에서 공유하는 aiohttp 클라이언트.
+    앱의 lifespan에서 start()/close()를 호출하며, 업스트림별 keep-alive 커넥션을 재사용함
+    """
+
+    def __init__(self, cfg: Optional[HttpClientConfig] = None):
+        self.cfg = cfg or HttpClientConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats: Dict[str, _UpstreamStats] = {}
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.cfg.pool_limit,
+            limit_per_host=self.cfg.pool_limit_per_host,
+            ttl_dns_cache=self.cfg.dns_cache_ttl,
+            keepalive_timeout=self.cfg.keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.cfg.total_timeout, connect=self.cfg.connect_timeout)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._build_trace_config()],
+        )
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+            logger.info(
+                "HTTP client pool started (limit=%d, per_host=%d, dns_ttl=%ds)",
+                self.cfg.pool_limit, self.cfg.pool_limit_per_host, self.cfg.dns_cache_ttl,
+            )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def warm(self, url: str) -> bool:
+        """
+        url로 요청을 한 번 보내 업스트림 커넥션(DNS 조회, TCP 연결)을 미리 만들어 둠.
+        응답 후 커넥션은 keep-alive 풀에 남아 첫 실제 요청이 재사용함. 실패해도 예외를 내지 않음
+        """
+        try:
+            async with self.session.get(url) as resp:
+                await resp.read()
+                return resp.status < 500
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.info("Could not warm connection to %s: %s", url, e)
+            return False
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """공유 세션. lifespan 밖에서 먼저 호출되면 최초 사용 시 풀을 생성함"""
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+        return self._session
+
+    def stats(self) -> Dict:
+        """업스트림별 요청 수와 커넥션 재사용 통계"""
+        return {upstream: s.as_dict() for upstream, s in self._stats.items()}
+
+    # --- aiohttp 트레이스 훅 ---
+    def _upstream(self, key: str) -> _UpstreamStats:
+        s = self._stats.get(key)
+        if s is None:
+            s = self._stats[key] = _UpstreamStats()
+        return s
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            parts = urlsplit(str(params.url))
+            ctx.upstream = parts.netloc
+            ctx.started = time.perf_counter()
+            self._upstream(ctx.upstream).requests += 1
+            # 요청 처리 중이면 trace를 이어 가도록 traceparent를 붙임 (호출 쪽에서 지정했으면 유지)
+            ctx.span_id = None
+            outbound = outbound_traceparent()
+            if outbound is not None and "traceparent" not in params.headers:
+                ctx.span_id, params.headers["traceparent"] = outbound
+
+        async def on_request_end(session, ctx, params):
+            elapsed = time.perf_counter() - ctx.started
+            self._upstream(ctx.upstream).total_latency += elapsed
+            observe_upstream(ctx.upstream, params.method, str(params.response.status), elapsed)
+            record_span("upstream", ctx.upstream, elapsed, error=params.response.status >= 500,
+                        span_id=ctx.span_id, span_kind=SPAN_KIND_CLIENT)
+
+        async def on_request_exception(session, ctx, params):
+            elapsed = time.perf_counter() - ctx.started
+            self._upstream(ctx.upstream).errors += 1
+            observe_upstream(ctx.upstream, params.method, "error", elapsed)
+            record_span("upstream", ctx.upstream, elapsed, error=True, span_id=ctx.span_id, span_kind=SPAN_KIND_CLIENT)
+
+        async def on_connection_create_end(session, ctx, params):
+            self._upstream(getattr(ctx, "upstream", "unknown")).connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self._upstream(getattr(ctx, "upstream", "unknown")).connections_reused += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
@@ -0,0 +1,58 @@
+# common/json_response.py
+import json
+import re
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 동작 (출력 동일)
+    orjson = None
+
+# 지수 표기 float (orjson: 1e16, 2.5e-9 / repr: 1e+16, 2.5e-09)
+_FLOAT_EXPONENT = re.compile(rb"\de[+-]?\d")
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    # starlette JSONResponse.render와 같은 설정
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    JSONResponse와 바이트 단위로 같은 JSON을 만들되, 가능하면 orjson으로 직렬화.
+    - orjson은 repr()이 지수로 쓰는 float(절댓값 1e-4 미만 또는 1e16 이상)를 다르게 씀
+      (1e-05 → 0.00001, 1e-06 → 1e-6, 1e+16 → 1e16). 출력에 지수 표기(숫자 뒤의 e)나
+      b"0.0000"이 보이면 표준 json으로 다시 만듦 (문자열에 섞인 경우도 다시 만들 뿐 결과는 같음)
+    - 64비트를 넘는 정수, datetime/dataclass/int 하위 클래스는 표준 json 경로로 보내
+      기존과 같은 결과(또는 같은 예외)가 나오게 함.
+      FastAPI는 반환값을 jsonable_encoder로 먼저 변환하므로 라우트 응답에는 기본 타입만 옴
+    - 유일한 차이: NaN/Infinity는 JSONResponse가 ValueError(500)로 거부하지만 orjson은 null로 씀.
+      찾아내려면 본문 전체를 다시 훑어야 해서 직렬화 이득이 사라지므로 확인하지 않음
+    """
+    if orjson is None:
+        return _stdlib_dumps(content)
+    try:
+        body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                            | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS,
+                            default=_reject)
+    except (orjson.JSONEncodeError, TypeError):
+        return _stdlib_dumps(content)
+    if b"0.0000" in body or _FLOAT_EXPONENT.search(body):
+        return _stdlib_dumps(content)
+    return body
+
+
+def _reject(value: Any):
+    # orjson만 직렬화할 수 있는 값은 표준 json 경로에서 처리 (TypeError → 재시도)
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """기본 응답 클래스 (FastAPI(default_response_class=FastJSONResponse)). 본문은 JSONResponse와 동일"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
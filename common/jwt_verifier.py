@@ -0,0 +1,139 @@
+# common/jwt_verifier.py
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Optional
+
+import aiohttp
+import jwt
+
+from common.http_client import HttpClient
+from common.lru_cache import TTLCache
+from common.metrics import record_cache
+from common.revocation_store import RevocationStore
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSVerifier:
+    """
+    auth-service가 /.well-known/jwks.json으로 게시한 공개 키로 토큰을 프로세스 내에서 검증.
+    - 키 목록은 백그라운드에서 refresh_interval마다 갱신 (요청 경로에서는 네트워크 호출 없음)
+    - 모르는 kid가 오면(키 교체 직후) 최소 min_refresh_interval 간격으로 즉시 다시 받아 봄
+    - 검증된 토큰 페이로드는 exp까지 캐시하여 같은 토큰의 서명 검증을 반복하지 않음
+    - auth-service의 verify_token과 같이 액세스 토큰만 받고, 폐기 목록(revocations)을 캐시 적중 시에도 매번 확인.
+      폐기 목록이 아직 동기화되지 않았으면 handles()가 False를 반환하여 auth-service에 위임
+    """
+
+    def __init__(self, jwks_url: str, http_client: HttpClient, revocations: Optional[RevocationStore] = None,
+                 refresh_interval: float = 300, min_refresh_interval: float = 10, cache_size: int = 10000):
+        self.jwks_url = jwks_url
+        self.http_client = http_client
+        self.revocations = revocations
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._last_attempt = float("-inf")
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._cache = TTLCache(cache_size, default_ttl=0)
+
+    @property
+    def has_keys(self) -> bool:
+        return bool(self._keys)
+
+    def handles(self, token: str) -> bool:
+        """
+        이 토큰을 로컬에서 검증할 수 있는지 여부. 공개 키가 없거나(HS256 운영) 토큰이
+        게시된 키의 알고리즘이 아니면 False를 반환하여 호출자가 auth-service에 위임하도록 함.
+        폐기 목록을 아직 다 받지 못했을 때도(Redis 장애 포함) 폐기된 토큰을 통과시키지 않도록 위임
+        """
+        if not self._keys:
+            return False
+        if self.revocations is not None and not self.revocations.synced:
+            return False
+        try:
+            alg = jwt.get_unverified_header(token).get("alg")
+        except jwt.InvalidTokenError:
+            # 형식이 깨진 토큰은 로컬에서 바로 거절
+            return True
+        return any(key.algorithm_name == alg for key in self._keys.values())
+
+    async def start(self):
+        """첫 조회와 주기적 갱신을 백그라운드로 시작 (auth-service가 늦게 떠도 시작을 막지 않음)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        if self.revocations is not None:
+            await self.revocations.start()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.revocations is not None:
+            await self.revocations.close()
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            # 키를 아직 못 받았으면 짧은 간격으로 재시도
+            await asyncio.sleep(self.refresh_interval if self._keys else self.min_refresh_interval)
+
+    async def refresh(self):
+        async with self._refresh_lock:
+            self._last_attempt = time.monotonic()
+            try:
+                async with self.http_client.session.get(self.jwks_url) as resp:
+                    if resp.status != 200:
+                        logger.warning(f"JWKS fetch failed: {self.jwks_url} returned {resp.status}")
+                        return
+                    data = await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # 가져오지 못하면 기존 키로 계속 검증
+                logger.warning(f"JWKS fetch failed: {e}")
+                return
+            keys = {}
+            for jwk in data.get("keys", []):
+                try:
+                    key = jwt.PyJWK(jwk)
+                except jwt.PyJWKError as e:
+                    logger.warning(f"Ignoring unusable JWK {jwk.get('kid')}: {e}")
+                    continue
+                keys[key.key_id] = key
+            if keys.keys() != self._keys.keys():
+                logger.info(f"JWKS updated: {sorted(keys)}")
+            self._keys = keys
+
+    async def verify(self, token: str) -> Dict:
+        """토큰을 검증하고 페이로드를 반환. 실패 시 jwt.InvalidTokenError(또는 하위 예외) 발생"""
+        digest = hashlib.sha256(token.encode()).digest()
+        payload = self._cache.get(digest)
+        record_cache("jwt", payload is not None)
+        if payload is None:
+            payload = await self._decode(token)
+            exp = payload.get("exp")
+            if exp is not None:
+                self._cache.set(digest, payload, ttl=exp - time.time())
+        # typ이 없는 토큰은 리프레시 토큰 도입 이전에 발급된 액세스 토큰 (auth-service와 같은 규칙)
+        if payload.get("typ", "access") != "access":
+            raise jwt.InvalidTokenError("Invalid token type")
+        # 캐시된 토큰도 매번 확인 (로그아웃 후 exp 전까지 통과하지 않도록)
+        if self.revocations is not None and self.revocations.is_revoked(payload.get("jti")):
+            raise jwt.InvalidTokenError("Token has been revoked")
+        return payload
+
+    async def _decode(self, token: str) -> Dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_attempt >= self.min_refresh_interval:
+            await self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        # 알고리즘은 토큰 헤더가 아니라 게시된 키 기준으로 고정
+        return jwt.decode(token, key.key, algorithms=[key.algorithm_name])
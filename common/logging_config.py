@@ -0,0 +1,155 @@
+# common/logging_config.py
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from prometheus_client import Counter
+
+from common.tracing import TraceContextFilter
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped",
+    "샘플링 또는 대기열 포화로 버려진 로그 레코드 수",
+    ["logger", "reason"],
+)
+
+# LogRecord 기본 속성. 이 외의 속성은 extra=로 전달된 필드로 보고 JSON에 포함
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나 (Loki/Promtail에서 json 스테이지로 바로 파싱)"""
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "service": self.service,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    로거별 샘플링. rates는 {로거 이름 접두사: 남길 비율(0~1)}이며 가장 긴 접두사가 적용됨.
+    WARNING 이상은 항상 남김
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, value in self.rates.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                    rate, best = value, len(prefix)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        LOG_RECORDS_DROPPED.labels(record.name, "sampled").inc()
+        return False
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    레코드를 포맷하지 않은 채 대기열에 넣음. 메시지 조립(msg % args)과 JSON 직렬화는
+    모두 QueueListener 스레드에서 수행되어 요청 처리 경로에 비용이 남지 않음.
+    (같은 프로세스 안에서만 전달하므로 args를 미리 문자열로 바꿀 필요가 없음)
+    """
+
+    def __init__(self, records: "queue.SimpleQueue", max_size: int):
+        super().__init__(records)
+        self.max_size = max_size
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # SimpleQueue는 잠금 없는 C 구현이라 queue.Queue보다 가벼움. 크기 제한은 직접 확인
+        if self.queue.qsize() >= self.max_size:
+            # 출력이 밀리면 요청을 막지 않고 버림
+            LOG_RECORDS_DROPPED.labels(record.name, "queue_full").inc()
+            return
+        self.queue.put_nowait(record)
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"auth_service=0.1,uvicorn.access=0.01" 형식"""
+    rates = {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep:
+            rates[name.strip()] = min(1.0, max(0.0, float(value)))
+    return rates
+
+
+def setup_logging(service: str, level: Optional[str] = None):
+    """
+    서비스 공용 로깅 설정 (logging.basicConfig 대체).
+    - LOG_LEVEL: 루트 로그 레벨 (기본값: INFO)
+    - LOG_FORMAT: json(기본값) | text
+    - LOG_SAMPLE_RATES: 로거별 샘플링 비율 (예: "uvicorn.access=0.01,auth_service=0.1")
+    - LOG_QUEUE_SIZE: 출력 대기열 크기. 가득 차면 새 레코드를 버림 (기본값: 10000)
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        stream.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    else:
+        stream.setFormatter(JsonFormatter(service))
+
+    records = queue.SimpleQueue()
+    handler = LazyQueueHandler(records, int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    handler.addFilter(SamplingFilter(parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))))
+    # 요청 처리 중 남긴 로그에 trace_id를 붙임 (JSON 형식에서 필드로 출력)
+    handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO"))
+
+    # uvicorn이 먼저 붙여 둔 핸들러를 떼어 내고 같은 대기열로 보냄 (접근 로그도 샘플링 대상)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(records, stream)
+    _listener.start()
+    atexit.register(_listener.stop)
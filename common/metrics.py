@@ -0,0 +1,143 @@
+# common/metrics.py
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+
+from common.tracing import record_span
+
+# --- 공용 지표 정의 (서비스 구분은 Prometheus 스크레이프 대상 라벨로 함) ---
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "처리 중인 HTTP 요청 수",
+    ["method"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "DB 쿼리 실행 시간 (스레드 풀 대기 포함)",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "캐시 조회 결과",
+    ["cache", "result"],
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "다른 서비스 호출 시간",
+    ["upstream", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# 라우트에 매칭되지 않은 요청은 하나의 라벨로 모아 카디널리티 폭증을 막음
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """요청별 처리 시간과 처리 중 요청 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # 라우터가 매칭한 경로 템플릿(/api/posts/{post_id})을 라벨로 사용
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            REQUEST_LATENCY.labels(method, route_path, str(status_code)).observe(time.perf_counter() - started)
+
+
+def setup_metrics(app: FastAPI):
+    """미들웨어와 /metrics 엔드포인트를 앱에 등록합니다."""
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def handle_metrics():
+        return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+@contextmanager
+def observe_db(operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        DB_QUERY_LATENCY.labels(operation).observe(elapsed)
+        # 요청 처리 중이면 Server-Timing/추적 스팬에도 기록
+        record_span("db", operation, elapsed)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_upstream(upstream: str, method: str, status: str, seconds: float):
+    UPSTREAM_LATENCY.labels(upstream, method, status).observe(seconds)
+
+
+# --- /stats 응답용 집계 ---
+def cache_stats(cache: str) -> Dict:
+    hits = REGISTRY.get_sample_value("cache_requests_total", {"cache": cache, "result": "hit"}) or 0
+    misses = REGISTRY.get_sample_value("cache_requests_total", {"cache": cache, "result": "miss"}) or 0
+    total = hits + misses
+    return {
+        "hits": int(hits),
+        "misses": int(misses),
+        "hit_ratio": round(hits / total, 4) if total else 0,
+    }
+
+
+def request_stats() -> Dict:
+    """서비스 전체 요청 수, 5xx 수, 평균 응답 시간 (/metrics 요청 제외)"""
+    count = 0.0
+    total_seconds = 0.0
+    errors = 0.0
+    for metric in REQUEST_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.labels.get("route") == "/metrics":
+                continue
+            if sample.name.endswith("_count"):
+                count += sample.value
+                if sample.labels.get("status", "").startswith("5"):
+                    errors += sample.value
+            elif sample.name.endswith("_sum"):
+                total_seconds += sample.value
+    in_progress = sum(
+        sample.value for metric in REQUESTS_IN_PROGRESS.collect() for sample in metric.samples
+    )
+    return {
+        "total_requests": int(count),
+        "error_count": int(errors),
+        "in_progress": int(in_progress),
+        "avg_response_time_ms": round(total_seconds / count * 1000, 2) if count else 0,
+    }
@@ -0,0 +1,110 @@
+# common/readiness.py
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from fastapi import FastAPI
+
+from common.json_response import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+Check = Callable[[], Union[bool, Awaitable[bool]]]
+
+
+@dataclass
+class _Warmup:
+    task: asyncio.Task
+    started: float
+    state: str = "pending"    # pending | done | failed
+    duration_ms: Optional[float] = None
+
+
+class Readiness:
+    """
+    /ready 응답에 쓰는 서비스 준비 상태.
+    - warm_up(name, fn): lifespan 시작 직후 백그라운드에서 동시에 실행하는 예열 작업
+      (커넥션, 캐시, 준비된 구문). 서비스는 바로 /health에 응답하고, 예열이 모두 끝날 때까지
+      /ready는 503. 예열은 성능을 위한 것이므로 실패해도 끝난 것으로 보고 결과만 보고함
+    - add_check(name, fn, required): /ready 요청마다 실행하는 의존성 확인.
+      required=False인 확인은 실패해도 준비 상태를 막지 않고 degraded로만 표시
+    """
+
+    def __init__(self, check_timeout: float = 2.0):
+        self.check_timeout = check_timeout
+        self._checks: List[Tuple[str, Check, bool]] = []
+        self._warmups: Dict[str, _Warmup] = {}
+        self._started = time.monotonic()
+        self._ready_logged = False
+
+    def add_check(self, name: str, fn: Check, required: bool = True):
+        self._checks.append((name, fn, required))
+
+    def warm_up(self, name: str, fn: Callable[[], Awaitable]):
+        self._warmups[name] = _Warmup(task=asyncio.create_task(self._run_warmup(name, fn)), started=time.monotonic())
+
+    async def _run_warmup(self, name: str, fn: Callable[[], Awaitable]):
+        try:
+            await fn()
+            state = "done"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Warm-up %s failed: %s", name, e)
+            state = "failed"
+        warmup = self._warmups[name]
+        warmup.state = state
+        warmup.duration_ms = round((time.monotonic() - warmup.started) * 1000, 1)
+
+    @property
+    def warmed_up(self) -> bool:
+        return all(w.state != "pending" for w in self._warmups.values())
+
+    async def close(self):
+        """끝나지 않은 예열 작업 취소 (lifespan 종료 시 호출)"""
+        for warmup in self._warmups.values():
+            warmup.task.cancel()
+        await asyncio.gather(*(w.task for w in self._warmups.values()), return_exceptions=True)
+
+    async def _run_check(self, fn: Check) -> bool:
+        try:
+            result = fn()
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, self.check_timeout)
+            return bool(result)
+        except Exception:
+            return False
+
+    async def status(self) -> Tuple[bool, Dict]:
+        results = await asyncio.gather(*(self._run_check(fn) for _, fn, _ in self._checks))
+        checks = {}
+        ready = self.warmed_up
+        degraded = False
+        for (name, _, required), ok in zip(self._checks, results):
+            checks[name] = "ok" if ok else "failed"
+            if not ok:
+                if required:
+                    ready = False
+                else:
+                    degraded = True
+        if ready and not self._ready_logged:
+            self._ready_logged = True
+            logger.info("Ready %.0fms after startup", (time.monotonic() - self._started) * 1000)
+        body = {
+            "status": ("degraded" if degraded else "ready") if ready else "not_ready",
+            "checks": checks,
+            "warmup": {name: {"state": w.state, "duration_ms": w.duration_ms} for name, w in self._warmups.items()},
+        }
+        return ready, body
+
+
+def setup_readiness(app: FastAPI, readiness: Readiness):
+    """GET /ready 등록. 준비되면 200, 아니면 503 (쿠버네티스 readinessProbe용. /health는 liveness 전용)"""
+
+    @app.get("/ready", include_in_schema=False)
+    async def handle_ready():
+        ready, body = await readiness.status()
+        return FastJSONResponse(content=body, status_code=200 if ready else 503)
@@ -0,0 +1,119 @@
+# common/revocation_store.py
+import asyncio
+import logging
+import time
+from typing import Dict
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """
+    폐기된 토큰(jti) 목록.
+    - 원본은 Redis Stream(항목: jti, exp)이며, 모든 레플리카가 XREAD로 새 항목만 이어 받아
+      프로세스 내 dict에 반영함 (증분 동기화)
+    - 검증 경로의 is_revoked는 프로세스 내 dict만 조회하므로 네트워크 왕복이 없음
+    - 토큰이 만료되면 폐기 기록도 필요 없으므로 exp가 지난 항목은 메모리에서 제거하고,
+      Stream은 가장 긴 토큰 수명보다 오래된 항목을 잘라 냄
+    """
+
+    BATCH = 1000
+
+    def __init__(self, redis_url: str, stream_key: str, max_token_lifetime: float, block_ms: int = 1000):
+        self.stream_key = stream_key
+        self.max_token_lifetime = max_token_lifetime
+        self.block_ms = block_ms
+        self._revoked: Dict[str, float] = {}
+        self._last_id = "0-0"
+        self._synced = False
+        self._loaded = False
+        self._task = None
+        self._last_prune = time.monotonic()
+        try:
+            self.redis_client = redis.from_url(redis_url, decode_responses=True)
+        except Exception as e:
+            logger.error(f"Failed to create Redis client for revocations: {e}")
+            self.redis_client = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    @property
+    def synced(self) -> bool:
+        """밀린 폐기 기록을 모두 받았고 마지막 XREAD가 성공했는지 여부 (Redis 장애 중에는 False)"""
+        return self._synced
+
+    @property
+    def ready(self) -> bool:
+        """
+        검증에 쓸 수 있는 상태인지 (Redis 클라이언트가 없으면 받을 기록도 없으므로 True).
+        시작 시 기존 기록을 한 번 모두 받았는지만 보며, 이후 Redis 장애로 레플리카가 내려가지는 않음
+        """
+        return self.redis_client is None or self._loaded
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    async def revoke(self, jti: str, exp: float):
+        """이 레플리카에는 즉시, 다른 레플리카에는 Stream을 통해 반영"""
+        self._revoked[jti] = exp
+        if not self.redis_client:
+            return
+        # Stream ID는 ms 타임스탬프이므로 가장 긴 토큰 수명보다 오래된 항목은 잘라도 안전
+        min_id = int((time.time() - self.max_token_lifetime) * 1000)
+        try:
+            await self.redis_client.xadd(self.stream_key, {"jti": jti, "exp": str(int(exp))},
+                                         minid=min_id, approximate=True)
+        except Exception as e:
+            logger.error(f"Failed to publish revocation {jti}: {e}")
+
+    async def start(self):
+        if self.redis_client and self._task is None:
+            self._task = asyncio.create_task(self._sync())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sync(self):
+        while True:
+            try:
+                # 처음에는 보존된 전체 기록을, 이후에는 마지막으로 받은 ID 이후만 읽음
+                response = await self.redis_client.xread(
+                    {self.stream_key: self._last_id}, block=self.block_ms, count=self.BATCH
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Revocation sync failed: {e}")
+                # 장애 동안 들어온 폐기를 놓쳤을 수 있으므로 다시 따라잡을 때까지 동기화 안 된 상태로 둠
+                self._synced = False
+                await asyncio.sleep(1)
+                continue
+            now = time.time()
+            received = 0
+            for _, entries in response:
+                received += len(entries)
+                for entry_id, fields in entries:
+                    exp = float(fields.get("exp", 0))
+                    if exp > now:
+                        self._revoked[fields["jti"]] = exp
+                    self._last_id = entry_id
+            if received < self.BATCH:
+                # 밀린 기록을 모두 받음
+                self._synced = True
+                self._loaded = True
+            self._prune(now)
+
+    def _prune(self, now: float):
+        if time.monotonic() - self._last_prune < 60:
+            return
+        self._last_prune = time.monotonic()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
@@ -0,0 +1,169 @@
+# common/sqlite_pool.py
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from common.metrics import observe_db
+
+logger = logging.getLogger(__name__)
+
+
+def _release_when_done(fut: asyncio.Future, release: Callable[[], None]):
+    release()
+    # 기다리던 요청이 취소된 뒤 실패한 작업이 "exception was never retrieved" 경고를 남기지 않도록 조회
+    if not fut.cancelled():
+        fut.exception()
+
+
+class SQLitePool:
+    """
+    WAL 모드 SQLite 커넥션 풀.
+    - 읽기: 최대 `size`개의 읽기 전용 커넥션을 동시에 사용 (쓰기와 서로 막지 않음)
+    - 쓰기: 단일 쓰기 커넥션에서 트랜잭션 단위로 직렬화 (쓰기끼리만 대기)
+    - 모든 쿼리는 전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않음
+    """
+
+    def __init__(self, db_file: str, size: int = 4, busy_timeout_ms: int = 5000):
+        self.db_file = db_file
+        self.size = max(1, size)
+        self.busy_timeout_ms = busy_timeout_ms
+        # 읽기 커넥션 수 + 쓰기 전용 스레드 1개
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._readers: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._read_slots = asyncio.Semaphore(self.size)
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._executor is not None
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, check_same_thread=False, timeout=self.busy_timeout_ms / 1000)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _open_sync(self):
+        directory = os.path.dirname(self.db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = self._connect(read_only=False)
+        # WAL은 DB 파일 단위 설정이므로 쓰기 커넥션에서 한 번만 지정
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        for _ in range(self.size):
+            self._readers.put(self._connect(read_only=True))
+
+    async def open(self):
+        """스레드 풀과 커넥션을 미리 만들어 둠 (lifespan 시작 시 호출)"""
+        async with self._open_lock:
+            if self.is_open:
+                return
+            executor = ThreadPoolExecutor(max_workers=self.size + 1, thread_name_prefix="sqlite")
+            await asyncio.get_running_loop().run_in_executor(executor, self._open_sync)
+            # 커넥션 준비가 끝난 뒤에 공개해야 동시에 들어온 요청이 빈 풀을 보지 않음
+            self._executor = executor
+        logger.info("SQLite pool opened for %s (readers=%d, WAL)", self.db_file, self.size)
+
+    async def warm(self, statements: Iterable[str]):
+        """
+        읽기 커넥션마다 자주 쓰는 SELECT를 한 번씩 실행해 둠. sqlite3는 커넥션별로 준비된 구문을
+        SQL 문자열 기준으로 캐시하므로(cached_statements), 첫 요청들이 파싱/실행 계획 비용을 치르지 않음.
+        매개변수(?)에는 0을 넣으며 결과 행은 버림
+        """
+        statements = list(statements)
+        if not self.is_open:
+            await self.open()
+
+        def _warm():
+            # 커넥션을 모두 꺼내야 같은 커넥션을 두 번 예열하지 않음 (사용 중인 커넥션은 반납을 기다림)
+            conns = [self._readers.get() for _ in range(self.size)]
+            try:
+                for conn in conns:
+                    for sql in statements:
+                        conn.execute(sql, (0,) * sql.count("?")).fetchall()
+                    if conn.in_transaction:
+                        conn.rollback()
+            finally:
+                for conn in conns:
+                    self._readers.put(conn)
+
+        with observe_db("warm"):
+            await asyncio.get_running_loop().run_in_executor(self._executor, _warm)
+
+    async def close(self):
+        if not self.is_open:
+            return
+        executor, self._executor = self._executor, None
+
+        def _close_all():
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+        await asyncio.get_running_loop().run_in_executor(executor, _close_all)
+        executor.shutdown(wait=True)
+
+    async def read(self, fn: Callable[..., Any], *args, op: Optional[str] = None) -> Any:
+        """fn(conn, *args)를 읽기 커넥션에서 실행하고 결과를 반환. op는 지표용 작업 이름"""
+        if not self.is_open:
+            await self.open()
+        await self._read_slots.acquire()
+        return await self._run_holding(self._read_slots.release, self._run_read, fn, args, op)
+
+    async def write(self, fn: Callable[..., Any], *args, op: Optional[str] = None) -> Any:
+        """fn(conn, *args)를 하나의 쓰기 트랜잭션으로 실행. 예외 발생 시 롤백"""
+        if not self.is_open:
+            await self.open()
+        await self._write_lock.acquire()
+        return await self._run_holding(self._write_lock.release, self._run_write, fn, args, op)
+
+    async def _run_holding(self, release: Callable[[], None], run: Callable, fn: Callable, args: tuple,
+                           op: Optional[str]) -> Any:
+        """
+        이미 얻은 슬롯/잠금을 스레드 작업이 실제로 끝날 때 반납.
+        기다리던 요청이 취소되어도 스레드는 커넥션을 계속 쓰고 있으므로, 그 전에 반납하면
+        다음 작업이 같은 쓰기 커넥션에서 트랜잭션을 겹쳐 열 수 있음.
+        소요 시간은 슬롯/잠금 대기를 제외한 실행 시간만 기록
+        """
+        try:
+            fut = asyncio.get_running_loop().run_in_executor(self._executor, run, fn, args)
+        except BaseException:
+            release()
+            raise
+        fut.add_done_callback(lambda f: _release_when_done(f, release))
+        with observe_db(op or fn.__name__):
+            return await asyncio.shield(fut)
+
+    def _run_read(self, fn, args):
+        conn = self._readers.get()
+        try:
+            return fn(conn, *args)
+        finally:
+            # 읽기 트랜잭션이 열린 채로 남으면 WAL 체크포인트가 밀리므로 정리
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def _run_write(self, fn, args):
+        conn = self._writer
+        try:
+            result = fn(conn, *args)
+            conn.commit()
+            return result
+        except BaseException:
+            conn.rollback()
+            raise
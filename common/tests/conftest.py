@@ -0,0 +1,6 @@
+# common/tests/conftest.py
+import os
+import sys
+
+# 저장소 루트를 import 경로에 추가 (서비스 컨테이너에서와 같이 common.* 으로 import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -0,0 +1,80 @@
+# common/tests/test_json_response.py
+import enum
+import random
+import struct
+from datetime import datetime
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from common import json_response
+from common.json_response import FastJSONResponse, dumps
+
+
+class _Color(enum.IntEnum):
+    RED = 1
+
+
+def _expected(content) -> bytes:
+    # 기준은 starlette JSONResponse가 만드는 바이트
+    return JSONResponse(content).body
+
+
+@pytest.mark.parametrize("value", [
+    0.1, 123.456, -0.0, 1e15, 1e16, -1e16, 1.5e300, 2.2250738585072014e-308, 5e-324,
+    1e-4, 1e-5, 2.5e-9, -3.7075982980051803e-08, 1.7976931348623157e308, 123456789012345678.0,
+])
+def test_float_matches_json_response(value):
+    assert dumps({"v": value, "l": [value]}) == _expected({"v": value, "l": [value]})
+
+
+def test_random_doubles_match_json_response():
+    rng = random.Random(1234)
+    for _ in range(20000):
+        value = struct.unpack("d", struct.pack("Q", rng.getrandbits(64)))[0]
+        if value != value or value in (float("inf"), float("-inf")):
+            continue
+        assert dumps([value]) == _expected([value]), value
+
+
+@pytest.mark.parametrize("value, orjson_output", [
+    (1e16, b"[1e16]"),
+    (1.5e300, b"[1.5e300]"),
+    (2.5e-9, b"[2.5e-9]"),
+    (1e-5, b"[0.00001]"),
+])
+def test_orjson_exponent_spellings_fall_back(monkeypatch, value, orjson_output):
+    # 지수 표기는 orjson 버전마다 다름 (1e16 / 1e+16). 어느 표기든 표준 json 결과로 다시 만들어야 함
+    orjson = pytest.importorskip("orjson")
+    monkeypatch.setattr(orjson, "dumps", lambda *args, **kwargs: orjson_output)
+    assert dumps([value]) == _expected([value])
+
+
+@pytest.mark.parametrize("content", [
+    {"title": "한글 제목", "emoji": "🙂", "escape": "\"\\\n\t\u0001", "text": "1e5 and 0.00001 as text"},
+    {"big": 2 ** 64, "neg": -(2 ** 63) - 1, "max": 2 ** 63 - 1},
+    {"enum": _Color.RED, "bool": True, "none": None},
+    {1: "int key", "nested": {"list": [1, 2.5, {"x": []}]}},
+    [],
+    "plain string",
+])
+def test_values_match_json_response(content):
+    assert dumps(content) == _expected(content)
+
+
+def test_unsupported_type_raises_like_json_response():
+    with pytest.raises(TypeError):
+        JSONResponse({"at": datetime(2024, 1, 1)})
+    with pytest.raises(TypeError):
+        dumps({"at": datetime(2024, 1, 1)})
+
+
+def test_stdlib_path_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_response, "orjson", None)
+    content = {"v": 1e16, "s": "한글"}
+    assert dumps(content) == _expected(content)
+
+
+def test_response_class_renders_same_body():
+    content = {"posts": [{"id": 1, "score": 1e-7}]}
+    assert FastJSONResponse(content).body == _expected(content)
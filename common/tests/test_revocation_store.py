@@ -0,0 +1,80 @@
+# common/tests/test_revocation_store.py
+import asyncio
+import time
+
+from common.jwt_verifier import JWKSVerifier
+from common.revocation_store import RevocationStore
+
+
+class _FlakyRedis:
+    """처음 한 번은 폐기 기록을 돌려주고, 이후 XREAD는 fail이 켜져 있으면 실패하는 가짜 Redis"""
+
+    def __init__(self):
+        self.fail = False
+        self.calls = 0
+
+    async def xread(self, streams, block=None, count=None):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+        if self.calls == 1:
+            return [("revocations", [("1-0", {"jti": "old", "exp": str(int(time.time()) + 60)})])]
+        await asyncio.sleep(block / 1000)
+        return []
+
+
+def _store(client) -> RevocationStore:
+    store = RevocationStore("redis://localhost:6379", "revocations", max_token_lifetime=60, block_ms=10)
+    store.redis_client = client
+    return store
+
+
+async def _wait_for(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.005)
+
+
+def test_sync_error_clears_synced_and_handles_delegates():
+    async def run():
+        client = _FlakyRedis()
+        store = _store(client)
+        verifier = JWKSVerifier("http://auth/jwks", http_client=None, revocations=store)
+        # 공개 키가 있는 상태로 만들어 폐기 목록 상태만 보도록 함 (깨진 토큰은 동기화 중이면 로컬 처리)
+        verifier._keys = {"kid": object()}
+        await store.start()
+        try:
+            await _wait_for(lambda: store.synced)
+            assert store.is_revoked("old")
+            assert verifier.handles("not-a-token")
+
+            client.fail = True
+            await _wait_for(lambda: not store.synced)
+            assert not verifier.handles("not-a-token")
+            # 시작 시 기록은 이미 받았으므로 레플리카 준비 상태는 유지
+            assert store.ready
+
+            client.fail = False
+            await _wait_for(lambda: store.synced, timeout=2.0)
+            assert verifier.handles("not-a-token")
+        finally:
+            await store.close()
+
+    asyncio.run(run())
+
+
+def test_not_ready_until_first_sync():
+    async def run():
+        client = _FlakyRedis()
+        client.fail = True
+        store = _store(client)
+        await store.start()
+        try:
+            await _wait_for(lambda: client.calls > 0)
+            assert not store.synced
+            assert not store.ready
+        finally:
+            await store.close()
+
+    asyncio.run(run())
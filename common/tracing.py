@@ -0,0 +1,343 @@
+# common/tracing.py
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+TRACE_SPANS_DROPPED = Counter(
+    "trace_spans_dropped",
+    "내보내기 대기열 포화 또는 전송 실패로 버려진 스팬 수",
+    ["reason"],
+)
+
+# 요청 하나에 기록할 최대 스팬 수 (반복 호출이 많은 요청에서 메모리가 늘지 않도록)
+MAX_SPANS_PER_REQUEST = 256
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+SPAN_KIND_INTERNAL = 1
+
+
+@dataclass
+class TracingConfig:
+    """
+    요청 추적 설정
+    - TRACE_SERVER_TIMING: 응답에 Server-Timing 헤더(전체 처리 시간)를 붙일지 여부 (기본값: true)
+    - TRACE_SERVER_TIMING_DETAIL: Server-Timing에 작업별 시간(DB 작업 이름, 업스트림 호스트:포트 등)과
+      traceparent를 포함할지 여부. 내부 구성이 외부 응답에 드러나므로 내부 전용 배포에서만 켬 (기본값: false)
+    - TRACE_EXPORT: 스팬 내보내기 대상. 비우면 내보내지 않음
+        - file:<경로>: OTLP/JSON(ExportTraceServiceRequest)을 한 줄에 하나씩 파일에 추가
+        - http(s)://...: OTLP/HTTP JSON 수집기 주소 (예: http://otel-collector:4318/v1/traces)
+    - TRACE_SAMPLE_RATE: traceparent 없이 들어온 요청 중 내보낼 비율 (기본값: 1.0).
+      traceparent가 있으면 그 sampled 플래그를 따름
+    - TRACE_EXPORT_QUEUE_SIZE: 내보내기 대기열 크기. 가득 차면 새 스팬을 버림 (기본값: 10000)
+    """
+    server_timing: bool = os.getenv('TRACE_SERVER_TIMING', 'true').lower() == 'true'
+    server_timing_detail: bool = os.getenv('TRACE_SERVER_TIMING_DETAIL', 'false').lower() == 'true'
+    export: str = os.getenv('TRACE_EXPORT', '')
+    sample_rate: float = float(os.getenv('TRACE_SAMPLE_RATE', '1.0'))
+    export_queue_size: int = int(os.getenv('TRACE_EXPORT_QUEUE_SIZE', '10000'))
+    export_batch_size: int = 512
+    export_interval: float = 1.0
+
+
+@dataclass
+class Span:
+    kind: str           # db | cache | upstream | hash | ... (Server-Timing 지표 이름)
+    name: str           # 작업 이름 (Server-Timing desc)
+    span_id: str
+    start_ns: int
+    duration: float     # 초
+    error: bool = False
+    span_kind: int = SPAN_KIND_INTERNAL
+
+
+@dataclass
+class RequestTrace:
+    """요청 하나의 추적 정보. 현재 요청의 컨텍스트 변수로 전달되며, 같은 요청에서 만든 태스크에도 복사됨"""
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    sampled: bool
+    start_ns: int = field(default_factory=time.time_ns)
+    started: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+
+    def traceparent(self, span_id: Optional[str] = None) -> str:
+        return f"00-{self.trace_id}-{span_id or self.span_id}-{'01' if self.sampled else '00'}"
+
+    def add(self, span: Span):
+        if len(self.spans) < MAX_SPANS_PER_REQUEST:
+            self.spans.append(span)
+
+
+_current: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+def new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """W3C traceparent(00-<trace-id 32자>-<parent-id 16자>-<flags>) → (trace_id, parent_id, sampled). 잘못되면 None"""
+    if not value:
+        return None
+    parts = value.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    version, trace_id, parent_id, flags = parts[0], parts[1], parts[2], parts[3]
+    if version == "00" and len(parts) != 4:
+        return None
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, sampled
+
+
+def record_span(kind: str, name: str, duration: float, error: bool = False, span_id: Optional[str] = None,
+                span_kind: int = SPAN_KIND_INTERNAL):
+    """현재 요청에 끝난 작업의 소요 시간을 기록 (요청 밖에서는 아무것도 하지 않음)"""
+    trace = _current.get()
+    if trace is None:
+        return
+    end_ns = time.time_ns()
+    trace.add(Span(kind, name, span_id or new_span_id(), end_ns - int(duration * 1e9), duration, error, span_kind))
+
+
+@contextmanager
+def span(kind: str, name: str):
+    """with span("cache", "redis.get"): ... 블록의 소요 시간을 현재 요청에 기록"""
+    if _current.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record_span(kind, name, time.perf_counter() - started, error)
+
+
+def outbound_traceparent() -> Optional[Tuple[str, str]]:
+    """나가는 호출에 붙일 (클라이언트 스팬 id, traceparent). 요청 밖이면 None"""
+    trace = _current.get()
+    if trace is None:
+        return None
+    span_id = new_span_id()
+    return span_id, trace.traceparent(span_id)
+
+
+def server_timing(trace: RequestTrace, total: float, detail: bool = False) -> str:
+    """
+    응답 시작까지의 전체 시간(total). detail이면 종류/이름별로 합친 작업 시간과 trace id도 포함
+    """
+    if not detail:
+        return f"total;dur={total * 1000:.2f}"
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for s in trace.spans:
+        entry = totals.setdefault((s.kind, s.name), [0.0, 0])
+        entry[0] += s.duration
+        entry[1] += 1
+    metrics = []
+    for (kind, name), (duration, count) in totals.items():
+        desc = name if count == 1 else f"{name} x{count}"
+        metrics.append(f'{kind};dur={duration * 1000:.2f};desc="{desc}"')
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    # 브라우저 개발자 도구/RUM에서 응답과 내보낸 스팬을 연결할 수 있도록 trace id를 함께 전달
+    metrics.append(f'traceparent;desc="{trace.traceparent()}"')
+    return ", ".join(metrics)
+
+
+# --- 내보내기 ---
+def _otlp_attributes(attrs: Dict) -> List[Dict]:
+    result = []
+    for key, value in attrs.items():
+        if isinstance(value, bool):
+            result.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            result.append({"key": key, "value": {"intValue": str(value)}})
+        else:
+            result.append({"key": key, "value": {"stringValue": str(value)}})
+    return result
+
+
+def _otlp_span(trace_id: str, span_id: str, parent_span_id: Optional[str], name: str, kind: int,
+               start_ns: int, end_ns: int, error: bool, attrs: Dict) -> Dict:
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": kind,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": _otlp_attributes(attrs),
+        "status": {"code": 2 if error else 0},
+    }
+    if parent_span_id:
+        span["parentSpanId"] = parent_span_id
+    return span
+
+
+def to_otlp_spans(trace: RequestTrace, name: str, end_ns: int, status_code: int) -> List[Dict]:
+    """요청(서버 스팬)과 하위 작업 스팬을 OTLP/JSON 스팬으로 변환"""
+    spans = [_otlp_span(trace.trace_id, trace.span_id, trace.parent_span_id, name, SPAN_KIND_SERVER,
+                        trace.start_ns, end_ns, status_code >= 500, {"http.response.status_code": status_code})]
+    for s in trace.spans:
+        spans.append(_otlp_span(trace.trace_id, s.span_id, trace.span_id, f"{s.kind} {s.name}", s.span_kind,
+                                s.start_ns, s.start_ns + int(s.duration * 1e9), s.error,
+                                {"span.type": s.kind}))
+    return spans
+
+
+class SpanExporter:
+    """
+    OTLP/JSON 스팬을 백그라운드 스레드에서 모아 파일 또는 OTLP/HTTP 수집기로 보냄.
+    요청 경로에서는 대기열에 넣기만 하며, 대기열이 가득 차거나 전송이 실패하면 스팬을 버림
+    """
+
+    def __init__(self, service: str, target: str, cfg: TracingConfig):
+        self.target = target
+        self.cfg = cfg
+        self._resource = {"attributes": _otlp_attributes({"service.name": service})}
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, spans: List[Dict]):
+        if self._queue.qsize() >= self.cfg.export_queue_size:
+            TRACE_SPANS_DROPPED.labels("queue_full").inc(len(spans))
+            return
+        self._queue.put_nowait(spans)
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stopped.is_set() or not self._queue.empty():
+            batch = []
+            deadline = time.monotonic() + self.cfg.export_interval
+            while len(batch) < self.cfg.export_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.extend(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                self._export(batch)
+
+    def _export(self, spans: List[Dict]):
+        payload = json.dumps({"resourceSpans": [{
+            "resource": self._resource,
+            "scopeSpans": [{"scope": {"name": "common.tracing"}, "spans": spans}],
+        }]}, separators=(",", ":")).encode("utf-8")
+        try:
+            if self.target.startswith("file:"):
+                with open(self.target[len("file:"):], "ab") as f:
+                    f.write(payload + b"\n")
+            else:
+                request = urllib.request.Request(self.target, data=payload, method="POST",
+                                                 headers={"Content-Type": "application/json"})
+                with urllib.request.urlopen(request, timeout=5) as resp:
+                    resp.read()
+        except Exception as e:
+            TRACE_SPANS_DROPPED.labels("export_error").inc(len(spans))
+            logger.warning("Span export to %s failed: %s", self.target, e)
+
+
+class TracingMiddleware:
+    """
+    요청마다 trace 컨텍스트를 만들고(받은 traceparent를 이어받거나 새로 발급), 하위 작업 스팬을 모아
+    응답에 Server-Timing 헤더로 붙이는 ASGI 미들웨어. 샘플링된 요청은 스팬을 내보냄
+    """
+
+    def __init__(self, app, cfg: TracingConfig, exporter: Optional[SpanExporter] = None):
+        self.app = app
+        self.cfg = cfg
+        self.exporter = exporter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                incoming = parse_traceparent(value.decode("latin-1"))
+                break
+        if incoming is not None:
+            trace = RequestTrace(incoming[0], new_span_id(), incoming[1], incoming[2])
+        else:
+            sampled = self.cfg.sample_rate >= 1.0 or random.random() < self.cfg.sample_rate
+            trace = RequestTrace(secrets.token_hex(16), new_span_id(), None, sampled)
+        token = _current.set(trace)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.cfg.server_timing:
+                    total = time.perf_counter() - trace.started
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(trace, total, self.cfg.server_timing_detail).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if self.exporter is not None and trace.sampled:
+                route = scope.get("route")
+                name = f'{scope["method"]} {getattr(route, "path", None) or scope["path"]}'
+                self.exporter.submit(to_otlp_spans(trace, name, time.time_ns(), status_code))
+
+
+class TraceContextFilter(logging.Filter):
+    """요청 처리 중 남긴 로그에 trace_id를 붙임 (로그와 내보낸 스팬을 연결)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace = _current.get()
+        if trace is not None:
+            record.trace_id = trace.trace_id
+        return True
+
+
+def setup_tracing(app: FastAPI, service: str, cfg: Optional[TracingConfig] = None):
+    """추적 미들웨어를 앱에 등록합니다. TRACE_EXPORT가 있으면 스팬 내보내기 스레드를 시작합니다."""
+    cfg = cfg or TracingConfig()
+    exporter = SpanExporter(service, cfg.export, cfg) if cfg.export else None
+    app.add_middleware(TracingMiddleware, cfg=cfg, exporter=exporter)
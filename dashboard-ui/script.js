@@ -3,6 +3,10 @@
 // ==================================
 const config = {
     apiEndpoint: '',
+    // LB가 서비스 상태를 백그라운드에서 수집해 두고 SSE로 변경분만 보내는 스트림
+    streamEndpoint: '/stats/stream',
+    // 연속으로 이만큼 연결에 실패하면(예: SSE를 지원하지 않는 LB) 아래 주기의 /stats 폴링으로 전환
+    streamMaxFailures: 3,
     refreshInterval: 2000,
     maxChartPoints: 30,
     maxLogEntries: 50,
@@ -23,7 +27,7 @@ const config = {
 };
 
 // ==================================
-// WS 하트비트 (gorilla/websocket 서버와 연결)
+// WS 하트비트 (load-balancer의 /api/ws-heartbeat와 연결)
 // ==================================
 const wsHeartbeat = {
     socket: null,
@@ -131,6 +135,63 @@ const apiService = {
     monitoringEnabled: true,
     fetchIntervalId: null,
     heartbeatIntervalId: null,
+    eventSource: null,
+    streamFailures: 0,
+    latestStats: null,
+    // JSON Merge Patch (RFC 7386): null은 키 삭제, 객체는 재귀적으로 병합, 그 외 값은 교체
+    applyMergePatch(target, patch) {
+        if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) return patch;
+        if (target === null || typeof target !== 'object' || Array.isArray(target)) target = {};
+        for (const [key, value] of Object.entries(patch)) {
+            if (value === null) delete target[key];
+            else target[key] = this.applyMergePatch(target[key], value);
+        }
+        return target;
+    },
+    startStream() {
+        if (!window.EventSource) {
+            this.startPolling();
+            return;
+        }
+        this.stopStream();
+        const source = new EventSource(config.apiEndpoint + config.streamEndpoint);
+        this.eventSource = source;
+        source.addEventListener('snapshot', (event) => {
+            this.latestStats = JSON.parse(event.data);
+            eventBus.publish('statsUpdated', { stats: this.latestStats, isFetchSuccess: true });
+        });
+        source.addEventListener('delta', (event) => {
+            // 스냅샷 없이 받은 변경분은 적용할 기준이 없으므로 무시 (재연결 시 스냅샷을 다시 받음)
+            if (!this.latestStats) return;
+            this.latestStats = this.applyMergePatch(this.latestStats, JSON.parse(event.data));
+            eventBus.publish('statsUpdated', { stats: this.latestStats, isFetchSuccess: true });
+        });
+        source.onopen = () => {
+            this.streamFailures = 0;
+        };
+        source.onerror = () => {
+            // EventSource는 Last-Event-ID와 함께 자동으로 재연결함. 응답이 SSE가 아니면 CLOSED가 되어 재연결하지 않음
+            eventBus.publish('fetchError', { error: new Error('Stats stream error'), isFetchSuccess: false });
+            this.streamFailures += 1;
+            if (source.readyState === EventSource.CLOSED || this.streamFailures >= config.streamMaxFailures) {
+                eventBus.publish('log', { message: 'Stats stream unavailable, falling back to polling.', type: 'error' });
+                this.stopStream();
+                this.startPolling();
+            }
+        };
+    },
+    stopStream() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
+        this.latestStats = null;
+    },
+    startPolling() {
+        this.fetchAllStats();
+        if (this.fetchIntervalId) clearInterval(this.fetchIntervalId);
+        this.fetchIntervalId = setInterval(() => this.fetchAllStats(), config.refreshInterval);
+    },
     async fetchAllStats() {
         if (!this.monitoringEnabled) return;
         try {
@@ -163,9 +224,8 @@ const apiService = {
     },
     start() {
         this.monitoringEnabled = true;
-        this.fetchAllStats();
-        if (this.fetchIntervalId) clearInterval(this.fetchIntervalId);
-        this.fetchIntervalId = setInterval(() => this.fetchAllStats(), config.refreshInterval);
+        this.streamFailures = 0;
+        this.startStream();
         // 하트비트 루프 시작
         if (config.heartbeat.enabled) {
             if (this.heartbeatIntervalId) clearInterval(this.heartbeatIntervalId);
@@ -175,6 +235,7 @@ const apiService = {
     },
     stop() {
         this.monitoringEnabled = false;
+        this.stopStream();
         if (this.fetchIntervalId) clearInterval(this.fetchIntervalId);
         if (this.heartbeatIntervalId) clearInterval(this.heartbeatIntervalId);
         eventBus.publish('log', { message: 'Monitoring paused.' });
@@ -1,6 +1,17 @@
 # load-balancer/config.py
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
+
+
+def _urls(name: str, default: str) -> List[str]:
+    """
+    업스트림 주소 목록. <NAME>S에 쉼표로 여러 주소를 지정할 수 있고,
+    없으면 기존 단일 주소 변수(<NAME>)를 사용
+    """
+    value = os.getenv(f'{name}S') or os.getenv(name, default)
+    return [url.strip().rstrip('/') for url in value.split(',') if url.strip()]
+
 
 @dataclass
 class Config:
@@ -9,10 +20,44 @@ class Config:
     PORT: int = int(os.getenv('LB_PORT', '7100'))
     API_GATEWAY_URL: str = os.getenv('API_GATEWAY_URL', 'http://api-gateway-service:8000')
     DASHBOARD_UI_URL: str = os.getenv('DASHBOARD_UI_URL', 'http://dashboard-ui-service:80')
-    blog_service: str = os.getenv('BLOG_SERVICE_URL', 'http://blog-service:8005')
+    BLOG_SERVICE_URL: str = os.getenv('BLOG_SERVICE_URL', 'http://blog-service:8005')
+    # /stats 집계 시 호출할 서비스 (프록시 대상 아님)
+    AUTH_SERVICE_URL: str = os.getenv('AUTH_SERVICE_URL', 'http://auth-service:8002')
+    USER_SERVICE_URL: str = os.getenv('USER_SERVICE_URL', 'http://user-service:8001')
+
+    # 백엔드별 업스트림 목록 (API_GATEWAY_URLS=http://a:8000,http://b:8000 처럼 여러 개 지정 가능)
+    API_GATEWAY_UPSTREAMS: List[str] = field(default_factory=lambda: _urls('API_GATEWAY_URL', 'http://api-gateway-service:8000'))
+    DASHBOARD_UI_UPSTREAMS: List[str] = field(default_factory=lambda: _urls('DASHBOARD_UI_URL', 'http://dashboard-ui-service:80'))
+    BLOG_SERVICE_UPSTREAMS: List[str] = field(default_factory=lambda: _urls('BLOG_SERVICE_URL', 'http://blog-service:8005'))
+    # 호스트 이름을 DNS A 레코드 전체로 펼쳐 Pod마다 업스트림으로 사용 (헤드리스 서비스용)
+    DISCOVER_DNS: bool = os.getenv('LB_DISCOVER_DNS', 'false').lower() == 'true'
 
+    # 업스트림 선택 방식: ewma (지연 시간 x 처리 중 요청 수) | least_outstanding. 둘 다 power-of-two-choices
+    ALGORITHM: str = os.getenv('LB_ALGORITHM', 'ewma')
+    EWMA_DECAY: float = float(os.getenv('LB_EWMA_DECAY', '10'))   # 지연 시간 이동 평균의 시간 상수(초)
+    RETRIES: int = int(os.getenv('LB_RETRIES', '1'))              # 연결 실패 시 다른 업스트림으로 재시도할 횟수
+
+    # 능동 헬스 체크
     HEALTH_CHECK_INTERVAL: int = int(os.getenv('HEALTH_CHECK_INTERVAL', '15'))
-    REQUEST_TIMEOUT: int = int(os.getenv('REQUEST_TIMEOUT', '30'))
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv('HEALTH_CHECK_TIMEOUT', '2'))
+    UNHEALTHY_THRESHOLD: int = int(os.getenv('LB_UNHEALTHY_THRESHOLD', '2'))   # 연속 실패 횟수 → 제외
+    HEALTHY_THRESHOLD: int = int(os.getenv('LB_HEALTHY_THRESHOLD', '1'))       # 연속 성공 횟수 → 복귀
+    API_GATEWAY_HEALTH_PATH: str = os.getenv('API_GATEWAY_HEALTH_PATH', '/health')
+    DASHBOARD_UI_HEALTH_PATH: str = os.getenv('DASHBOARD_UI_HEALTH_PATH', '/')
+    BLOG_SERVICE_HEALTH_PATH: str = os.getenv('BLOG_SERVICE_HEALTH_PATH', '/ready')
+
+    # 업스트림 커넥션 풀
+    REQUEST_TIMEOUT: int = int(os.getenv('REQUEST_TIMEOUT', '30'))             # 업스트림 응답을 기다리는 최대 시간(초)
+    CONNECT_TIMEOUT: float = float(os.getenv('LB_CONNECT_TIMEOUT', '3'))
+    POOL_LIMIT_PER_HOST: int = int(os.getenv('LB_POOL_LIMIT_PER_HOST', '100'))
+    KEEPALIVE_TIMEOUT: float = float(os.getenv('LB_KEEPALIVE_TIMEOUT', '60'))
+
+    # /stats 수집: 하위 서비스 /stats를 이 주기(초)로 백그라운드에서 호출하고 결과를 캐시.
+    # SSE 클라이언트가 없고 /stats 요청도 STATS_IDLE_TIMEOUT초 동안 없으면 수집을 멈춤
+    STATS_PROBE_INTERVAL: float = float(os.getenv('STATS_PROBE_INTERVAL', '2'))
+    STATS_PROBE_TIMEOUT: float = float(os.getenv('STATS_PROBE_TIMEOUT', '2'))
+    STATS_IDLE_TIMEOUT: float = float(os.getenv('STATS_IDLE_TIMEOUT', '30'))
+
     INTERNAL_API_SECRET: str = os.getenv('INTERNAL_API_SECRET', 'default-secret')
 
-config = Config()
\ No newline at end of file
+config = Config()
@@ -1,5 +0,0 @@
-module titanium-lb-go
-
-go 1.24.5
-
-require github.com/gorilla/websocket v1.5.1
@@ -0,0 +1,171 @@
+# load-balancer/main.py
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import aiohttp
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+
+from config import config
+from common.http_client import HttpClient
+from common.json_response import FastJSONResponse
+from common.logging_config import setup_logging
+from common.metrics import setup_metrics
+from proxy import ProxyApp, new_upstream_session
+from stats_aggregator import StatsAggregator
+from traffic_stats import TrafficStats
+from upstream import Backend, HealthChecker
+
+# 로깅 설정 (JSON 한 줄 형식, 백그라운드 스레드에서 출력)
+setup_logging("load-balancer")
+logger = logging.getLogger('LoadBalancerApp')
+
+# --- 백엔드와 프록시 ---
+def _backend(name: str, urls, health_path: str) -> Backend:
+    return Backend(name, urls, health_path, algorithm=config.ALGORITHM, decay=config.EWMA_DECAY,
+                   discover_dns=config.DISCOVER_DNS)
+
+api_gateway = _backend("api-gateway", config.API_GATEWAY_UPSTREAMS, config.API_GATEWAY_HEALTH_PATH)
+blog_service = _backend("blog-service", config.BLOG_SERVICE_UPSTREAMS, config.BLOG_SERVICE_HEALTH_PATH)
+dashboard_ui = _backend("dashboard-ui", config.DASHBOARD_UI_UPSTREAMS, config.DASHBOARD_UI_HEALTH_PATH)
+backends = [api_gateway, blog_service, dashboard_ui]
+
+traffic = TrafficStats()
+proxy = ProxyApp(
+    routes=[("/api/", api_gateway), ("/blog/", blog_service)],
+    default=dashboard_ui,
+    traffic=traffic,
+    retries=config.RETRIES,
+    unhealthy_threshold=config.UNHEALTHY_THRESHOLD,
+)
+health_checker: Optional[HealthChecker] = None
+
+# /stats 집계용 서비스 호출 클라이언트 (프록시 커넥션 풀과 분리)
+http_client = HttpClient()
+STATS_TIMEOUT = aiohttp.ClientTimeout(total=config.STATS_PROBE_TIMEOUT)
+SERVICE_STATS_URLS = {
+    "api-gateway": f"{config.API_GATEWAY_URL}/stats",
+    "user_service": f"{config.USER_SERVICE_URL}/stats",
+    "auth": f"{config.AUTH_SERVICE_URL}/stats",
+    "blog_service": f"{config.BLOG_SERVICE_URL}/stats",
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global health_checker
+    proxy.session = new_upstream_session(config.CONNECT_TIMEOUT, config.REQUEST_TIMEOUT,
+                                         config.POOL_LIMIT_PER_HOST, config.KEEPALIVE_TIMEOUT)
+    await http_client.start()
+    health_checker = HealthChecker(backends, proxy.session, config.HEALTH_CHECK_INTERVAL, config.HEALTH_CHECK_TIMEOUT,
+                                   config.UNHEALTHY_THRESHOLD, config.HEALTHY_THRESHOLD)
+    health_checker.start()
+    aggregator.start()
+    logger.info("Load balancer started (algorithm=%s, upstreams=%s)", config.ALGORITHM,
+                {b.name: [e.url for e in b.endpoints] for b in backends})
+    yield
+    await aggregator.close()
+    await health_checker.close()
+    await http_client.close()
+    await proxy.session.close()
+
+# LB 자체 엔드포인트 (/stats, /lb-health, /metrics, 하트비트). 나머지 경로는 모두 프록시로 전달
+control = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse, docs_url=None, redoc_url=None, openapi_url=None)
+setup_metrics(control)
+
+async def fetch_service_stats(url: str) -> Dict:
+    try:
+        async with http_client.session.get(url, timeout=STATS_TIMEOUT) as resp:
+            data = await resp.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.info("Error fetching stats from %s: %s", url, e)
+        return {"service_status": "offline"}
+    except ValueError:
+        return {"service_status": "offline", "error": "invalid json response"}
+    # 응답이 {"service_name": {...}} 형태이므로 내부 객체를 꺼내서 반환
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, dict):
+                return value
+    return data
+
+def lb_stats() -> Dict:
+    return {**traffic.snapshot(), "upstreams": {b.name: b.as_dict() for b in backends}}
+
+async def collect_stats() -> Dict:
+    """LB 자체 지표와 모든 서비스의 /stats를 병렬로 모아 하나의 JSON으로 합칩니다."""
+    combined = {"load-balancer": lb_stats()}
+    results = await asyncio.gather(*(fetch_service_stats(url) for url in SERVICE_STATS_URLS.values()))
+    for key, data in zip(SERVICE_STATS_URLS, results):
+        if key == "user_service":
+            if "database" in data:
+                combined["database"] = data["database"]
+            if "cache" in data:
+                combined["cache"] = data["cache"]
+        combined[key] = data
+    return combined
+
+# 하위 서비스 상태는 백그라운드에서 주기마다 한 번만 수집 (대시보드 수와 무관)
+aggregator = StatsAggregator(collect_stats, config.STATS_PROBE_INTERVAL, config.STATS_IDLE_TIMEOUT)
+
+@control.get("/stats")
+async def handle_stats():
+    """캐시된 서비스 상태 스냅샷에 최신 LB 자체 지표를 더해 반환합니다."""
+    snapshot = dict(await aggregator.get())
+    snapshot["load-balancer"] = lb_stats()
+    return snapshot
+
+@control.get("/stats/stream")
+async def handle_stats_stream(request: Request):
+    """서비스 상태 스냅샷과 이후 변경분(JSON Merge Patch)을 Server-Sent Events로 전송합니다."""
+    return StreamingResponse(
+        aggregator.stream(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@control.get("/lb-health")
+async def handle_lb_health():
+    """로드밸런서 자체 헬스 체크 (업스트림 상태와 무관)"""
+    return Response(status_code=200)
+
+@control.get("/blog")
+async def handle_blog_root():
+    return RedirectResponse("/blog/", status_code=308)
+
+@control.websocket("/api/ws-heartbeat")
+async def handle_ws_heartbeat(websocket: WebSocket):
+    """대시보드 WebSocket 하트비트. 메시지를 받을 때마다 활동으로 기록하여 IDLE 판정을 막습니다."""
+    await websocket.accept()
+    traffic.ws_active_count += 1
+    traffic.record_ws_activity()
+    try:
+        while True:
+            await websocket.receive_text()
+            traffic.record_ws_activity()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        traffic.ws_active_count -= 1
+
+CONTROL_PATHS = frozenset(("/stats", "/stats/stream", "/lb-health", "/metrics", "/blog", "/api/ws-heartbeat"))
+
+class LoadBalancerApp:
+    """경로로 LB 자체 엔드포인트(FastAPI)와 프록시를 나눔. 프록시 요청은 FastAPI 라우팅/미들웨어를 거치지 않음"""
+
+    def __init__(self, control_app, proxy_app):
+        self.control = control_app
+        self.proxy = proxy_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan" or scope["path"] in CONTROL_PATHS:
+            await self.control(scope, receive, send)
+        else:
+            await self.proxy(scope, receive, send)
+
+app = LoadBalancerApp(control, proxy)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=config.HOST, port=config.PORT)
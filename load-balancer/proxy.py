@@ -0,0 +1,235 @@
+# load-balancer/proxy.py
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+import aiohttp
+from prometheus_client import Counter, Histogram
+from yarl import URL
+
+from traffic_stats import TrafficStats
+from upstream import Backend, Endpoint
+
+logger = logging.getLogger(__name__)
+
+LB_REQUEST_LATENCY = Histogram(
+    "lb_request_duration_seconds",
+    "프록시한 요청의 처리 시간 (응답 본문 전송 완료까지)",
+    ["backend", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+LB_UPSTREAM_ERRORS = Counter(
+    "lb_upstream_errors",
+    "업스트림 호출 실패",
+    ["backend", "endpoint", "reason"],
+)
+LB_RETRIES = Counter(
+    "lb_upstream_retries",
+    "다른 업스트림으로 다시 보낸 요청 수",
+    ["backend"],
+)
+
+# 프록시가 그대로 전달하지 않는 hop-by-hop 헤더 (RFC 9110 7.6.1). Host는 업스트림 주소로 다시 채움
+HOP_BY_HOP = frozenset((
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization", b"proxy-connection",
+    b"te", b"trailer", b"transfer-encoding", b"upgrade", b"host",
+))
+IDEMPOTENT = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+CHUNK_SIZE = 64 * 1024
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+class ClientDisconnected(Exception):
+    """요청 본문을 받는 중에 클라이언트가 연결을 끊음"""
+
+
+def _strip_hop_by_hop(headers: Headers) -> Headers:
+    # Connection 헤더에 나열된 헤더도 이 구간에서만 의미가 있으므로 제외
+    listed = set()
+    for name, value in headers:
+        if name.lower() == b"connection":
+            listed.update(token.strip().lower() for token in value.split(b","))
+    return [(name, value) for name, value in headers
+            if name.lower() not in HOP_BY_HOP and name.lower() not in listed]
+
+
+def new_upstream_session(connect_timeout: float, read_timeout: float, limit_per_host: int,
+                         keepalive_timeout: float) -> aiohttp.ClientSession:
+    """
+    업스트림 커넥션 풀. 업스트림마다 keep-alive 커넥션을 재사용함.
+    - 본문은 압축을 풀지 않고 그대로 전달 (auto_decompress=False)
+    - 쿠키 저장소를 쓰지 않음: 한 클라이언트의 Set-Cookie가 다른 클라이언트 요청에 섞이지 않도록
+    - 클라이언트가 보내지 않은 헤더(User-Agent, Accept-Encoding 등)를 자동으로 추가하지 않음
+    - 전체 시간 제한 없이 연결과 읽기 간격만 제한 (스트리밍 응답이 길어도 끊지 않음)
+    """
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=limit_per_host, ttl_dns_cache=30,
+                                     keepalive_timeout=keepalive_timeout)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout),
+        auto_decompress=False,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        skip_auto_headers=("User-Agent", "Accept", "Accept-Encoding", "Content-Type"),
+    )
+
+
+class ProxyApp:
+    """
+    스트리밍 리버스 프록시 (ASGI 앱).
+    - 경로 접두사로 백엔드를 고르고, 백엔드 안에서는 Backend.pick()으로 업스트림을 고름
+    - 요청/응답 본문을 메모리에 모으지 않고 받는 대로 전달 (대용량 내보내기/가져오기, 느린 클라이언트)
+    - 업스트림 연결에 실패하면(본문을 아직 보내지 않은 경우) 다른 업스트림으로 retries번까지 재시도
+    """
+
+    def __init__(self, routes: List[Tuple[str, Backend]], default: Backend, traffic: TrafficStats,
+                 retries: int = 1, unhealthy_threshold: int = 2):
+        self.routes = routes
+        self.default = default
+        self.traffic = traffic
+        self.retries = retries
+        self.unhealthy_threshold = unhealthy_threshold
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def route(self, path: str) -> Backend:
+        for prefix, backend in self.routes:
+            if path.startswith(prefix):
+                return backend
+        return self.default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        if scope["type"] != "http":
+            return
+
+        backend = self.route(scope["path"])
+        method = scope["method"]
+        started = time.perf_counter()
+        status = await self._proxy(backend, scope, receive, send)
+        elapsed = time.perf_counter() - started
+
+        LB_REQUEST_LATENCY.labels(backend.name, method, str(status)).observe(elapsed)
+        heartbeat = next((v for k, v in scope["headers"] if k == b"x-heartbeat"), b"").decode("latin-1")
+        self.traffic.record(TrafficStats.is_api_traffic(scope["path"], method, heartbeat), status, elapsed)
+
+    def _request_headers(self, scope) -> Headers:
+        headers = _strip_hop_by_hop(scope["headers"])
+        client = scope.get("client")
+        forwarded_for = next((v for k, v in headers if k == b"x-forwarded-for"), None)
+        headers = [(k, v) for k, v in headers if k not in (b"x-forwarded-for", b"x-forwarded-host", b"x-forwarded-proto")]
+        if client:
+            ip = client[0].encode("latin-1")
+            forwarded_for = forwarded_for + b", " + ip if forwarded_for else ip
+        if forwarded_for:
+            headers.append((b"x-forwarded-for", forwarded_for))
+        host = next((v for k, v in scope["headers"] if k == b"host"), None)
+        if host:
+            headers.append((b"x-forwarded-host", host))
+        headers.append((b"x-forwarded-proto", scope.get("scheme", "http").encode("latin-1")))
+        return headers
+
+    @staticmethod
+    def _has_body(headers: Headers) -> bool:
+        for name, value in headers:
+            if name == b"transfer-encoding":
+                return True
+            if name == b"content-length":
+                return value.strip() != b"0"
+        return False
+
+    async def _proxy(self, backend: Backend, scope, receive, send) -> int:
+        method = scope["method"]
+        target = scope.get("raw_path") or scope["path"].encode()
+        if scope.get("query_string"):
+            target += b"?" + scope["query_string"]
+        headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in self._request_headers(scope)]
+        has_body = self._has_body(scope["headers"])
+        body_started = False
+
+        async def body() -> AsyncIterator[bytes]:
+            nonlocal body_started
+            body_started = True
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    raise ClientDisconnected()
+                if message.get("body"):
+                    yield message["body"]
+                if not message.get("more_body", False):
+                    return
+
+        endpoint: Optional[Endpoint] = None
+        for attempt in range(self.retries + 1):
+            endpoint = backend.pick(exclude=endpoint)
+            url = URL(endpoint.url + target.decode("latin-1"), encoded=True)
+            endpoint.acquire()
+            started = time.perf_counter()
+            try:
+                resp = await self.session.request(method, url, headers=headers, data=body() if has_body else None,
+                                                  allow_redirects=False)
+            except ClientDisconnected:
+                endpoint.release()
+                return 499
+            except (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError) as e:
+                # 연결 자체가 안 됐거나(본문 전송 전), 재사용한 keep-alive 커넥션이 끊겨 있던 경우만 재시도
+                endpoint.release()
+                reason = "connect" if isinstance(e, aiohttp.ClientConnectorError) else "disconnected"
+                LB_UPSTREAM_ERRORS.labels(backend.name, endpoint.url, reason).inc()
+                endpoint.record_failure(self.unhealthy_threshold)
+                retryable = not body_started and (reason == "connect" or method in IDEMPOTENT)
+                if retryable and attempt < self.retries and len(backend.endpoints) > 1:
+                    LB_RETRIES.labels(backend.name).inc()
+                    continue
+                logger.warning("Upstream %s %s failed: %s", backend.name, endpoint.url, e)
+                return await self._error(send, 502, "Bad Gateway")
+            except asyncio.TimeoutError:
+                endpoint.release()
+                LB_UPSTREAM_ERRORS.labels(backend.name, endpoint.url, "timeout").inc()
+                return await self._error(send, 504, "Gateway Timeout")
+            except aiohttp.ClientError as e:
+                endpoint.release()
+                LB_UPSTREAM_ERRORS.labels(backend.name, endpoint.url, "error").inc()
+                logger.warning("Upstream %s %s failed: %s", backend.name, endpoint.url, e)
+                return await self._error(send, 502, "Bad Gateway")
+
+            # 응답 헤더까지의 시간으로 EWMA를 갱신 (본문 길이/클라이언트 속도와 무관하게 업스트림 상태만 반영)
+            endpoint.observe(time.perf_counter() - started)
+            if endpoint.healthy:
+                endpoint.failures = 0
+            try:
+                return await self._relay(resp, send)
+            finally:
+                resp.release()
+                endpoint.release()
+        return 502  # pragma: no cover (retries 루프는 항상 return으로 끝남)
+
+    async def _relay(self, resp: aiohttp.ClientResponse, send) -> int:
+        await send({
+            "type": "http.response.start",
+            "status": resp.status,
+            "headers": _strip_hop_by_hop(list(resp.raw_headers)),
+        })
+        try:
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # 헤더를 이미 보냈으므로 상태 코드를 바꿀 수 없음. 응답을 끝내지 않고 반환하면 서버가 연결을 닫아
+            # 클라이언트가 잘린 응답을 완료된 것으로 오인하지 않음
+            logger.warning("Upstream response from %s broke off: %s", resp.url.host, e)
+            return resp.status
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        return resp.status
+
+    @staticmethod
+    async def _error(send, status: int, message: str) -> int:
+        body = message.encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+        return status
@@ -0,0 +1,212 @@
+# load-balancer/stats_aggregator.py
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+STATS_REFRESHES = Counter(
+    "lb_stats_refreshes",
+    "서비스 /stats 수집 횟수 (시청자 수와 무관하게 주기당 한 번)",
+)
+STATS_REFRESH_ERRORS = Counter(
+    "lb_stats_refresh_errors",
+    "실패하여 이전 스냅샷을 stale로 표시한 수집 횟수",
+)
+STATS_STREAM_CLIENTS = Gauge(
+    "lb_stats_stream_clients",
+    "/stats/stream에 연결된 SSE 클라이언트 수",
+)
+
+# 클라이언트별로 쌓아 둘 수 있는 이벤트 수. 넘치면(느린 클라이언트) 연결을 끊고, 재연결 시 전체 스냅샷을 다시 받음
+STREAM_QUEUE_SIZE = 16
+# 이벤트가 없을 때 프록시/브라우저가 연결을 끊지 않도록 보내는 SSE 주석 간격(초)
+KEEPALIVE_SECONDS = 15.0
+
+
+def merge_patch(old: Dict, new: Dict) -> Dict:
+    """
+    old → new로 바꾸는 JSON Merge Patch (RFC 7386). 바뀐 키만 담고, 사라진 키는 None.
+    (값이 None인 키도 삭제로 전달되며, 클라이언트에서는 없는 키와 같이 취급됨)
+    """
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        before = old[key]
+        if isinstance(value, dict) and isinstance(before, dict):
+            sub = merge_patch(before, value)
+            if sub:
+                patch[key] = sub
+        elif value != before:
+            patch[key] = value
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    return patch
+
+
+def _event(name: str, event_id: str, data: Any) -> bytes:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {name}\ndata: {body}\n\n".encode()
+
+
+class _Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+
+
+class StatsAggregator:
+    """
+    서비스 상태를 백그라운드에서 interval마다 한 번 수집하고, 합친 스냅샷을 메모리에 둠.
+    - GET /stats는 스냅샷을 그대로 반환하고, /stats/stream(SSE)은 처음에 스냅샷, 이후 주기마다 변경분(merge patch)을 보냄
+    - 이벤트는 주기당 한 번만 직렬화하여 모든 SSE 클라이언트가 같은 바이트를 공유하므로,
+      대시보드를 여는 사람이 늘어도 하위 서비스 호출 수와 직렬화 비용은 일정함
+    - SSE 클라이언트가 없고 /stats 요청도 idle_timeout 동안 없으면 수집을 멈춤. 다시 요청이 오면 그때 한 번 수집
+    - 수집이 실패하면 마지막 스냅샷에 "stale": true를 붙여 계속 제공 (다음 수집이 성공하면 빠짐)
+    """
+
+    def __init__(self, collect: Callable[[], Awaitable[Dict]], interval: float, idle_timeout: float):
+        self.collect = collect
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.snapshot: Optional[Dict] = None
+        self.version = 0
+        # 이벤트 id = <프로세스 epoch>.<버전>. 재시작하거나 다른 레플리카로 재연결하면 epoch가 달라 스냅샷을 다시 받음
+        self._epoch = uuid.uuid4().hex[:8]
+        self._updated_at = 0.0
+        self._last_read = 0.0
+        self._snapshot_event: Optional[bytes] = None
+        self._subscribers: Set[_Subscriber] = set()
+        self._refreshing: Optional[asyncio.Future] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for subscriber in list(self._subscribers):
+            self._disconnect(subscriber)
+
+    @property
+    def event_id(self) -> str:
+        return f"{self._epoch}.{self.version}"
+
+    @property
+    def active(self) -> bool:
+        return bool(self._subscribers) or time.monotonic() - self._last_read < self.idle_timeout
+
+    async def _run(self):
+        while True:
+            if not self.active:
+                self._wake.clear()
+                await self._wake.wait()
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self):
+        """
+        한 번 수집. 이미 수집 중이면 그 결과를 기다림 (동시에 여러 번 호출해도 하위 서비스 호출은 한 번).
+        수집 오류는 기다리던 요청에 전달하지 않고, 이전 스냅샷을 stale로 표시하여 계속 제공
+        """
+        if self._refreshing is not None:
+            await asyncio.shield(self._refreshing)
+            return
+        self._refreshing = asyncio.get_running_loop().create_future()
+        try:
+            try:
+                new = await self.collect()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Collecting stats failed; serving previous snapshot as stale")
+                STATS_REFRESH_ERRORS.inc()
+                new = {**(self.snapshot or {}), "stale": True}
+            else:
+                STATS_REFRESHES.inc()
+            self._publish(new)
+            self._refreshing.set_result(None)
+        except asyncio.CancelledError:
+            self._refreshing.cancel()
+            raise
+        finally:
+            self._refreshing = None
+
+    def _publish(self, new: Dict):
+        old = self.snapshot
+        self.version += 1
+        self.snapshot = new
+        self._updated_at = time.monotonic()
+        self._snapshot_event = None
+        if old is None or not self._subscribers:
+            return
+        # 바뀐 것이 없어도 빈 변경분을 보내 클라이언트가 주기를 알 수 있게 함 (차트 갱신 간격)
+        event = _event("delta", self.event_id, merge_patch(old, new))
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.info("Dropping slow stats stream client")
+                self._disconnect(subscriber)
+
+    def _disconnect(self, subscriber: _Subscriber):
+        self._subscribers.discard(subscriber)
+        STATS_STREAM_CLIENTS.set(len(self._subscribers))
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def _mark_read(self):
+        self._last_read = time.monotonic()
+        self._wake.set()
+
+    async def get(self) -> Dict:
+        """현재 스냅샷. 수집을 멈춰 있었거나 오래되었으면 한 번 수집한 뒤 반환"""
+        self._mark_read()
+        if self.snapshot is None or time.monotonic() - self._updated_at > self.interval * 2:
+            await self.refresh()
+        return self.snapshot
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        SSE 이벤트 스트림. 처음에 전체 스냅샷(event: snapshot)을 보내고 이후 변경분(event: delta)을 보냄.
+        EventSource가 재연결하며 보낸 Last-Event-ID가 현재 버전이면 스냅샷을 생략
+        """
+        subscriber = _Subscriber()
+        self._subscribers.add(subscriber)
+        STATS_STREAM_CLIENTS.set(len(self._subscribers))
+        self._mark_read()
+        try:
+            yield f"retry: {int(self.interval * 1000) + 1000}\n\n".encode()
+            if self.snapshot is None:
+                await self.refresh()
+            if last_event_id != self.event_id:
+                # 스냅샷 이벤트도 버전마다 한 번만 직렬화
+                if self._snapshot_event is None:
+                    self._snapshot_event = _event("snapshot", self.event_id, self.snapshot)
+                yield self._snapshot_event
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._subscribers.discard(subscriber)
+            STATS_STREAM_CLIENTS.set(len(self._subscribers))
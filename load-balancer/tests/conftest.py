@@ -0,0 +1,7 @@
+# load-balancer/tests/conftest.py
+import os
+import sys
+
+# 컨테이너와 같이 서비스 디렉터리의 모듈(upstream, proxy 등)과 저장소 루트의 common/을 import
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [SERVICE_DIR, os.path.dirname(SERVICE_DIR)]
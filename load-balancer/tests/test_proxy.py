@@ -0,0 +1,72 @@
+# load-balancer/tests/test_proxy.py
+import pytest
+
+from proxy import ProxyApp, _strip_hop_by_hop
+from traffic_stats import TrafficStats
+from upstream import Backend
+
+
+@pytest.fixture
+def app():
+    api = Backend("test-api", ["http://api:1"], "/health")
+    blog = Backend("test-blog", ["http://blog:1"], "/health")
+    yield ProxyApp([("/blog", blog), ("/api", api)], api, TrafficStats())
+    for backend in (api, blog):
+        for endpoint in backend.endpoints:
+            endpoint.close()
+
+
+def _scope(headers, client=("203.0.113.7", 50000), scheme="https"):
+    return {"type": "http", "headers": headers, "client": client, "scheme": scheme}
+
+
+def _get(headers, name):
+    return [v for k, v in headers if k == name]
+
+
+def test_route_by_prefix(app):
+    assert app.route("/blog/posts/1").name == "test-blog"
+    assert app.route("/api/users").name == "test-api"
+    assert app.route("/unknown").name == "test-api"
+
+
+def test_forwarded_for_appends_peer_to_existing_chain(app):
+    headers = app._request_headers(_scope([(b"host", b"example.com"), (b"x-forwarded-for", b"198.51.100.1")]))
+    # 클라이언트가 보낸 값은 앞에 그대로 두고, 이 LB가 받은 연결의 주소를 끝에 덧붙임
+    assert _get(headers, b"x-forwarded-for") == [b"198.51.100.1, 203.0.113.7"]
+    assert _get(headers, b"x-forwarded-host") == [b"example.com"]
+    assert _get(headers, b"x-forwarded-proto") == [b"https"]
+    assert _get(headers, b"host") == []
+
+
+def test_forwarded_for_without_existing_header(app):
+    headers = app._request_headers(_scope([(b"host", b"example.com")]))
+    assert _get(headers, b"x-forwarded-for") == [b"203.0.113.7"]
+
+
+def test_client_supplied_forwarded_host_and_proto_are_replaced(app):
+    headers = app._request_headers(_scope(
+        [(b"x-forwarded-host", b"evil.example"), (b"x-forwarded-proto", b"https")], client=None, scheme="http",
+    ))
+    assert _get(headers, b"x-forwarded-host") == []
+    assert _get(headers, b"x-forwarded-proto") == [b"http"]
+    assert _get(headers, b"x-forwarded-for") == []
+
+
+def test_strip_hop_by_hop_includes_connection_listed_headers():
+    headers = [
+        (b"connection", b"keep-alive, X-Secret"),
+        (b"keep-alive", b"timeout=5"),
+        (b"x-secret", b"1"),
+        (b"transfer-encoding", b"chunked"),
+        (b"authorization", b"Bearer t"),
+        (b"traceparent", b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"),
+    ]
+    assert [k for k, _ in _strip_hop_by_hop(headers)] == [b"authorization", b"traceparent"]
+
+
+def test_has_body():
+    assert not ProxyApp._has_body([])
+    assert not ProxyApp._has_body([(b"content-length", b"0")])
+    assert ProxyApp._has_body([(b"content-length", b"12")])
+    assert ProxyApp._has_body([(b"transfer-encoding", b"chunked")])
@@ -0,0 +1,123 @@
+# load-balancer/tests/test_upstream.py
+import random
+
+import pytest
+
+import upstream
+from upstream import Backend, Endpoint
+
+
+@pytest.fixture
+def backend():
+    b = Backend("test-backend", ["http://a:1", "http://b:1", "http://c:1"], "/health")
+    yield b
+    for endpoint in b.endpoints:
+        endpoint.close()
+
+
+def _by_url(backend):
+    return {e.url: e for e in backend.endpoints}
+
+
+def test_pick_prefers_lower_cost(backend):
+    endpoints = _by_url(backend)
+    endpoints["http://a:1"].observe(0.5)
+    endpoints["http://b:1"].observe(0.01)
+    endpoints["http://c:1"].observe(0.01)
+    endpoints["http://c:1"].outstanding = 10
+    random.seed(0)
+    # P2C: 가장 비싼 a는 어떤 두 후보 조합에서도 선택되지 않음
+    picks = {backend.pick().url for _ in range(200)}
+    assert "http://a:1" not in picks
+    assert "http://b:1" in picks
+
+
+def test_pick_least_outstanding_ignores_latency():
+    b = Backend("lo-backend", ["http://slow:1", "http://busy:1"], "/health", algorithm="least_outstanding")
+    try:
+        slow, busy = b.endpoints
+        slow.observe(5.0)
+        busy.outstanding = 3
+        assert all(b.pick() is slow for _ in range(50))
+    finally:
+        for endpoint in b.endpoints:
+            endpoint.close()
+
+
+def test_pick_skips_unhealthy_and_excluded(backend):
+    endpoints = _by_url(backend)
+    endpoints["http://a:1"].set_healthy(False)
+    for _ in range(100):
+        assert backend.pick().url != "http://a:1"
+    excluded = endpoints["http://b:1"]
+    for _ in range(100):
+        assert backend.pick(exclude=excluded).url == "http://c:1"
+
+
+def test_pick_falls_back_to_all_when_none_healthy(backend):
+    for endpoint in backend.endpoints:
+        endpoint.set_healthy(False)
+    picks = {backend.pick().url for _ in range(200)}
+    assert picks == {"http://a:1", "http://b:1", "http://c:1"}
+
+
+def test_pick_single_endpoint_even_if_excluded():
+    b = Backend("single", ["http://only:1"], "/health")
+    try:
+        only = b.endpoints[0]
+        assert b.pick(exclude=only) is only
+    finally:
+        only.close()
+
+
+def test_backend_requires_upstreams():
+    with pytest.raises(ValueError):
+        Backend("empty", [], "/health")
+
+
+def test_unobserved_endpoint_uses_initial_latency():
+    e = Endpoint("test-backend", "http://new:1", decay=10.0)
+    try:
+        assert e.cost("ewma") == upstream.INITIAL_LATENCY
+        e.acquire()
+        assert e.cost("ewma") == upstream.INITIAL_LATENCY * 2
+        e.release()
+    finally:
+        e.close()
+
+
+def test_peak_ewma_rises_immediately_and_decays_slowly(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(upstream.time, "monotonic", lambda: now[0])
+    e = Endpoint("test-backend", "http://ewma:1", decay=10.0)
+    try:
+        e.observe(0.1)
+        e.observe(1.0)
+        assert e.ewma == 1.0
+        # 같은 시각의 빠른 응답은 반영되지 않음 (가중치는 경과 시간 기준)
+        e.observe(0.1)
+        assert e.ewma == pytest.approx(1.0)
+        # decay(10초) 후에는 차이의 1/e만 남음
+        now[0] += 10.0
+        e.observe(0.1)
+        assert e.ewma == pytest.approx(0.1 + 0.9 / 2.718281828459045, rel=1e-6)
+    finally:
+        e.close()
+
+
+def test_health_thresholds():
+    e = Endpoint("test-backend", "http://health:1", decay=10.0)
+    try:
+        e.record_failure(threshold=2)
+        assert e.healthy
+        e.record_failure(threshold=2)
+        assert not e.healthy
+        e.record_success(threshold=2)
+        assert not e.healthy
+        e.record_failure(threshold=2)
+        e.record_success(threshold=2)
+        e.record_success(threshold=2)
+        assert e.healthy
+        assert e.failures == 0
+    finally:
+        e.close()
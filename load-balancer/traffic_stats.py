@@ -0,0 +1,69 @@
+# load-balancer/traffic_stats.py
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+# RPS/평균 응답 시간을 계산하는 최근 구간(초)
+WINDOW_SECONDS = 10.0
+
+
+class TrafficStats:
+    """
+    대시보드용 LB 자체 지표.
+    - 전체 요청 수와 별도로 "실제 API 트래픽"(/api/*, HEAD와 X-Heartbeat: true 제외)만 따로 집계
+    - 최근 WINDOW_SECONDS초의 요청으로 RPS와 평균 응답 시간을 계산 (sliding window)
+    - WebSocket 하트비트 활동이 있으면 API 호출이 없어도 트래픽이 있는 것으로 봄
+    """
+
+    def __init__(self):
+        self.total_requests = 0
+        self.api_total_requests = 0
+        self.api_success_count = 0
+        self.api_total_response_time = 0.0
+        self._api_samples: Deque[Tuple[float, float]] = deque()   # (완료 시각, 처리 시간)
+        self._ws_activities: Deque[float] = deque()
+        self.ws_active_count = 0
+
+    @staticmethod
+    def is_api_traffic(path: str, method: str, heartbeat_header: str) -> bool:
+        return path.startswith("/api/") and method != "HEAD" and heartbeat_header != "true"
+
+    def record(self, is_api: bool, status: int, seconds: float):
+        self.total_requests += 1
+        if not is_api:
+            return
+        now = time.monotonic()
+        self.api_total_requests += 1
+        if 200 <= status < 400:
+            self.api_success_count += 1
+        self.api_total_response_time += seconds
+        self._api_samples.append((now, seconds))
+        self._trim(now)
+
+    def record_ws_activity(self):
+        now = time.monotonic()
+        self._ws_activities.append(now)
+        self._trim(now)
+
+    def _trim(self, now: float):
+        cutoff = now - WINDOW_SECONDS
+        while self._api_samples and self._api_samples[0][0] <= cutoff:
+            self._api_samples.popleft()
+        while self._ws_activities and self._ws_activities[0] <= cutoff:
+            self._ws_activities.popleft()
+
+    def snapshot(self) -> Dict:
+        self._trim(time.monotonic())
+        recent = len(self._api_samples)
+        avg_ms = sum(seconds for _, seconds in self._api_samples) / recent * 1000 if recent else 0.0
+        lifetime_avg_ms = self.api_total_response_time / self.api_total_requests * 1000 if self.api_total_requests else 0.0
+        success_rate = self.api_success_count / self.api_total_requests * 100 if self.api_total_requests else 0.0
+        return {
+            "total_requests": self.total_requests,
+            "success_rate": success_rate,
+            "avg_response_time_ms": round(avg_ms, 2),
+            "avg_response_time_ms_lifetime": round(lifetime_avg_ms, 2),
+            "requests_per_second": recent / WINDOW_SECONDS,
+            "status": "healthy",
+            "has_real_traffic": recent > 0 or len(self._ws_activities) > 0,
+        }
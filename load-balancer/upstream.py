@@ -0,0 +1,245 @@
+# load-balancer/upstream.py
+import asyncio
+import logging
+import math
+import random
+import socket
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_OUTSTANDING = Gauge(
+    "lb_upstream_outstanding_requests",
+    "업스트림별 처리 중인 요청 수",
+    ["backend", "endpoint"],
+)
+UPSTREAM_HEALTHY = Gauge(
+    "lb_upstream_healthy",
+    "업스트림 헬스 상태 (1: 트래픽 받음, 0: 제외)",
+    ["backend", "endpoint"],
+)
+UPSTREAM_EWMA = Gauge(
+    "lb_upstream_latency_ewma_seconds",
+    "업스트림 응답 헤더까지의 지연 시간 이동 평균",
+    ["backend", "endpoint"],
+)
+HEALTH_CHECKS = Counter(
+    "lb_health_checks",
+    "능동 헬스 체크 결과",
+    ["backend", "endpoint", "result"],
+)
+
+# 지연 시간 표본이 아직 없는 업스트림의 가정값(초). 0으로 두면 첫 응답 전까지 요청이 몰림
+INITIAL_LATENCY = 0.05
+
+
+class Endpoint:
+    """업스트림 하나의 상태 (처리 중 요청 수, 지연 시간 EWMA, 헬스)"""
+
+    def __init__(self, backend: str, url: str, decay: float):
+        self.backend = backend
+        self.url = url
+        self.decay = decay
+        self.outstanding = 0
+        self.ewma: Optional[float] = None
+        self._ewma_at = time.monotonic()
+        self.healthy = True          # 첫 헬스 체크 전에는 트래픽을 받음
+        self.failures = 0            # 연속 실패 (헬스 체크 + 프록시 연결 실패)
+        self.successes = 0           # 제외된 동안의 연속 헬스 체크 성공
+        self._outstanding_gauge = UPSTREAM_OUTSTANDING.labels(backend, url)
+        self._healthy_gauge = UPSTREAM_HEALTHY.labels(backend, url)
+        self._ewma_gauge = UPSTREAM_EWMA.labels(backend, url)
+        self._healthy_gauge.set(1)
+
+    def acquire(self):
+        self.outstanding += 1
+        self._outstanding_gauge.inc()
+
+    def release(self):
+        self.outstanding -= 1
+        self._outstanding_gauge.dec()
+
+    def observe(self, seconds: float):
+        """
+        peak EWMA: 느려지면 즉시 반영하고, 빨라지면 decay 시간 상수에 따라 천천히 내려감.
+        가중치를 요청 수가 아니라 경과 시간으로 정하므로 트래픽이 적은 업스트림도 같은 속도로 갱신됨
+        """
+        now = time.monotonic()
+        if self.ewma is None or seconds > self.ewma:
+            self.ewma = seconds
+        else:
+            w = math.exp(-(now - self._ewma_at) / self.decay)
+            self.ewma = self.ewma * w + seconds * (1 - w)
+        self._ewma_at = now
+        self._ewma_gauge.set(self.ewma)
+
+    def cost(self, algorithm: str) -> float:
+        if algorithm == "least_outstanding":
+            return self.outstanding
+        latency = self.ewma if self.ewma is not None else INITIAL_LATENCY
+        return latency * (self.outstanding + 1)
+
+    def set_healthy(self, healthy: bool):
+        if healthy != self.healthy:
+            logger.warning("Upstream %s %s is now %s", self.backend, self.url, "healthy" if healthy else "unhealthy")
+        self.healthy = healthy
+        self._healthy_gauge.set(1 if healthy else 0)
+
+    def record_failure(self, threshold: int):
+        self.failures += 1
+        self.successes = 0
+        if self.healthy and self.failures >= threshold:
+            self.set_healthy(False)
+
+    def record_success(self, threshold: int):
+        self.failures = 0
+        if not self.healthy:
+            self.successes += 1
+            if self.successes >= threshold:
+                self.successes = 0
+                self.set_healthy(True)
+
+    def close(self):
+        for gauge in (UPSTREAM_OUTSTANDING, UPSTREAM_HEALTHY, UPSTREAM_EWMA):
+            try:
+                gauge.remove(self.backend, self.url)
+            except KeyError:
+                pass
+
+    def as_dict(self) -> Dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "latency_ewma_ms": round(self.ewma * 1000, 2) if self.ewma is not None else None,
+        }
+
+
+class Backend:
+    """
+    같은 역할의 업스트림 묶음 (api-gateway, blog-service, dashboard-ui).
+    - pick(): 헬스한 업스트림 중 임의로 둘을 골라 비용이 낮은 쪽 (power-of-two-choices).
+      전체를 매번 비교하지 않아도 최악의 선택을 피하고, 여러 LB 레플리카가 같은 업스트림에 몰리지 않음
+    - 헬스한 업스트림이 없으면 전체에서 고름 (모두 제외해 요청을 전부 실패시키는 것보다 나음)
+    """
+
+    def __init__(self, name: str, urls: List[str], health_path: str, algorithm: str = "ewma",
+                 decay: float = 10.0, discover_dns: bool = False):
+        if not urls:
+            raise ValueError(f"Backend {name} has no upstreams")
+        self.name = name
+        self.urls = urls
+        self.health_path = health_path
+        self.algorithm = algorithm
+        self.decay = decay
+        self.discover_dns = discover_dns
+        self.endpoints: List[Endpoint] = [Endpoint(name, url, decay) for url in urls]
+
+    def pick(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        candidates = [e for e in self.endpoints if e.healthy and e is not exclude]
+        if not candidates:
+            candidates = [e for e in self.endpoints if e is not exclude] or self.endpoints
+        if len(candidates) == 1:
+            return candidates[0]
+        a, b = random.sample(candidates, 2)
+        return a if a.cost(self.algorithm) <= b.cost(self.algorithm) else b
+
+    async def refresh_endpoints(self):
+        """DISCOVER_DNS: 설정된 호스트 이름을 A 레코드 전체로 펼침. 기존 업스트림의 상태는 유지"""
+        if not self.discover_dns:
+            return
+        loop = asyncio.get_running_loop()
+        discovered: List[str] = []
+        for url in self.urls:
+            parts = urlsplit(url)
+            try:
+                infos = await loop.getaddrinfo(parts.hostname, parts.port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                # 일시적인 DNS 오류로 업스트림을 비우지 않도록 이번 갱신은 건너뜀
+                logger.warning("Could not resolve %s: %s", parts.hostname, e)
+                return
+            for info in infos:
+                host = info[4][0]
+                netloc = f"[{host}]" if ":" in host else host
+                if parts.port:
+                    netloc = f"{netloc}:{parts.port}"
+                discovered.append(urlunsplit((parts.scheme, netloc, parts.path, "", "")))
+        discovered = list(dict.fromkeys(discovered))
+        if not discovered or discovered == [e.url for e in self.endpoints]:
+            return
+        current = {e.url: e for e in self.endpoints}
+        for url in set(current) - set(discovered):
+            current[url].close()
+        self.endpoints = [current.get(url) or Endpoint(self.name, url, self.decay) for url in discovered]
+        logger.info("Backend %s upstreams: %s", self.name, ", ".join(discovered))
+
+    def as_dict(self) -> Dict:
+        return {
+            "algorithm": self.algorithm,
+            "healthy": sum(e.healthy for e in self.endpoints),
+            "endpoints": [e.as_dict() for e in self.endpoints],
+        }
+
+
+class HealthChecker:
+    """
+    interval마다 모든 백엔드의 업스트림에 health_path로 GET을 보내 헬스 상태를 갱신.
+    응답 시간은 지연 시간 EWMA에도 반영하여 트래픽이 없던 업스트림의 값도 최신으로 유지
+    """
+
+    def __init__(self, backends: List[Backend], session: aiohttp.ClientSession, interval: float,
+                 timeout: float, unhealthy_threshold: int, healthy_threshold: int):
+        self.backends = backends
+        self.session = session
+        self.interval = interval
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.unhealthy_threshold = unhealthy_threshold
+        self.healthy_threshold = healthy_threshold
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Health check round failed")
+            await asyncio.sleep(self.interval)
+
+    async def check_all(self):
+        await asyncio.gather(*(backend.refresh_endpoints() for backend in self.backends))
+        await asyncio.gather(*(
+            self._check(backend, endpoint) for backend in self.backends for endpoint in backend.endpoints
+        ))
+
+    async def _check(self, backend: Backend, endpoint: Endpoint):
+        started = time.perf_counter()
+        try:
+            async with self.session.get(endpoint.url + backend.health_path, timeout=self.timeout,
+                                        allow_redirects=False) as resp:
+                await resp.read()
+                ok = resp.status < 400
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok = False
+        HEALTH_CHECKS.labels(backend.name, endpoint.url, "ok" if ok else "failed").inc()
+        if ok:
+            endpoint.observe(time.perf_counter() - started)
+            endpoint.record_success(self.healthy_threshold)
+        else:
+            endpoint.record_failure(self.unhealthy_threshold)
@@ -0,0 +1 @@
+"""auth/user/blog 서비스를 로컬에서 띄워 부하를 주고 엔드포인트별 지연 시간을 측정하는 벤치마크 도구"""
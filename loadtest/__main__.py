@@ -0,0 +1,128 @@
+# loadtest/__main__.py
+"""
+사용법 (저장소 루트에서):
+    python -m loadtest                                   # 측정 후 결과 표 출력
+    python -m loadtest --save-baseline baseline.json     # 기준 결과 저장
+    python -m loadtest --baseline baseline.json          # 기준 대비 저하가 있으면 종료 코드 1
+"""
+import argparse
+import asyncio
+import logging
+import shutil
+import sys
+import tempfile
+from typing import Dict, List
+
+import aiohttp
+
+from loadtest import report
+from loadtest.scenario import DEFAULT_MIX, Scenario, prepare, run_load
+from loadtest.services import ServiceMesh
+
+logger = logging.getLogger("loadtest")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """"login=5,verify=20" 형식. 지정하지 않은 작업은 0 (실행하지 않음)"""
+    mix = {}
+    for item in spec.split(","):
+        name, sep, weight = item.strip().partition("=")
+        if not sep or name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"invalid mix entry {item!r} (operations: {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def parse_env(items: List[str]) -> Dict[str, str]:
+    env = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--env expects KEY=VALUE, got {item!r}")
+        env[key] = value
+    return env
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="auth/user/blog 서비스 로컬 부하 테스트")
+    parser.add_argument("--duration", type=float, default=20, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3, help="측정 전 예열 시간(초), 결과에서 제외")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시에 요청을 보내는 작업자 수")
+    parser.add_argument("--users", type=int, default=20, help="준비 단계에서 만들 사용자 수")
+    parser.add_argument("--posts", type=int, default=100, help="준비 단계에서 만들 게시물 수")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="작업별 비율 (예: login=5,verify=20,list_posts=25)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="모든 서비스에 전달할 환경 변수 (예: JWT_ALGORITHM=EdDSA)")
+    parser.add_argument("--redis", metavar="HOST:PORT", help="fakeredis 대신 사용할 Redis")
+    parser.add_argument("--workdir", help="DB 파일과 서비스 로그 위치 (기본값: 임시 디렉터리, 종료 시 삭제)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", metavar="PATH", help="결과를 기준 결과로 저장")
+    parser.add_argument("--baseline", metavar="PATH", help="비교할 기준 결과. 저하가 있으면 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 저하 비율 (기본값: 0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="저하로 보는 최소 지연 시간 증가(ms)")
+    return parser
+
+
+async def measure(args, workdir: str) -> Dict:
+    redis_host, redis_port = None, None
+    if args.redis:
+        redis_host, _, port = args.redis.partition(":")
+        redis_port = int(port or 6379)
+    mesh = ServiceMesh(workdir, extra_env=parse_env(args.env), redis_host=redis_host, redis_port=redis_port)
+    try:
+        await mesh.start()
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as session:
+            fixture = await prepare(mesh, session, args.users, args.posts)
+            logger.info("Prepared %d users and %d posts; running for %ss (warmup %ss, concurrency %d)",
+                        len(fixture.users), len(fixture.post_ids), args.duration, args.warmup, args.concurrency)
+            samples = await run_load(Scenario(mesh, fixture, session), args.mix, args.concurrency,
+                                     args.duration, warmup=args.warmup, seed=args.seed)
+    finally:
+        mesh.stop()
+    settings = {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "users": args.users,
+        "posts": args.posts,
+        "mix": args.mix,
+        "env": parse_env(args.env),
+    }
+    return report.summarize(samples, settings)
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    workdir = args.workdir or tempfile.mkdtemp(prefix="loadtest-")
+    try:
+        result = asyncio.run(measure(args, workdir))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(report.format_table(result))
+    if args.output:
+        report.save(result, args.output)
+    if args.save_baseline:
+        report.save(result, args.save_baseline)
+        print(f"\nBaseline saved to {args.save_baseline}")
+    if args.baseline:
+        try:
+            regressions = report.compare(result, report.load(args.baseline), args.tolerance, args.min_delta_ms)
+        except report.IncomparableBaseline as e:
+            print(f"\nCannot compare: {e}", file=sys.stderr)
+            return 2
+        if regressions:
+            print(f"\nREGRESSION against {args.baseline} (tolerance {args.tolerance:.0%}):", file=sys.stderr)
+            for line in regressions:
+                print(f"  - {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regression against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# loadtest/fake_redis.py
+"""
+Redis 대용 TCP 서버 (fakeredis). 서비스들이 실제 redis 클라이언트로 접속하므로 코드 변경 없이
+캐시, Pub/Sub, Stream이 그대로 동작함. 부하 생성기와 GIL을 나누지 않도록 별도 프로세스로 실행
+
+    python -m loadtest.fake_redis <port>
+"""
+import sys
+
+from fakeredis import TcpFakeServer
+
+
+def main(port: int):
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]))
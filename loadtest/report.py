@@ -0,0 +1,103 @@
+# loadtest/report.py
+import json
+import math
+from typing import Dict, List
+
+from loadtest.scenario import Samples
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """nearest-rank 방식 백분위수 (sorted_values는 오름차순 정렬되어 있어야 함)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _summarize(values: List[float], errors: int, elapsed: float) -> Dict:
+    values = sorted(values)
+    summary = {
+        "count": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(percentile(values, p) * 1000, 3)
+    summary["max_ms"] = round(values[-1] * 1000, 3) if values else 0.0
+    return summary
+
+
+def summarize(samples: Samples, settings: Dict) -> Dict:
+    """결과 JSON. settings(동시성, 요청 비율 등)를 함께 저장하여 같은 조건끼리만 비교하도록 함"""
+    endpoints = {
+        label: _summarize(values, samples.errors.get(label, 0), samples.elapsed)
+        for label, values in sorted(samples.latencies.items())
+    }
+    all_values = [v for values in samples.latencies.values() for v in values]
+    return {
+        "settings": settings,
+        "elapsed_s": round(samples.elapsed, 3),
+        "total": _summarize(all_values, sum(samples.errors.values()), samples.elapsed),
+        "endpoints": endpoints,
+    }
+
+
+def format_table(result: Dict) -> str:
+    header = f"{'endpoint':<26}{'count':>8}{'err':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    lines = [header, "-" * len(header)]
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for label, s in rows:
+        lines.append(f"{label:<26}{s['count']:>8}{s['errors']:>6}{s['rps']:>9.1f}"
+                     f"{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+    return "\n".join(lines)
+
+
+def save(result: Dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class IncomparableBaseline(ValueError):
+    """기준 결과가 다른 조건(동시성, 요청 비율 등)으로 측정되어 비교할 수 없음"""
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.25, min_delta_ms: float = 1.0,
+            max_error_rate_increase: float = 0.01) -> List[str]:
+    """
+    기준 결과 대비 성능 저하 목록을 반환 (비어 있으면 통과).
+    - 지연 시간: p50/p95/p99가 기준보다 tolerance 비율 이상, 그리고 min_delta_ms 이상 늘면 저하
+      (1ms 미만 엔드포인트의 측정 잡음으로 실패하지 않도록 절댓값 조건을 함께 둠)
+    - 처리량: 엔드포인트별 rps가 기준보다 tolerance 비율 이상 줄면 저하
+    - 오류율: 기준보다 max_error_rate_increase 이상 늘면 저하
+    """
+    if current["settings"] != baseline["settings"]:
+        raise IncomparableBaseline(
+            f"baseline settings {baseline['settings']} differ from this run {current['settings']}"
+        )
+    regressions = []
+    for label, base in baseline["endpoints"].items():
+        cur = current["endpoints"].get(label)
+        if cur is None or cur["count"] == 0:
+            regressions.append(f"{label}: no requests in this run")
+            continue
+        for p in PERCENTILES:
+            key = f"p{p}_ms"
+            if cur[key] > base[key] * (1 + tolerance) and cur[key] - base[key] >= min_delta_ms:
+                regressions.append(f"{label}: {key} {base[key]:.2f} -> {cur[key]:.2f} "
+                                   f"(+{(cur[key] / base[key] - 1) * 100 if base[key] else math.inf:.0f}%)")
+        if cur["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{label}: rps {base['rps']:.1f} -> {cur['rps']:.1f} "
+                               f"(-{(1 - cur['rps'] / base['rps']) * 100:.0f}%)")
+        base_error_rate = base["errors"] / base["count"] if base["count"] else 0.0
+        error_rate = cur["errors"] / cur["count"]
+        if error_rate > base_error_rate + max_error_rate_increase:
+            regressions.append(f"{label}: error rate {base_error_rate:.1%} -> {error_rate:.1%}")
+    return regressions
@@ -0,0 +1,180 @@
+# loadtest/scenario.py
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import aiohttp
+
+from loadtest.services import ServiceMesh
+
+# 기본 요청 비율 (로그인은 비밀번호 해시 검증 때문에 비싸고 드물게, 조회는 잦게)
+DEFAULT_MIX = {
+    "login": 5,
+    "verify": 20,
+    "list_posts": 25,
+    "read_post": 25,
+    "create_post": 5,
+    "get_user": 15,
+    "batch_users": 5,
+}
+
+# blog-service의 POST /api/posts는 응답 객체를 직접 반환하므로 201 대신 200으로 응답함
+CREATED = (200, 201)
+
+# 작업 이름 → 결과 집계에 쓰는 엔드포인트 라벨 (경로 파라미터는 묶음)
+ENDPOINTS = {
+    "login": "POST /login",
+    "verify": "GET /verify",
+    "list_posts": "GET /api/posts",
+    "read_post": "GET /api/posts/{id}",
+    "create_post": "POST /api/posts",
+    "get_user": "GET /users/{username}",
+    "batch_users": "POST /users/batch",
+}
+
+
+@dataclass
+class Fixture:
+    """준비 단계에서 만든 사용자/토큰/게시물. 게시물 id 목록은 부하 중 생성된 것도 추가됨"""
+    users: List[Tuple[str, str]] = field(default_factory=list)   # (username, password)
+    tokens: List[str] = field(default_factory=list)
+    post_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Samples:
+    """엔드포인트별 응답 시간(초)과 실패 수"""
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    elapsed: float = 0.0
+
+
+class Scenario:
+    """세 서비스를 직접 호출하는 요청 묶음. 각 작업은 응답 상태가 기대한 값인지를 반환"""
+
+    def __init__(self, mesh: ServiceMesh, fixture: Fixture, session: aiohttp.ClientSession):
+        self.mesh = mesh
+        self.fixture = fixture
+        self.session = session
+        self.operations: Dict[str, Callable[[random.Random], Awaitable[bool]]] = {
+            "login": self.login,
+            "verify": self.verify,
+            "list_posts": self.list_posts,
+            "read_post": self.read_post,
+            "create_post": self.create_post,
+            "get_user": self.get_user,
+            "batch_users": self.batch_users,
+        }
+
+    async def _call(self, method: str, url: str, expected: int = 200, **kwargs) -> bool:
+        async with self.session.request(method, url, **kwargs) as resp:
+            await resp.read()
+            return resp.status == expected
+
+    async def login(self, rng: random.Random):
+        username, password = rng.choice(self.fixture.users)
+        return await self._call("POST", f"{self.mesh.auth.url}/login",
+                                json={"username": username, "password": password})
+
+    async def verify(self, rng: random.Random):
+        token = rng.choice(self.fixture.tokens)
+        return await self._call("GET", f"{self.mesh.auth.url}/verify",
+                                headers={"Authorization": f"Bearer {token}"})
+
+    async def list_posts(self, rng: random.Random):
+        # 대부분 첫 페이지, 가끔 다음 페이지
+        offset = 0 if rng.random() < 0.8 else 20 * rng.randint(1, 3)
+        return await self._call("GET", f"{self.mesh.blog.url}/api/posts",
+                                params={"offset": offset, "limit": 20})
+
+    async def read_post(self, rng: random.Random):
+        post_id = rng.choice(self.fixture.post_ids)
+        return await self._call("GET", f"{self.mesh.blog.url}/api/posts/{post_id}")
+
+    async def create_post(self, rng: random.Random):
+        token = rng.choice(self.fixture.tokens)
+        async with self.session.post(
+            f"{self.mesh.blog.url}/api/posts",
+            json={"title": f"load test {rng.randrange(10**6)}", "content": "본문 " * rng.randint(20, 200)},
+            headers={"Authorization": f"Bearer {token}"},
+        ) as resp:
+            if resp.status not in CREATED:
+                await resp.read()
+                return False
+            self.fixture.post_ids.append((await resp.json())["id"])
+            return True
+
+    async def get_user(self, rng: random.Random):
+        username, _ = rng.choice(self.fixture.users)
+        return await self._call("GET", f"{self.mesh.user.url}/users/{username}")
+
+    async def batch_users(self, rng: random.Random):
+        usernames = [u for u, _ in rng.sample(self.fixture.users, min(10, len(self.fixture.users)))]
+        return await self._call("POST", f"{self.mesh.user.url}/users/batch",
+                                json={"usernames": usernames})
+
+
+async def prepare(mesh: ServiceMesh, session: aiohttp.ClientSession, users: int, posts: int) -> Fixture:
+    """사용자 생성 → 로그인으로 토큰 발급 → 게시물 생성"""
+    fixture = Fixture()
+    for i in range(users):
+        username, password = f"loadtest{i}", f"password-{i}"
+        async with session.post(f"{mesh.user.url}/users",
+                                json={"username": username, "email": f"{username}@example.com", "password": password}) as resp:
+            if resp.status not in (201, 400):  # 400: 이미 있음 (외부 Redis/DB 재사용 시)
+                raise RuntimeError(f"Creating {username} failed: {resp.status} {await resp.text()}")
+        async with session.post(f"{mesh.auth.url}/login", json={"username": username, "password": password}) as resp:
+            body = await resp.json()
+            if resp.status != 200:
+                raise RuntimeError(f"Login as {username} failed: {resp.status} {body}")
+        fixture.users.append((username, password))
+        fixture.tokens.append(body["token"])
+    for i in range(posts):
+        async with session.post(f"{mesh.blog.url}/api/posts",
+                                json={"title": f"seed post {i}", "content": "시드 게시물 본문 " * 50},
+                                headers={"Authorization": f"Bearer {fixture.tokens[i % users]}"}) as resp:
+            body = await resp.json()
+            if resp.status not in CREATED:
+                raise RuntimeError(f"Creating seed post failed: {resp.status} {body}")
+        fixture.post_ids.append(body["id"])
+    return fixture
+
+
+async def run_load(scenario: Scenario, mix: Dict[str, float], concurrency: int, duration: float,
+                   warmup: float = 0, seed: int = 1) -> Samples:
+    """
+    닫힌 루프 부하: concurrency개의 작업자가 응답을 받는 즉시 다음 요청을 보냄.
+    warmup 동안의 결과는 버리고(커넥션/캐시 준비), 이후 duration초 동안의 결과만 집계
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = Samples()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            name = rng.choices(names, weights)[0]
+            try:
+                ok = await scenario.operations[name](rng)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                ok = False
+            label = ENDPOINTS[name]
+            finished = time.perf_counter()
+            if now >= measure_from:
+                samples.latencies[label].append(finished - now)
+                if not ok:
+                    samples.errors[label] += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    # 측정 구간 안에서 시작한 요청만 집계하므로 처리량도 구간 길이로 나눔 (끝난 뒤 기다린 시간 제외)
+    samples.elapsed = duration
+    return samples
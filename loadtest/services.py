@@ -0,0 +1,152 @@
+# loadtest/services.py
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@dataclass
+class ServiceProcess:
+    name: str
+    directory: str           # 저장소 루트 기준 서비스 디렉터리 (템플릿/정적 파일 경로 때문에 cwd로 사용)
+    module: str              # uvicorn 앱 모듈
+    port: int
+    health_path: str = "/ready"  # 예열이 끝난 뒤부터 측정
+    env: Dict[str, str] = field(default_factory=dict)
+    process: Optional[subprocess.Popen] = None
+    log_path: str = ""
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+class ServiceMesh:
+    """
+    user-service, auth-service, blog-service를 로컬 uvicorn 하위 프로세스로 실행.
+    - DB는 workdir 아래 임시 SQLite 파일, Redis는 redis_host/redis_port 미지정 시 fakeredis TCP 서버
+    - 서비스 간 주소(USER_SERVICE_URL, AUTH_SERVICE_URL)는 로컬 포트로 연결
+    - 각 프로세스의 출력은 workdir/<name>.log에 남김 (기동 실패 시 마지막 부분을 보여 줌)
+    """
+
+    def __init__(self, workdir: str, extra_env: Optional[Dict[str, str]] = None,
+                 redis_host: Optional[str] = None, redis_port: Optional[int] = None,
+                 startup_timeout: float = 30):
+        self.workdir = workdir
+        self.extra_env = extra_env or {}
+        self.startup_timeout = startup_timeout
+        self.redis_host = redis_host or "127.0.0.1"
+        self.redis_port = redis_port or (6379 if redis_host else free_port())
+        self.use_fake_redis = redis_host is None
+        self._fake_redis: Optional[subprocess.Popen] = None
+        self.user = ServiceProcess("user-service", "user-service", "user_service", free_port())
+        self.auth = ServiceProcess("auth-service", "auth-service", "main", free_port())
+        self.blog = ServiceProcess("blog-service", "blog-service", "blog_service", free_port())
+        self.user.env = {"DATABASE_PATH": os.path.join(workdir, "users.db")}
+        self.auth.env = {"USER_SERVICE_URL": self.user.url}
+        self.blog.env = {"BLOG_DATABASE_PATH": os.path.join(workdir, "blog.db"), "AUTH_SERVICE_URL": self.auth.url}
+
+    @property
+    def services(self) -> List[ServiceProcess]:
+        # 의존 관계 순서 (user ← auth ← blog)
+        return [self.user, self.auth, self.blog]
+
+    def _base_env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            "PYTHONPATH": REPO_ROOT,
+            "REDIS_HOST": self.redis_host,
+            "REDIS_PORT": str(self.redis_port),
+            "LOG_LEVEL": "WARNING",
+        })
+        env.update(self.extra_env)
+        return env
+
+    async def start(self):
+        os.makedirs(self.workdir, exist_ok=True)
+        if self.use_fake_redis:
+            self._fake_redis = subprocess.Popen(
+                [sys.executable, "-m", "loadtest.fake_redis", str(self.redis_port)],
+                cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            await self._wait_port(self.redis_port, "fake redis")
+        async with aiohttp.ClientSession() as session:
+            for service in self.services:
+                self._spawn(service)
+                await self._wait_ready(session, service)
+                logger.info("%s ready on %s", service.name, service.url)
+
+    def _spawn(self, service: ServiceProcess):
+        env = self._base_env()
+        env.update(service.env)
+        service.log_path = os.path.join(self.workdir, f"{service.name}.log")
+        with open(service.log_path, "wb") as log:
+            service.process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", f"{service.module}:app",
+                 "--host", "127.0.0.1", "--port", str(service.port), "--no-access-log"],
+                cwd=os.path.join(REPO_ROOT, service.directory), env=env,
+                stdout=log, stderr=subprocess.STDOUT,
+            )
+
+    async def _wait_port(self, port: int, name: str):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError(f"{name} did not start listening on port {port}")
+
+    async def _wait_ready(self, session: aiohttp.ClientSession, service: ServiceProcess):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if service.process.poll() is not None:
+                raise RuntimeError(f"{service.name} exited with {service.process.returncode}:\n{self._log_tail(service)}")
+            try:
+                async with session.get(service.url + service.health_path) as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+        raise RuntimeError(f"{service.name} was not ready after {self.startup_timeout}s:\n{self._log_tail(service)}")
+
+    @staticmethod
+    def _log_tail(service: ServiceProcess, lines: int = 20) -> str:
+        try:
+            with open(service.log_path, encoding="utf-8", errors="replace") as f:
+                return "".join(f.readlines()[-lines:])
+        except OSError:
+            return ""
+
+    def stop(self):
+        processes = [s.process for s in reversed(self.services) if s.process]
+        if self._fake_redis:
+            processes.append(self._fake_redis)
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
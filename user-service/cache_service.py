@@ -1,14 +1,93 @@
 import redis.asyncio as redis
+import asyncio
 import json
+import math
+import random
+import time
 import logging
+from typing import Optional, Dict, Callable, Awaitable, Tuple, List, Union
 from config import config
+from common.lru_cache import TTLCache
+from common.metrics import record_cache, cache_stats
+from common.tracing import span
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 캐시에는 UserOut 응답에 필요한 필드만 저장 (password_hash 등은 제외)
+USER_FIELDS = ("id", "username", "email")
+
+# 존재하지 않는 사용자를 나타내는 캐시 값 (negative caching)
+NOT_FOUND = object()
+_NEGATIVE_RAW = "[]"
+
+# 캐시 키: 사용자 이름(str) 또는 사용자 ID(int).
+# 사용자 이름에는 제약이 없으므로 ID 항목은 문자열 표기가 아니라 타입과 Redis 접두사로 구분
+# (로컬 캐시에서는 "1"과 1이 다른 키, Redis에서는 user:<이름>과 user-id:<ID>)
+CacheKey = Union[str, int]
+_USERNAME_PREFIX = "user:"
+_ID_PREFIX = "user-id:"
+
+
+def redis_key(key: CacheKey) -> str:
+    return f"{_ID_PREFIX}{key}" if isinstance(key, int) else f"{_USERNAME_PREFIX}{key}"
+
+
+def parse_redis_key(value: str) -> CacheKey:
+    """무효화 메시지(redis_key 형식) → 캐시 키. 접두사가 없으면 이전 형식(사용자 이름 그대로)"""
+    if value.startswith(_ID_PREFIX):
+        return int(value[len(_ID_PREFIX):])
+    if value.startswith(_USERNAME_PREFIX):
+        return value[len(_USERNAME_PREFIX):]
+    return value
+
+
+def encode_user(user: Dict, load_ms: int = 0) -> str:
+    """
+    필드 이름 없이 [id, username, email, load_ms] 배열로 직렬화하여 Redis 메모리와 전송량을 줄임.
+    load_ms는 DB 조회에 걸린 시간으로, 만료 전 조기 갱신 확률 계산에 사용
+    """
+    return json.dumps([*(user[f] for f in USER_FIELDS), load_ms], separators=(",", ":"), ensure_ascii=False)
+
+
+def decode_user(raw: str) -> Tuple[object, int]:
+    """(사용자 dict 또는 NOT_FOUND, load_ms)를 반환"""
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        # 이전 형식(DB 행 전체를 담은 객체)으로 저장된 항목 호환
+        return {f: data[f] for f in USER_FIELDS}, 0
+    if not data:
+        return NOT_FOUND, 0
+    load_ms = data[3] if len(data) > 3 else 0
+    return dict(zip(USER_FIELDS, data)), load_ms
+
+
+class _LoadAbandoned(Exception):
+    """single-flight를 이끌던 요청이 취소됨. 기다리던 호출자는 취소되지 않고 로드를 다시 시도"""
+
+
+def _consume_exception(fut: asyncio.Future):
+    # 대기자가 없던 single-flight 실패가 "exception was never retrieved" 경고를 남기지 않도록 함
+    if not fut.cancelled():
+        fut.exception()
+
+
 """캐시 클래스"""
 class CacheService:
+    """
+    2단계 사용자 캐시.
+    1) 프로세스 내 LRU/TTL 캐시 → 2) Redis → (미스 시 호출자가 DB 조회)
+    다른 레플리카의 로컬 캐시는 Redis pub/sub 무효화 메시지로 정리됨
+    """
+
     def __init__(self):
+        self.local = TTLCache(config.cache.local_max_entries, config.cache.local_ttl)
+        self.channel = config.cache.invalidation_channel
+        self._listener: Optional[asyncio.Task] = None
+        # 키별로 진행 중인 DB 로드 (single-flight)
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._background: set = set()
+        self.coalesced = 0
+        self.early_refreshes = 0
         try:
             self.redis_client = redis.from_url(config.REDIS_URL, decode_responses=True)
             logger.info(f"Cache service initialized and connected to Redis at {config.REDIS_URL}")
@@ -16,41 +95,251 @@ class CacheService:
             logger.error(f"Failed to connect to Redis: {e}")
             self.redis_client = None
 
+    async def start(self):
+        """무효화 메시지 구독 시작 (lifespan에서 호출)"""
+        if self.redis_client and self._listener is None:
+            self._listener = asyncio.create_task(self._listen_invalidations())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen_invalidations(self):
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # 구독이 끊겼던 동안의 무효화 메시지는 알 수 없으므로 로컬 캐시를 비우고 시작
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.local.delete(parse_redis_key(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation subscription lost: %s", e)
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def get_or_load(self, user_id, loader: Callable[[], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        """
+        캐시에서 사용자를 찾고, 없으면 loader로 DB를 한 번만 조회해 캐시를 채웁니다.
+        - 같은 키를 동시에 요청한 호출자는 하나의 로드 결과를 함께 기다림 (single-flight)
+        - 존재하지 않는 사용자도 짧은 TTL로 캐시 (negative caching)
+        - Redis 항목의 만료가 가까우면 확률적으로 백그라운드 조기 갱신 (XFetch)
+        """
+        user = self.local.get(user_id)
+        record_cache("local", user is not None)
+        if user is not None:
+            return None if user is NOT_FOUND else user
+
+        user, refresh = await self._get_remote(user_id)
+        if user is not None:
+            self.local.set(user_id, user, ttl=self._local_ttl(user))
+            if refresh and user_id not in self._inflight:
+                self.early_refreshes += 1
+                task = asyncio.create_task(self._load_once(user_id, loader))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+                task.add_done_callback(_consume_exception)
+            return None if user is NOT_FOUND else user
+
+        return await self._load_once(user_id, loader)
+
+    async def _load_once(self, user_id, loader) -> Optional[Dict]:
+        inflight = self._inflight.get(user_id)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadAbandoned:
+                # 앞선 로드가 취소되어 슬롯이 비었으므로, 이 호출자가 직접 (또는 먼저 재시도한 쪽과 함께) 로드
+                return await self._load_once(user_id, loader)
+
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(_consume_exception)
+        self._inflight[user_id] = fut
+        try:
+            started = time.perf_counter()
+            user_from_db = await loader()
+            load_ms = int((time.perf_counter() - started) * 1000)
+            if user_from_db:
+                user = await self.set_user(user_id, user_from_db, load_ms=load_ms)
+            else:
+                await self.set_not_found(user_id)
+                user = None
+            fut.set_result(user)
+            return user
+        except asyncio.CancelledError:
+            # 이 요청의 취소를 기다리던 다른 호출자에게 전파하지 않음
+            fut.set_exception(_LoadAbandoned())
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(user_id, None)
+
+    def _local_ttl(self, user) -> float:
+        if user is NOT_FOUND:
+            return min(self.local.default_ttl, config.cache.negative_ttl)
+        return self.local.default_ttl
+
+    async def _get_remote(self, user_id) -> Tuple[object, bool]:
+        """Redis 조회. (사용자/NOT_FOUND/None, 조기 갱신 여부)를 반환"""
+        if not self.redis_client:
+            return None, False
+        try:
+            # GET과 남은 TTL을 한 번의 왕복으로 조회
+            with span("cache", "redis.get"):
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.get(redis_key(user_id))
+                    pipe.pttl(redis_key(user_id))
+                    raw, pttl = await pipe.execute()
+        except Exception as e:
+            logger.error("Redis GET error for user ID %s: %s", user_id, e)
+            return None, False
+        record_cache("redis", bool(raw))
+        if not raw:
+            logger.debug("Cache MISS for user ID: %s", user_id)
+            return None, False
+        logger.debug("Cache HIT for user ID: %s", user_id)
+        user, load_ms = decode_user(raw)
+        return user, user is not NOT_FOUND and self._should_refresh_early(load_ms, pttl)
+
+    @staticmethod
+    def _should_refresh_early(load_ms: int, pttl_ms: int) -> bool:
+        """XFetch: 남은 TTL이 (조회 비용 x beta x 지수분포 난수)보다 작으면 미리 갱신"""
+        beta = config.cache.early_refresh_beta
+        if beta <= 0 or pttl_ms is None or pttl_ms <= 0:
+            return False
+        load_ms = max(load_ms, 1)
+        return -load_ms * beta * math.log(1.0 - random.random()) >= pttl_ms
+
+    async def set_not_found(self, user_id):
+        """존재하지 않는 사용자를 짧은 TTL로 캐시"""
+        self.local.set(user_id, NOT_FOUND, ttl=self._local_ttl(NOT_FOUND))
+        if not self.redis_client:
+            return
+        try:
+            with span("cache", "redis.set"):
+                await self.redis_client.set(redis_key(user_id), _NEGATIVE_RAW, ex=config.cache.negative_ttl)
+        except Exception as e:
+            logger.error("Redis SET error for user ID %s: %s", user_id, e)
+
+    async def get_many(self, user_ids: List[CacheKey]) -> Dict[CacheKey, object]:
+        """
+        여러 키를 1차 캐시와 한 번의 Redis MGET으로 조회합니다.
+        적중한 키만 {키: 사용자 또는 NOT_FOUND} 형태로 반환합니다.
+        """
+        found: Dict[CacheKey, object] = {}
+        remote_keys = []
+        for user_id in user_ids:
+            user = self.local.get(user_id)
+            record_cache("local", user is not None)
+            if user is not None:
+                found[user_id] = user
+            else:
+                remote_keys.append(user_id)
+        if not remote_keys or not self.redis_client:
+            return found
+        try:
+            with span("cache", "redis.mget"):
+                raws = await self.redis_client.mget([redis_key(user_id) for user_id in remote_keys])
+        except Exception as e:
+            logger.error("Redis MGET error for %d keys: %s", len(remote_keys), e)
+            return found
+        for user_id, raw in zip(remote_keys, raws):
+            record_cache("redis", bool(raw))
+            if raw:
+                user, _ = decode_user(raw)
+                self.local.set(user_id, user, ttl=self._local_ttl(user))
+                found[user_id] = user
+        return found
+
+    async def set_many(self, users: Dict[CacheKey, Optional[Dict]], load_ms: int = 0):
+        """{키: 사용자 또는 None(없음)}을 두 계층에 저장. Redis 쓰기는 하나의 파이프라인으로 전송"""
+        for user_id, user in users.items():
+            value = {f: user[f] for f in USER_FIELDS} if user else NOT_FOUND
+            self.local.set(user_id, value, ttl=self._local_ttl(value))
+        if not users or not self.redis_client:
+            return
+        try:
+            with span("cache", "redis.set"):
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for user_id, user in users.items():
+                        if user:
+                            pipe.set(redis_key(user_id), encode_user(user, load_ms), ex=config.cache.user_ttl)
+                        else:
+                            pipe.set(redis_key(user_id), _NEGATIVE_RAW, ex=config.cache.negative_ttl)
+                    await pipe.execute()
+        except Exception as e:
+            logger.error("Redis pipeline SET error for %d keys: %s", len(users), e)
+
     async def get_user(self, user_id):
+        user = self.local.get(user_id)
+        record_cache("local", user is not None)
+        if user is not None:
+            return user
         if not self.redis_client:
             return None
         try:
-            user_data = await self.redis_client.get(f"user:{user_id}")
+            with span("cache", "redis.get"):
+                user_data = await self.redis_client.get(redis_key(user_id))
+            record_cache("redis", bool(user_data))
             if user_data:
-                logger.info(f"Cache HIT for user ID: {user_id}")
-                return json.loads(user_data)
-            logger.info(f"Cache MISS for user ID: {user_id}")
+                logger.debug("Cache HIT for user ID: %s", user_id)
+                user, _ = decode_user(user_data)
+                if user is NOT_FOUND:
+                    return None
+                self.local.set(user_id, user)
+                return user
+            logger.debug("Cache MISS for user ID: %s", user_id)
             return None
         except Exception as e:
-            logger.error(f"Redis GET error for user ID {user_id}: {e}")
+            logger.error("Redis GET error for user ID %s: %s", user_id, e)
             return None
 
-    async def set_user(self, user_id, user_data, expiration_secs=3600):
+    async def set_user(self, user_id, user_data, expiration_secs=None, load_ms=0) -> Dict:
+        """사용자를 두 계층에 저장하고, 캐시된 형태(UserOut 필드만)를 반환"""
+        expiration_secs = expiration_secs or config.cache.user_ttl
+        user = {f: user_data[f] for f in USER_FIELDS}
+        self.local.set(user_id, user)
         if not self.redis_client:
-            return
+            return user
         try:
-            await self.redis_client.set(
-                f"user:{user_id}",
-                json.dumps(user_data),
-                ex=expiration_secs
-            )
-            logger.info(f"Cached data for user ID: {user_id} with {expiration_secs}s expiry.")
+            with span("cache", "redis.set"):
+                await self.redis_client.set(
+                    redis_key(user_id),
+                    encode_user(user, load_ms),
+                    ex=expiration_secs
+                )
+            logger.debug("Cached data for user ID: %s with %ss expiry.", user_id, expiration_secs)
         except Exception as e:
-            logger.error(f"Redis SET error for user ID {user_id}: {e}")
+            logger.error("Redis SET error for user ID %s: %s", user_id, e)
+        return user
 
     async def clear_user(self, user_id):
+        self.local.delete(user_id)
         if not self.redis_client:
             return
         try:
-            await self.redis_client.delete(f"user:{user_id}")
-            logger.info(f"Cleared cache for user ID: {user_id}")
+            with span("cache", "redis.delete"):
+                await self.redis_client.delete(redis_key(user_id))
+                # 다른 레플리카의 로컬 캐시도 정리
+                await self.redis_client.publish(self.channel, redis_key(user_id))
+            logger.info("Cleared cache for user ID: %s", user_id)
         except Exception as e:
-            logger.error(f"Redis DEL error for user ID {user_id}: {e}")
+            logger.error("Redis DEL error for user ID %s: %s", user_id, e)
 
     async def ping(self):
         if not self.redis_client:
@@ -59,4 +348,18 @@ class CacheService:
             return await self.redis_client.ping()
         except Exception as e:
             logger.error(f"Redis PING error: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def stats(self) -> Dict:
+        """계층별 적중률과 전체 적중률 (로컬 또는 Redis에서 응답한 비율)"""
+        local = cache_stats("local")
+        remote = cache_stats("redis")
+        lookups = local["hits"] + local["misses"]
+        served = local["hits"] + remote["hits"]
+        return {
+            "hit_ratio": round(served / lookups, 4) if lookups else 0,
+            "local": {**local, "entries": len(self.local)},
+            "redis": remote,
+            "coalesced_loads": self.coalesced,
+            "early_refreshes": self.early_refreshes,
+        }
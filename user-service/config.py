@@ -6,23 +6,43 @@ from dataclasses import dataclass
 class ServerConfig:
     host: str = '0.0.0.0'
     port: int = 8001
+    batch_max_size: int = int(os.getenv('USER_BATCH_MAX_SIZE', '100'))  # POST /users/batch 한 번에 조회할 수 있는 최대 수
 
 @dataclass
 class DatabaseConfig:
     # getenv를 사용하여 환경변수를 읽고, 값이 없으면 기본값을 사용하도록 변경
     db_file: str = os.getenv('DATABASE_PATH', '/data/app.db')
+    pool_size: int = int(os.getenv('DB_POOL_SIZE', '4'))  # 동시에 사용할 읽기 전용 커넥션 수
+
+@dataclass
+class HashConfig:
+    # 비밀번호 해시/검증 워커 풀 (pool_kind: thread | process)
+    pool_kind: str = os.getenv('HASH_POOL_KIND', 'thread')
+    workers: int = int(os.getenv('HASH_WORKERS', str(os.cpu_count() or 1)))
+    max_queue: int = int(os.getenv('HASH_MAX_QUEUE', '32'))  # 워커를 기다릴 수 있는 최대 작업 수
 
 @dataclass
 class CacheConfig:
     host: str = os.getenv('REDIS_HOST', 'redis-service')
     port: int = int(os.getenv('REDIS_PORT', '6379'))
     default_ttl: int = 300
+    user_ttl: int = int(os.getenv('USER_CACHE_TTL', '3600'))
+    # 존재하지 않는 사용자(404) 캐시 시간
+    negative_ttl: int = int(os.getenv('USER_NEGATIVE_CACHE_TTL', '30'))
+    # 만료 전 확률적 조기 갱신 강도 (0이면 비활성화, 클수록 일찍 갱신)
+    early_refresh_beta: float = float(os.getenv('USER_CACHE_EARLY_REFRESH_BETA', '1.0'))
+    # 프로세스 내 1차 캐시 (Redis 앞단)
+    local_max_entries: int = int(os.getenv('USER_LOCAL_CACHE_SIZE', '10000'))
+    local_ttl: float = float(os.getenv('USER_LOCAL_CACHE_TTL', '30'))
+    # 레플리카 간 로컬 캐시 무효화에 사용할 Redis pub/sub 채널
+    invalidation_channel: str = os.getenv('USER_CACHE_CHANNEL', 'user-cache-invalidate')
 
 class Config:
     def __init__(self):
         self.server = ServerConfig()
         self.database = DatabaseConfig()
         self.cache = CacheConfig()
+        self.hashing = HashConfig()
         self.REDIS_URL = f"redis://{self.cache.host}:{self.cache.port}"
 
 config = Config()
\ No newline at end of file
@@ -1,85 +1,121 @@
-# user-service/database_service.py (수정 후)
-import asyncio
+# user-service/database_service.py
 import sqlite3
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 from config import config
-from werkzeug.security import generate_password_hash, check_password_hash
+from common.sqlite_pool import SQLitePool
+from password_hasher import PasswordHasher
 
 logger = logging.getLogger(__name__)
 
+SELECT_USER_BY_USERNAME = "SELECT * FROM users WHERE username = ?"
+SELECT_USER_BY_ID = "SELECT * FROM users WHERE id = ?"
+# 시작 시 읽기 커넥션마다 미리 준비해 둘 조회 (로그인/조회 경로)
+WARM_STATEMENTS = [SELECT_USER_BY_USERNAME, SELECT_USER_BY_ID, "SELECT 1"]
+
 class UserServiceDatabase:
-    def __init__(self, db_file=config.database.db_file):
+    """
+    사용자 저장소. WAL 모드 커넥션 풀을 사용하므로 조회는 서로 동시에 실행되고,
+    쓰기만 쓰기끼리 직렬화됨. 모든 쿼리는 이벤트 루프 밖(전용 스레드 풀)에서 실행됨
+    """
+
+    def __init__(self, hasher: PasswordHasher, db_file=config.database.db_file, pool_size=config.database.pool_size):
         self.db_file = db_file
-        self.lock = asyncio.Lock()
-        self._initialize_db()
+        self.pool = SQLitePool(db_file, size=pool_size)
+        # 비밀번호 해시/검증은 워커 풀에서 실행 (대기열이 가득 차면 HasherBusyError)
+        self.hasher = hasher
 
-    def _initialize_db(self):
+    async def initialize(self):
+        """커넥션 풀을 열고 스키마를 준비합니다."""
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT UNIQUE NOT NULL,
-                        email TEXT NOT NULL,
-                        password_hash TEXT NOT NULL
-                    )
-                ''')
+            await self.pool.open()
+            await self.pool.write(self._create_schema, op="create_schema")
         except sqlite3.Error as e:
             logger.error(f"User DB initialization failed: {e}", exc_info=True)
             raise
 
+    async def close(self):
+        await self.pool.close()
+
+    async def warm_up(self):
+        """자주 쓰는 조회 구문을 모든 읽기 커넥션에 미리 준비 (lifespan에서 백그라운드로 실행)"""
+        await self.pool.warm(WARM_STATEMENTS)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                email TEXT NOT NULL,
+                password_hash TEXT NOT NULL
+            )
+        ''')
+
     async def add_user(self, username: str, email: str, password: str) -> Optional[int]:
         """사용자를 추가하고 해시된 비밀번호를 저장합니다."""
-        password_hash = generate_password_hash(password)
-        async with self.lock:
-            try:
-                with sqlite3.connect(self.db_file) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
-                                   (username, email, password_hash))
-                    return cursor.lastrowid
-            except sqlite3.IntegrityError:
-                return None # 이미 존재하는 사용자
+        password_hash = await self.hasher.hash(password)
+
+        def _insert(conn):
+            cursor = conn.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                                  (username, email, password_hash))
+            return cursor.lastrowid
+        try:
+            return await self.pool.write(_insert, op="add_user")
+        except sqlite3.IntegrityError:
+            return None # 이미 존재하는 사용자
 
     async def get_user_by_username(self, username: str) -> Optional[Dict]:
         """사용자 이름으로 사용자 정보를 조회합니다."""
-        async with self.lock:
-            with sqlite3.connect(self.db_file) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-                user = cursor.fetchone()
-                return dict(user) if user else None
+        def _query(conn):
+            user = conn.execute(SELECT_USER_BY_USERNAME, (username,)).fetchone()
+            return dict(user) if user else None
+        return await self.pool.read(_query, op="get_user_by_username")
 
     async def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """ID로 사용자 정보를 조회합니다."""
-        async with self.lock:
-            with sqlite3.connect(self.db_file) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-                user = cursor.fetchone()
-                return dict(user) if user else None
+        def _query(conn):
+            user = conn.execute(SELECT_USER_BY_ID, (user_id,)).fetchone()
+            return dict(user) if user else None
+        return await self.pool.read(_query, op="get_user_by_id")
+
+    async def get_users_by_usernames(self, usernames: List[str]) -> List[Dict]:
+        """여러 사용자 이름을 한 번의 IN 쿼리로 조회합니다. 없는 사용자는 결과에서 빠집니다."""
+        if not usernames:
+            return []
+        def _query(conn):
+            placeholders = ",".join("?" * len(usernames))
+            rows = conn.execute(f"SELECT id, username, email FROM users WHERE username IN ({placeholders})",
+                                usernames).fetchall()
+            return [dict(row) for row in rows]
+        return await self.pool.read(_query, op="get_users_by_usernames")
+
+    async def get_users_by_ids(self, user_ids: List[int]) -> List[Dict]:
+        """여러 ID를 한 번의 IN 쿼리로 조회합니다. 없는 사용자는 결과에서 빠집니다."""
+        if not user_ids:
+            return []
+        def _query(conn):
+            placeholders = ",".join("?" * len(user_ids))
+            rows = conn.execute(f"SELECT id, username, email FROM users WHERE id IN ({placeholders})",
+                                user_ids).fetchall()
+            return [dict(row) for row in rows]
+        return await self.pool.read(_query, op="get_users_by_ids")
 
     async def verify_user_credentials(self, username: str, password: str) -> Optional[Dict]:
         """사용자 자격 증명을 확인합니다."""
         user = await self.get_user_by_username(username)
-        if user and check_password_hash(user['password_hash'], password):
+        if user and await self.hasher.verify(user['password_hash'], password):
             # 비밀번호 해시는 제외하고 정보 반환
             return {"id": user["id"], "username": user["username"], "email": user["email"]}
         return None
 
     async def health_check(self) -> bool:
         """데이터베이스 연결 상태를 확인합니다."""
-        async with self.lock:
-            try:
-                with sqlite3.connect(self.db_file) as conn:
-                    # 간단한 쿼리를 실행하여 연결 테스트
-                    conn.execute("SELECT 1")
-                return True
-            except Exception as e:
-                logger.error(f"Database health check failed: {e}")
-                return False
+        try:
+            # 간단한 쿼리를 실행하여 연결 테스트
+            await self.pool.read(lambda conn: conn.execute("SELECT 1").fetchone(), op="health_check")
+            return True
+        except Exception as e:
+            logger.error(f"Database health check failed: {e}")
+            return False
@@ -0,0 +1,123 @@
+# user-service/password_hasher.py
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from prometheus_client import Counter, Histogram
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from common.tracing import record_span
+from config import HashConfig
+
+logger = logging.getLogger(__name__)
+
+HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "비밀번호 해시 작업이 워커를 기다린 시간",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+HASH_COMPUTE = Histogram(
+    "password_hash_compute_seconds",
+    "비밀번호 해시 계산 시간",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "대기열이 가득 차 거절된 해시 작업 수",
+    ["operation"],
+)
+
+
+class HasherBusyError(Exception):
+    """해시 대기열이 가득 차 작업을 받을 수 없음"""
+
+
+def _noop():
+    return None
+
+
+def _timed(fn, *args):
+    # 워커(스레드/프로세스)에서 실행. 시스템 전역 monotonic 시계로 대기/계산 시간을 구분
+    started = time.monotonic()
+    result = fn(*args)
+    return result, started, time.monotonic()
+
+
+class PasswordHasher:
+    """
+    CPU 비용이 큰 비밀번호 해시/검증을 이벤트 루프 밖의 워커 풀에서 실행합니다.
+    대기 중인 작업이 max_queue를 넘으면 즉시 HasherBusyError를 발생시킵니다.
+    """
+
+    def __init__(self, cfg: HashConfig):
+        self.cfg = cfg
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    def start(self):
+        if self._executor is not None:
+            return
+        if self.cfg.pool_kind == "process":
+            # 스레드가 이미 떠 있는 서버 프로세스를 fork하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.cfg.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            # hashlib의 scrypt/pbkdf2는 계산 중 GIL을 놓으므로 스레드로도 코어 수만큼 확장됨
+            self._executor = ThreadPoolExecutor(max_workers=self.cfg.workers, thread_name_prefix="pwhash")
+        logger.info(f"Password hasher started ({self.cfg.pool_kind}, workers={self.cfg.workers}, max_queue={self.cfg.max_queue})")
+
+    async def warm_up(self):
+        """
+        워커를 미리 띄워 둠. 풀은 작업이 들어올 때 워커를 만들므로(프로세스 풀은 spawn + 모듈 임포트)
+        예열하지 않으면 기동 직후 첫 로그인들이 그 비용을 치름
+        """
+        if self._executor is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _noop) for _ in range(self.cfg.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _submit(self, operation: str, fn, *args):
+        if self._executor is None:
+            self.start()
+        # 실행 중인 작업(workers)과 대기 작업(max_queue)을 합친 한도를 넘으면 바로 거절
+        if self._pending >= self.cfg.workers + self.cfg.max_queue:
+            HASH_REJECTED.labels(operation).inc()
+            raise HasherBusyError(operation)
+        submitted = time.monotonic()
+        fut = asyncio.get_running_loop().run_in_executor(self._executor, _timed, fn, *args)
+        # 요청이 취소되어도 작업은 워커/대기열을 계속 차지하므로, 실제로 끝났을 때 카운터를 줄임
+        self._pending += 1
+        fut.add_done_callback(self._job_done)
+        result, started, finished = await asyncio.shield(fut)
+        HASH_QUEUE_WAIT.labels(operation).observe(max(0.0, started - submitted))
+        HASH_COMPUTE.labels(operation).observe(finished - started)
+        # Server-Timing/추적에는 대기 시간을 포함한 전체 시간을 기록
+        record_span("hash", operation, time.monotonic() - submitted)
+        return result
+
+    def _job_done(self, fut: asyncio.Future):
+        self._pending -= 1
+        # 기다리던 요청이 취소된 뒤 실패한 작업이 "exception was never retrieved" 경고를 남기지 않도록 조회
+        if not fut.cancelled():
+            fut.exception()
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", generate_password_hash, password)
+
+    async def verify(self, password_hash: str, password: str) -> bool:
+        return await self._submit("verify", check_password_hash, password_hash, password)
@@ -1,13 +1,26 @@
 # TItanium-v2/user-service/user_service.py
 
 # ... (기존 import 및 모델 정의는 그대로 유지) ...
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List, Union
 
+from config import config
 from database_service import UserServiceDatabase
-from cache_service import CacheService
+from password_hasher import PasswordHasher, HasherBusyError
+from cache_service import CacheService, NOT_FOUND
+from common.json_response import FastJSONResponse
+from common.logging_config import setup_logging
+from common.metrics import setup_metrics, request_stats
+from common.readiness import Readiness, setup_readiness
+from common.tracing import setup_tracing
+
+# 로깅 설정 (JSON 한 줄 형식, 백그라운드 스레드에서 출력)
+setup_logging("user-service")
 
 class UserIn(BaseModel):
     username: str
@@ -23,10 +36,53 @@ class Credentials(BaseModel):
     username: str
     password: str
 
-app = FastAPI()
-db = UserServiceDatabase()
+class BatchLookup(BaseModel):
+    # usernames 또는 ids 중 하나만 지정
+    usernames: Optional[List[str]] = None
+    ids: Optional[List[int]] = None
+
+class BatchUserResult(BaseModel):
+    key: Union[int, str]
+    found: bool
+    user: Optional[UserOut] = None
+
+class BatchUserOut(BaseModel):
+    results: List[BatchUserResult]
+
+hasher = PasswordHasher(config.hashing)
+db = UserServiceDatabase(hasher)
 cache = CacheService()
 
+readiness = Readiness()
+# DB는 필수, Redis는 없어도 DB로 응답할 수 있으므로 degraded로만 표시
+readiness.add_check("database", db.health_check)
+readiness.add_check("cache", cache.ping, required=False)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    hasher.start()
+    # 서로 의존하지 않는 준비는 동시에 진행하고, 예열은 요청을 받기 시작한 뒤 백그라운드에서 진행
+    await asyncio.gather(db.initialize(), cache.start())
+    readiness.warm_up("db_statements", db.warm_up)
+    readiness.warm_up("redis_connection", cache.ping)
+    readiness.warm_up("hash_workers", hasher.warm_up)
+    yield
+    await readiness.close()
+    await cache.close()
+    await db.close()
+    hasher.shutdown()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+setup_metrics(app)
+setup_tracing(app, "user-service")
+setup_readiness(app, readiness)
+
+@app.exception_handler(HasherBusyError)
+async def handle_hasher_busy(request, exc):
+    # 해시 대기열 포화: 요청을 쌓아 두지 않고 바로 재시도를 안내
+    return FastJSONResponse(status_code=503, content={"detail": "Password hashing is busy, retry later"},
+                            headers={"Retry-After": "1"})
+
 # --- User Service의 통계 및 DB/Cache 상태를 반환하는 엔드포인트 ---
 @app.get("/stats")
 async def handle_stats():
@@ -48,8 +104,9 @@ async def handle_stats():
             },
             "cache": {
                 "status": "healthy" if is_cache_healthy else "unhealthy",
-                "hit_ratio": 0 # 이 예제에서는 단순화를 위해 0으로 고정
-            }
+                **cache.stats()
+            },
+            "requests": request_stats()
         }
     }
 
@@ -57,6 +114,7 @@ async def handle_stats():
 # ... (기존 /health, /users 엔드포인트들은 그대로 유지) ...
 @app.get("/health")
 async def handle_health():
+    # liveness 전용: 프로세스가 응답하는지만 확인 (의존성 상태는 /ready)
     return {"status": "healthy"}
 
 @app.post("/users", response_model=UserOut, status_code=201)
@@ -64,21 +122,58 @@ async def create_user(user: UserIn):
     user_id = await db.add_user(user.username, user.email, user.password)
     if user_id is None:
         raise HTTPException(status_code=400, detail="Username already exists")
+    # 이전에 404로 캐시된 항목(negative cache)이 있다면 제거
+    await cache.clear_user(user.username)
+    await cache.clear_user(user_id)
     created_user = await db.get_user_by_id(user_id)
     return created_user
 
+@app.post("/users/batch", response_model=BatchUserOut)
+async def get_users_batch(lookup: BatchLookup):
+    """
+    여러 사용자를 한 번에 조회합니다.
+    캐시는 MGET 한 번, 미스는 IN 쿼리 한 번, 캐시 채우기는 파이프라인 한 번으로 처리하며
+    결과는 입력 순서대로, 없는 사용자는 found=false로 반환합니다.
+    """
+    if (lookup.usernames is None) == (lookup.ids is None):
+        raise HTTPException(status_code=400, detail="Specify exactly one of 'usernames' or 'ids'")
+    by_id = lookup.ids is not None
+    keys = lookup.ids if by_id else lookup.usernames
+    if len(keys) > config.server.batch_max_size:
+        raise HTTPException(status_code=400, detail=f"At most {config.server.batch_max_size} users per batch")
+
+    # 중복 키는 한 번만 조회. ID(int)와 사용자 이름(str)은 캐시 계층에서 서로 다른 키로 구분됨
+    unique_keys = list(dict.fromkeys(keys))
+    found = await cache.get_many(unique_keys)
+
+    misses = [key for key in unique_keys if key not in found]
+    if misses:
+        started = time.perf_counter()
+        if by_id:
+            rows = {row["id"]: row for row in await db.get_users_by_ids(misses)}
+        else:
+            rows = {row["username"]: row for row in await db.get_users_by_usernames(misses)}
+        load_ms = int((time.perf_counter() - started) * 1000)
+        loaded = {key: rows.get(key) for key in misses}
+        await cache.set_many(loaded, load_ms=load_ms)
+        found.update({k: v if v else NOT_FOUND for k, v in loaded.items()})
+
+    results = []
+    for key in keys:
+        user = found[key]
+        if user is NOT_FOUND:
+            results.append({"key": key, "found": False, "user": None})
+        else:
+            results.append({"key": key, "found": True, "user": user})
+    return {"results": results}
+
 @app.get("/users/{username}", response_model=UserOut)
 async def get_user(username: str):
-    cached_user = await cache.get_user(username)
-    if cached_user:
-        return cached_user
-
-    user_from_db = await db.get_user_by_username(username)
-    if not user_from_db:
+    # 캐시 미스 시 같은 사용자에 대한 동시 요청은 하나의 DB 조회를 함께 기다림
+    user = await cache.get_or_load(username, lambda: db.get_user_by_username(username))
+    if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    await cache.set_user(username, user_from_db)
-    return user_from_db
+    return user
 
 @app.post("/users/verify-credentials")
 async def verify_credentials(creds: Credentials):